@@ -1,4 +1,10 @@
 """Package containing tests for the ThetaData Python API."""
+import socket
+import socketserver
+import struct
+import threading
+from contextlib import contextmanager
+
 import pytest
 from thetadata import ThetaClient
 
@@ -9,3 +15,65 @@ def tc():
     client = ThetaClient(timeout=15, launch=False)
     with client.connect():
         yield client
+
+
+def tick_response(fmt: list, rows: list, msg_type: int = 200) -> bytes:
+    """Encode a binary Terminal response w/ a format tick, body ticks and a trailing null tick."""
+    n_cols = len(fmt)
+    ticks = [fmt] + list(rows) + [[0] * n_cols]
+    body = b"".join(struct.pack(f">{n_cols}i", *tick) for tick in ticks)
+    return struct.pack(">HQHHBBI", msg_type, 0, 0, 0, 0, n_cols, len(body)) + body
+
+
+def list_response(items: list, msg_type: int = 202) -> bytes:
+    """Encode a binary Terminal list response."""
+    body = ",".join(str(item) for item in items).encode("ascii")
+    return struct.pack(">HQHHBBI", msg_type, 0, 0, 0, 0, 0, len(body)) + body
+
+
+def error_response(msg: str) -> bytes:
+    """Encode a binary Terminal error response."""
+    body = msg.encode("utf-8")
+    return struct.pack(">HQHHBBI", 101, 0, 0, 0, 0, 0, len(body)) + body
+
+
+@contextmanager
+def fake_terminal(client: ThetaClient, *responses: bytes):
+    """Connect `client` to a socket that replies w/ `responses`, ignoring the requests it receives."""
+    local, remote = socket.socketpair()
+    client._init_pool([local])
+    sender = threading.Thread(target=remote.sendall, args=[b"".join(responses)])
+    sender.start()
+    try:
+        yield remote
+    finally:
+        sender.join()
+        local.close()
+        remote.close()
+        client._pool = None
+
+
+@contextmanager
+def tcp_terminal(handler):
+    """Run a local TCP server that replies to every request line w/ `handler(line)`.
+
+    :return: the port the server is listening on.
+    """
+
+    class _Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                line = line.decode("utf-8").strip()
+                if "version=" in line:
+                    continue
+                self.wfile.write(handler(line))
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
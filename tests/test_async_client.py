@@ -0,0 +1,134 @@
+"""Contains various tests for the AsyncThetaClient class."""
+import asyncio
+import datetime
+import time
+
+import pytest
+from thetadata import AsyncThetaClient, OptionReqType, OptionRight, DateRange, DataType, NoData
+from . import list_response, error_response, tcp_terminal
+from .test_client import _close_at_strike
+
+
+def test_concurrent_hist_option():
+    """Ensure that many concurrent requests receive their own responses."""
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3))
+
+    async def run(port: int) -> list:
+        client = AsyncThetaClient(port=port)
+        async with client.connect(pool_size=4):
+            dfs = await asyncio.gather(*[
+                client.get_hist_option(OptionReqType.EOD, "AAPL", datetime.date(2023, 1, 20), strike,
+                                       OptionRight.CALL, date_range)
+                for strike in range(1, 501)
+            ])
+        return [df[DataType.CLOSE].iloc[0] for df in dfs]
+
+    with tcp_terminal(_close_at_strike) as port:
+        closes = asyncio.run(run(port))
+    assert closes == pytest.approx(list(range(1, 501)))
+
+
+def test_list_and_errors():
+    """Ensure that list responses and error responses are parsed."""
+
+    def handler(line: str) -> bytes:
+        if "MSG_CODE=202" in line:
+            return list_response([140000, 145500])
+        return error_response("No data for the specified timeframe.")
+
+    async def run(port: int):
+        client = AsyncThetaClient(port=port)
+        async with client.connect(pool_size=1):
+            strikes = await client.get_strikes("AAPL", datetime.date(2023, 1, 20))
+            with pytest.raises(NoData):
+                await client.get_last_option(OptionReqType.QUOTE, "AAPL", datetime.date(2023, 1, 20), 140,
+                                             OptionRight.CALL)
+        return strikes
+
+    with tcp_terminal(handler) as port:
+        strikes = asyncio.run(run(port))
+    assert strikes.tolist() == [140.0, 145.5]
+
+
+def test_slow_body_within_timeout():
+    """Ensure that the timeout applies to each chunk of a body rather than to the whole body."""
+    response = list_response(list(range(100_000)))
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readline()  # the version message
+        await reader.readline()
+        writer.write(response[:20])
+        for i in range(20, len(response), len(response) // 4):
+            await asyncio.sleep(0.1)
+            writer.write(response[i:i + len(response) // 4])
+            await writer.drain()
+        await reader.read()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        client = AsyncThetaClient(port=server.sockets[0].getsockname()[1], timeout=0.25)
+        async with server, client.connect(pool_size=1):
+            return await client.get_strikes("AAPL", datetime.date(2023, 1, 20))
+
+    strikes = asyncio.run(run())
+    assert len(strikes) == 100_000
+
+
+def test_connect_failure_closes_connections(monkeypatch):
+    """Ensure that the connections that did open are closed if another one fails to open."""
+    writers = []
+    calls = []
+
+    async def run(port: int):
+        client = AsyncThetaClient(port=port)
+        open_connection = client._open_connection
+
+        async def flaky_open_connection():
+            calls.append(None)
+            if len(calls) == 3:
+                raise ConnectionRefusedError()
+            conn = await open_connection()
+            writers.append(conn[1])
+            return conn
+
+        monkeypatch.setattr(client, "_open_connection", flaky_open_connection)
+        with pytest.raises(ConnectionRefusedError):
+            async with client.connect(pool_size=3):
+                pass
+        assert client._pool is None
+        return [writer.is_closing() for writer in writers]
+
+    with tcp_terminal(lambda line: b"") as port:
+        closed = asyncio.run(run(port))
+    assert closed == [True, True]
+
+
+def test_request_pending_across_disconnect(monkeypatch):
+    """Ensure that the connection of a request still in flight when the client disconnects is closed."""
+    writers = []
+
+    def handler(line: str) -> bytes:
+        time.sleep(0.2)
+        return list_response([140000, 145500])
+
+    async def run(port: int):
+        client = AsyncThetaClient(port=port)
+        open_connection = client._open_connection
+
+        async def recording_open_connection():
+            conn = await open_connection()
+            writers.append(conn[1])
+            return conn
+
+        monkeypatch.setattr(client, "_open_connection", recording_open_connection)
+        async with client.connect(pool_size=1):
+            task = asyncio.ensure_future(client.get_strikes("AAPL", datetime.date(2023, 1, 20)))
+            await asyncio.sleep(0.05)  # the request is sent but not answered yet
+        strikes = await task
+        return strikes, [writer.is_closing() for writer in writers]
+
+    with tcp_terminal(handler) as port:
+        strikes, closed = asyncio.run(run(port))
+    assert strikes.tolist() == [140.0, 145.5]
+    assert closed == [True]
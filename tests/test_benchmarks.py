@@ -0,0 +1,149 @@
+"""Contains benchmarks for receiving and decoding Terminal responses, which run offline against a local replay
+Terminal. Set THETADATA_BENCH_ROWS to a comma separated list of body sizes in rows to change the sizes benchmarked,
+e.g. THETADATA_BENCH_ROWS=1000,100000,1000000 to include the large bodies, which are left out of the default run.
+"""
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+from thetadata import DataType, Header, ListBody, MessageType, Quote, ThetaClient, codec
+from thetadata.parsing import TickBody
+from . import list_response, tcp_terminal
+
+pytest.importorskip("pytest_benchmark")
+
+BENCH_ROWS = [int(n) for n in os.environ.get("THETADATA_BENCH_ROWS", "1000,100000").split(",")]
+
+QUOTE_FORMAT = [
+    DataType.MS_OF_DAY,
+    DataType.BID_SIZE,
+    DataType.BID_EXCHANGE,
+    DataType.BID,
+    DataType.BID_CONDITION,
+    DataType.ASK_SIZE,
+    DataType.ASK_EXCHANGE,
+    DataType.ASK,
+    DataType.ASK_CONDITION,
+    DataType.PRICE_TYPE,
+    DataType.DATE,
+]
+
+TRADE_FORMAT = [
+    DataType.MS_OF_DAY,
+    DataType.SEQUENCE,
+    DataType.SIZE,
+    DataType.CONDITION,
+    DataType.PRICE,
+    DataType.PRICE_TYPE,
+    DataType.DATE,
+]
+
+FORMATS = {"quote": QUOTE_FORMAT, "trade": TRADE_FORMAT}
+
+
+def synthetic_ticks(format_tick: list, n_rows: int) -> np.ndarray:
+    """Generate `n_rows` synthetic ticks w/ the columns of `format_tick`."""
+    rng = np.random.default_rng(0)
+    ticks = rng.integers(1, 100_000, (n_rows, len(format_tick)), dtype=np.int32)
+    ticks[:, format_tick.index(DataType.PRICE_TYPE)] = 8
+    ticks[:, format_tick.index(DataType.DATE)] = 20230103 + np.arange(n_rows) * 5 // max(n_rows, 1)
+    return ticks
+
+
+def encoded_response(format_tick: list, n_rows: int) -> bytes:
+    """Encode a synthetic tick response w/ its 20 byte header."""
+    header, body = TickBody(format_tick, synthetic_ticks(format_tick, n_rows)).to_response()
+    return header.to_bytes() + body
+
+
+@contextmanager
+def replay_client(response: bytes):
+    """Connect a client to a local replay Terminal that answers every request w/ `response`."""
+    with tcp_terminal(lambda line: response) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect():
+            yield client
+
+
+def rows_per_sec(benchmark, n_rows: int) -> None:
+    """Report the throughput of a benchmark in rows per second, unless benchmarks are disabled."""
+    if benchmark.stats is not None:
+        benchmark.extra_info["rows_per_sec"] = n_rows / benchmark.stats.stats.mean
+
+
+@pytest.mark.parametrize("n_rows", BENCH_ROWS)
+def test_bench_recv(benchmark, n_rows):
+    """Benchmark sending a request to the replay Terminal and receiving its response w/o parsing it."""
+    response = encoded_response(QUOTE_FORMAT, n_rows)
+    with replay_client(response) as client:
+        header, body = benchmark(client._request, "bench\n")
+    if benchmark.stats is not None:
+        benchmark.extra_info["mb_per_sec"] = len(response) / benchmark.stats.stats.mean / 1e6
+    assert len(body) == header.size == len(response) - 20
+
+
+@pytest.mark.parametrize("n_rows", BENCH_ROWS)
+def test_bench_get_req(benchmark, n_rows):
+    """Benchmark a request to the replay Terminal end to end, from sending it to its DataFrame."""
+    with replay_client(encoded_response(QUOTE_FORMAT, n_rows)) as client:
+        df = benchmark(client.get_req, "bench")
+    rows_per_sec(benchmark, n_rows)
+    assert len(df.index) == n_rows
+
+
+def test_bench_header_parse(benchmark):
+    """Benchmark parsing a response header."""
+    data = codec.encode_header(MessageType.HIST, 1, 0, 0, len(QUOTE_FORMAT), 1 << 20)
+    header = benchmark(Header.parse, "bench", data)
+    assert header.size == 1 << 20
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize("n_rows", BENCH_ROWS)
+def test_bench_tick_body_parse(benchmark, fmt, n_rows):
+    """Benchmark parsing a tick response into a DataFrame."""
+    response = encoded_response(FORMATS[fmt], n_rows)
+    header = Header.parse("bench", response[:20])
+    df = benchmark(TickBody.parse, "bench", header, memoryview(response)[20:])
+    rows_per_sec(benchmark, n_rows)
+    assert len(df.index) == n_rows
+
+
+@pytest.mark.parametrize("n_rows", BENCH_ROWS)
+def test_bench_tick_body_from_response(benchmark, n_rows):
+    """Benchmark decoding the format tick and raw ticks of a quote response."""
+    response = encoded_response(QUOTE_FORMAT, n_rows)
+    header = Header.parse("bench", response[:20])
+    tbody = benchmark(TickBody.from_response, "bench", header, memoryview(response)[20:])
+    rows_per_sec(benchmark, n_rows)
+    assert len(tbody.body_ticks) == n_rows + 1  # w/ the null tick
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("n_rows", BENCH_ROWS)
+def test_bench_tick_body_to_dataframe(benchmark, n_rows, compact):
+    """Benchmark decoding quote ticks into a DataFrame."""
+    tbody = TickBody(QUOTE_FORMAT, synthetic_ticks(QUOTE_FORMAT, n_rows))
+    df = benchmark(tbody._to_dataframe, compact=compact)
+    rows_per_sec(benchmark, n_rows)
+    assert len(df.index) == n_rows
+
+
+@pytest.mark.parametrize("dates", [False, True])
+@pytest.mark.parametrize("n_items", [100, 10_000])
+def test_bench_list_body_parse(benchmark, n_items, dates):
+    """Benchmark parsing a list response, such as strikes or dates."""
+    response = list_response([20230103 + i % 28 for i in range(n_items)])
+    header = Header.parse("bench", response[:20])
+    lst = benchmark(ListBody.parse, "bench", header, response[20:], dates)
+    rows_per_sec(benchmark, n_items)
+    assert len(lst.lst) == n_items
+
+
+def test_bench_stream_quote(benchmark):
+    """Benchmark decoding a stream quote."""
+    data = codec.QUOTE.pack(34200000, 10, 1, 15025, 0, 20, 1, 15030, 0, 8, 20230103)
+    quote = Quote()
+    benchmark(quote.from_bytes, data)
+    assert quote.bid_price == 150.25
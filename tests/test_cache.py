@@ -0,0 +1,129 @@
+"""Contains various tests for caching Terminal responses."""
+import datetime
+import os
+from urllib.parse import parse_qs
+
+import pandas as pd
+import pytest
+from thetadata import DataType, DateRange, Header, HistCache, ListCache, NoData, StockReqType, ThetaClient
+from thetadata import cache as cache_module, calendar, codec
+from . import error_response, list_response, tcp_terminal, tick_response
+
+
+def test_hist_cache_lru(tmp_path):
+    """Ensure that responses are evicted in least recently used order once the cache is full."""
+    response = tick_response([0, 1], [[20230103, 1]])
+    header = Header.parse("test", response[:20])
+    cache = HistCache(str(tmp_path), max_bytes=2 * len(response))
+    cache.put("a", header, response[20:])
+    cache.put("b", header, response[20:])
+    assert bytes(cache.get("a")[1]) == response[20:]
+    cache.put("c", header, response[20:])
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats() == {"hits": 2, "misses": 1, "entries": 2, "bytes": 2 * len(response)}
+
+    # the cache is reused by later runs
+    assert HistCache(str(tmp_path)).get("A") is not None
+    cache.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_hist_cache_client(tmp_path):
+    """Ensure that past days are served from the cache and days from today on are not cached."""
+    requests = []
+
+    def handler(line: str) -> bytes:
+        requests.append(line)
+        start = int(parse_qs(line)["START_DATE"][0])
+        return tick_response([0, 1, 134, 4], [[start, 1, 5, 10]])
+
+    past = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 4))
+    # the next trading day from today on, which is never cached
+    day = calendar.next_trading_day(datetime.date.today() - datetime.timedelta(days=1))
+    today = DateRange(day, day)
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False, hist_cache=HistCache(str(tmp_path)))
+        with client.connect(pool_size=2):
+            first = client.get_hist_stock(StockReqType.TRADE, "AAPL", past)
+            second = client.get_hist_stock(StockReqType.TRADE, "aapl", past)
+            client.get_hist_stock(StockReqType.TRADE, "AAPL", past, split="day")
+            client.get_hist_stock(StockReqType.TRADE, "AAPL", today)
+            client.get_hist_stock(StockReqType.TRADE, "AAPL", today)
+            with pytest.raises(AssertionError):  # a bad output format fails before any request is sent
+                client.get_hist_stock(StockReqType.TRADE, "AAPL", DateRange(
+                    datetime.date(2023, 1, 5), datetime.date(2023, 1, 6)), output="csv")
+    assert first.equals(second)
+    assert second[DataType.PRICE].tolist() == [5.0]
+    assert len(requests) == 1 + 2
+    assert client.hist_cache.stats()["hits"] == 4
+
+
+def test_hist_cache_gap_filling(tmp_path):
+    """Ensure that only the missing runs of days are fetched and stitched together w/ the cached days."""
+    requests = []
+
+    def handler(line: str) -> bytes:
+        params = parse_qs(line)
+        start, end = int(params["START_DATE"][0]), int(params["END_DATE"][0])
+        requests.append((start, end))
+        days = DateRange(codec.to_date(start), codec.to_date(end)).days(trading_only=True)
+        if len(days) == 0:
+            return error_response("No data for the specified timeframe.")
+        return tick_response([0, 1, 134, 4], [[int(d.strftime("%Y%m%d")), 1, d.day, 10] for d in days])
+
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False, hist_cache=HistCache(str(tmp_path)))
+        with client.connect(pool_size=2):
+            february = DateRange(datetime.date(2023, 2, 1), datetime.date(2023, 2, 28))
+            client.get_hist_stock(StockReqType.TRADE, "AAPL", february)
+            first_quarter = DateRange(datetime.date(2023, 1, 1), datetime.date(2023, 3, 31))
+            df = client.get_hist_stock(StockReqType.TRADE, "AAPL", first_quarter)
+            with pytest.raises(NoData):  # a weekend, which is not requested
+                weekend = DateRange(datetime.date(2023, 2, 4), datetime.date(2023, 2, 5))
+                client.get_hist_stock(StockReqType.TRADE, "AAPL", weekend)
+    assert len(requests) == 3 and requests[0] == (20230201, 20230228)
+    # fetched concurrently, from the first trading day of the year
+    assert sorted(requests[1:]) == [(20230103, 20230131), (20230301, 20230331)]
+    expected = DateRange(datetime.date(2023, 1, 1), datetime.date(2023, 3, 31)).days(trading_only=True)
+    assert df[DataType.DATE].tolist() == [pd.Timestamp(d) for d in expected]
+    assert df[DataType.PRICE].tolist() == [float(d.day) for d in expected]
+
+
+def test_list_cache_ttl_lru(monkeypatch):
+    """Ensure that lists expire after the TTL, the least recently used list is evicted and roots are invalidated."""
+    now = [0.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ListCache(ttl=10, max_entries=2)
+    cache.put("a", pd.Series([1, 2]), root="spy")
+    cache.put("b", pd.Series([3]), root="QQQ")
+    lst = cache.get("a")
+    lst.iloc[0] = 100  # callers get a copy
+    assert cache.get("a").tolist() == [1, 2]
+    cache.put("c", pd.Series([4]))
+    assert cache.get("b") is None
+    cache.invalidate("SPY")
+    assert cache.get("a") is None
+    now[0] = 10.0
+    assert cache.get("c") is None
+    assert cache.stats() == {"hits": 2, "misses": 3, "entries": 0, "hit_rate": 0.4}
+
+
+def test_list_cache_client():
+    """Ensure that repeated list calls are served from the cache until they are invalidated."""
+    requests = []
+
+    def handler(line: str) -> bytes:
+        requests.append(line)
+        return list_response([20230120, 20230217])
+
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False, list_cache=ListCache())
+        with client.connect():
+            first = client.get_expirations("AAPL")
+            second = client.get_expirations("AAPL")
+            client.list_cache.invalidate("aapl")
+            client.get_expirations("AAPL")
+    assert first.equals(second)
+    assert len(requests) == 2
+    assert client.list_cache.hits == 1
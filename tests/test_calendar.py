@@ -0,0 +1,34 @@
+"""Contains tests for the trading calendar."""
+import datetime
+
+from thetadata import calendar
+
+
+def test_holidays():
+    """Ensure that the NYSE holidays and early closes of a year are computed by their rules."""
+    assert sorted(calendar.holidays(2022)) == [
+        datetime.date(2022, 1, 17),
+        datetime.date(2022, 2, 21),
+        datetime.date(2022, 4, 15),  # Good Friday
+        datetime.date(2022, 5, 30),
+        datetime.date(2022, 6, 20),  # Juneteenth, observed on Monday
+        datetime.date(2022, 7, 4),
+        datetime.date(2022, 9, 5),
+        datetime.date(2022, 11, 24),
+        datetime.date(2022, 12, 26),  # Christmas Day, observed on Monday
+    ]  # New Year's Day 2022 is a Saturday and not observed
+    assert sorted(calendar.early_closes(2024)) == [
+        datetime.date(2024, 7, 3), datetime.date(2024, 11, 29), datetime.date(2024, 12, 24)
+    ]
+    assert calendar.close_ms(datetime.date(2024, 11, 29)) == calendar.EARLY_CLOSE_MS
+    assert calendar.close_ms(datetime.date(2024, 11, 27)) == calendar.CLOSE_MS
+
+
+def test_trading_days():
+    """Ensure that weekends, holidays and special closures are not trading days."""
+    assert not calendar.is_trading_day(datetime.date(2023, 1, 7))  # a Saturday
+    assert not calendar.is_trading_day(datetime.date(2012, 10, 29))  # Hurricane Sandy
+    assert calendar.is_trading_day(datetime.date(2023, 1, 3))
+    assert calendar.next_trading_day(datetime.date(2023, 4, 6)) == datetime.date(2023, 4, 10)  # over Good Friday
+    assert calendar.previous_trading_day(datetime.date(2023, 1, 3)) == datetime.date(2022, 12, 30)
+    assert len(calendar.trading_days(datetime.date(2023, 1, 1), datetime.date(2023, 12, 31))) == 250
@@ -1,5 +1,10 @@
 """Contains various tests for the ThetaClient class."""
+import socket
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
 
 import pandas as pd
 from pandas import DataFrame, Series
@@ -12,9 +17,10 @@ from thetadata import (
     OptionRight,
     DateRange,
     SecType,
-    DataType, NoData,
+    StockReqType,
+    DataType, NoData, ReconnectingToServer, decode_raw, raw_n_rows,
 )
-from . import tc
+from . import tc, tick_response, list_response, error_response, fake_terminal, tcp_terminal
 
 
 @pytest.mark.skip(reason="Ignore for now.")  # TODO: remove
@@ -184,3 +190,252 @@ def test_get_last(tc: ThetaClient):
 def test_kill_method(tc: ThetaClient):
     """Test killing the Terminal process by calling client.kill()"""
     tc.kill()
+
+
+def test_recv_short_reads():
+    """Ensure that _recv reassembles a body delivered in many short reads."""
+    client = ThetaClient(launch=False, recv_size=7)
+    client._server, remote = socket.socketpair()
+    payload = bytes(range(256)) * 40
+
+    def send_slowly():
+        for i in range(0, len(payload), 100):
+            remote.sendall(payload[i: i + 100])
+
+    sender = threading.Thread(target=send_slowly)
+    sender.start()
+    try:
+        assert client._recv(len(payload)) == payload
+    finally:
+        sender.join()
+        client._server.close()
+        remote.close()
+
+
+def test_recv_connection_closed():
+    """Ensure that _recv raises if the Terminal closes the socket mid-body."""
+    client = ThetaClient(launch=False)
+    client._server, remote = socket.socketpair()
+    remote.sendall(b"\x00" * 10)
+    remote.close()
+    try:
+        with pytest.raises(ConnectionError):
+            client._recv(20)
+    finally:
+        client._server.close()
+
+
+def test_iter_hist_stock_chunks():
+    """Ensure that iter_hist_stock yields bounded, post-processed chunks."""
+    client = ThetaClient(launch=False)
+    rows = [[20230103, i, 100 + i, 8] for i in range(10)]
+    with fake_terminal(client, tick_response([0, 1, 134, 4], rows)):
+        chunks = list(client.iter_hist_stock(
+            req=StockReqType.TRADE,
+            root="AAPL",
+            date_range=DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3)),
+            chunk_rows=4,
+        ))
+    assert [len(c.index) for c in chunks] == [4, 4, 2]
+    df = pd.concat(chunks, ignore_index=True)
+    assert list(df.columns) == [DataType.DATE, DataType.MS_OF_DAY, DataType.PRICE]
+    assert df[DataType.PRICE].tolist() == pytest.approx([(100 + i) / 100 for i in range(10)])
+
+
+def test_iter_hist_stock_close_early():
+    """Ensure that closing the generator early drains the rest of the body."""
+    client = ThetaClient(launch=False)
+    rows = [[20230103, i, 100, 8] for i in range(10)]
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3))
+    with fake_terminal(client, tick_response([0, 1, 134, 4], rows), tick_response([0, 1, 134, 4], rows[:1])):
+        chunks = client.iter_hist_stock(StockReqType.TRADE, "AAPL", date_range, chunk_rows=3)
+        next(chunks)
+        chunks.close()
+        df = client.get_hist_stock(StockReqType.TRADE, "AAPL", date_range)
+    assert len(df.index) == 1
+
+
+def test_iter_hist_stock_no_data():
+    """Ensure that iter_hist_stock raises on an error response."""
+    client = ThetaClient(launch=False)
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3))
+    with fake_terminal(client, error_response("No data for the specified timeframe.")):
+        with pytest.raises(NoData):
+            next(client.iter_hist_stock(StockReqType.TRADE, "AAPL", date_range))
+
+
+def test_get_hist_option_many():
+    """Ensure that pipelined responses are matched to their requests in order."""
+    client = ThetaClient(launch=False)
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3))
+    reqs = [
+        dict(req=OptionReqType.EOD, root="AAPL", exp=datetime.date(2023, 1, 20), strike=strike,
+             right=OptionRight.CALL, date_range=date_range)
+        for strike in (140, 145, 150)
+    ]
+    responses = [
+        tick_response([0, 194, 4], [[20230103, 1000, 8]]),
+        error_response("No data for the specified timeframe & contract."),
+        tick_response([0, 194, 4], [[20230103, 500, 8]]),
+    ]
+    with fake_terminal(client, *responses) as remote:
+        res = client.get_hist_option_many(reqs, window=2, return_exceptions=True)
+        sent = remote.recv(4096).decode("utf-8")
+    assert sent.count("MSG_CODE=200") == 3
+    assert res[0][DataType.CLOSE].tolist() == [10.0]
+    assert isinstance(res[1], NoData)
+    assert res[2][DataType.CLOSE].tolist() == [5.0]
+
+    with fake_terminal(client, *responses):
+        with pytest.raises(NoData):
+            client.get_hist_option_many(reqs)
+
+
+def _close_at_strike(line: str) -> bytes:
+    """Reply to a historical request w/ a single tick whose close is the requested strike."""
+    strike = int(parse_qs(line)["strike"][0])
+    return tick_response([0, 194, 4], [[20230103, strike, 7]])
+
+
+def test_connection_pool_concurrent_requests():
+    """Ensure that concurrent requests over a pool of connections receive their own responses."""
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3))
+    with tcp_terminal(_close_at_strike) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect(pool_size=4):
+
+            def fetch(strike: int) -> float:
+                df = client.get_hist_option(OptionReqType.EOD, "AAPL", datetime.date(2023, 1, 20), strike,
+                                            OptionRight.CALL, date_range)
+                return df[DataType.CLOSE].iloc[0]
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                closes = list(executor.map(fetch, range(1, 201)))
+    assert closes == pytest.approx(list(range(1, 201)))
+
+
+def test_coalesce_identical_requests():
+    """Ensure that identical concurrent requests are sent once and each caller gets its own result."""
+    requested = []
+
+    def handler(line: str) -> bytes:
+        requested.append(parse_qs(line)["root"][0])
+        time.sleep(0.5)  # keep the request in flight while the other callers arrive
+        return tick_response([0, 1, 134, 4], [[20230103, 1, 100, 8]])
+
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect(pool_size=4):
+            barrier = threading.Barrier(8)
+
+            def fetch(root: str) -> DataFrame:
+                barrier.wait()
+                return client.get_last_stock(StockReqType.QUOTE, root)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                dfs = list(executor.map(fetch, ["AAPL"] * 6 + ["aapl", "MSFT"]))
+    assert sorted(requested, key=str.upper) in (["AAPL", "MSFT"], ["aapl", "MSFT"])
+    assert client.coalesce_stats() == {"requests": 8, "deduplicated": 6}
+    assert all(df[DataType.PRICE].tolist() == [1.0] for df in dfs)
+    assert len({id(df) for df in dfs}) == 8
+
+
+def test_get_req_raw():
+    """Ensure that raw requests return the undecoded tick body, which decodes like a regular request."""
+    response = tick_response([0, 1, 134, 4], [[20230103, 1, 100, 8], [20230103, 2, 101, 8]])
+    client = ThetaClient(launch=False)
+    with fake_terminal(client, response, response, error_response("No data for the specified timeframe.")):
+        header, body = client.get_req("MSG_CODE=200&root=AAPL", raw=True)
+        assert body.readonly and bytes(body) == response[20:]
+        assert raw_n_rows(header) == 2
+        df = client.get_req("MSG_CODE=200&root=AAPL")
+        assert decode_raw(body, header).equals(df)
+        assert decode_raw(header.to_bytes() + body).equals(df)
+        with pytest.raises(NoData):
+            client.get_req("MSG_CODE=200&root=AAPL", raw=True)
+
+
+def test_get_hist_stock_split():
+    """Ensure that split requests skip sub-ranges w/o data and are reassembled in date order."""
+
+    requested = []
+
+    def handler(line: str) -> bytes:
+        start = int(parse_qs(line)["START_DATE"][0])
+        requested.append(start)
+        if start == 20230109:
+            return error_response("No data for the specified timeframe.")
+        return tick_response([0, 1, 134, 4], [[start, 1, start % 100, 10], [start, 2, start % 100, 10]])
+
+    date_range = DateRange(datetime.date(2023, 1, 4), datetime.date(2023, 1, 20))
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect(pool_size=3):
+            df = client.get_hist_stock(StockReqType.TRADE, "AAPL", date_range, split="week")
+            with pytest.raises(NoData):
+                client.get_hist_stock(StockReqType.TRADE, "AAPL", DateRange(
+                    datetime.date(2023, 1, 9), datetime.date(2023, 1, 9)), split="day")
+            # a bad output format fails before any request is sent
+            requested.clear()
+            with pytest.raises(AssertionError):
+                client.get_hist_stock(StockReqType.TRADE, "AAPL", date_range, split="week", output="csv")
+            assert requested == []
+    # the third week starts after Martin Luther King Jr. Day
+    assert df[DataType.DATE].dt.day.tolist() == [4, 4, 17, 17]
+    assert df[DataType.PRICE].tolist() == [4, 4, 17, 17]
+    assert df.index.tolist() == [0, 1, 2, 3]
+
+
+def test_get_hist_stock_checkpoint(tmp_path, monkeypatch):
+    """Ensure that checkpointed requests retry failed units and resume w/o fetching completed units again."""
+    monkeypatch.setattr(thetadata.client, "_RETRY_BACKOFF", 0)
+    requested = []
+    failures = {20230105: 2}
+
+    def handler(line: str) -> bytes:
+        start = int(parse_qs(line)["START_DATE"][0])
+        requested.append(start)
+        if failures.get(start, 0) > 0:
+            failures[start] -= 1
+            return error_response("Disconnected from Theta Data. Reconnecting...")
+        if start == 20230104:
+            return error_response("No data for the specified timeframe.")
+        return tick_response([0, 1, 134, 4], [[start, 1, start % 100, 10]])
+
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 6))
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect(pool_size=2):
+            with pytest.raises(ReconnectingToServer):
+                client.get_hist_stock(StockReqType.TRADE, "AAPL", date_range, checkpoint_dir=str(tmp_path), retries=0)
+            assert sorted(requested) == [20230103, 20230104, 20230105, 20230106]
+            requested.clear()
+            df = client.get_hist_stock(StockReqType.TRADE, "AAPL", date_range, checkpoint_dir=str(tmp_path))
+    assert requested == [20230105, 20230105]
+    assert df[DataType.DATE].dt.day.tolist() == [3, 5, 6]
+    assert list(tmp_path.glob("*.bin")) == []
+
+
+def test_get_hist_chain():
+    """Ensure that a chain is fetched for every listed contract and tagged w/ strike and right."""
+
+    def handler(line: str) -> bytes:
+        if line.startswith("MSG_CODE=202"):
+            return list_response([140000, 145000, 150000])
+        params = parse_qs(line)
+        strike, right = int(params["strike"][0]), params["right"][0]
+        if strike == 150000 and right == "P":
+            return error_response("No data for the specified timeframe & contract.")
+        close = strike if right == "C" else -strike
+        return tick_response([0, 1, 194, 4], [[20230103, 0, close, 7], [20230104, 0, close, 7]])
+
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 4))
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect(pool_size=2):
+            df = client.get_hist_chain(OptionReqType.EOD, "AAPL", datetime.date(2023, 1, 20), date_range)
+    assert df.index.names == ["strike", "right", DataType.DATE, DataType.MS_OF_DAY]
+    assert len(df.index) == 10
+    assert df.loc[(145.0, "P"), DataType.CLOSE].tolist() == [-145.0, -145.0]
+    assert df.loc[(150.0, "C"), DataType.CLOSE].tolist() == [150.0, 150.0]
+    assert (150.0, "P") not in df.index.droplevel([2, 3])
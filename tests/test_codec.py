@@ -0,0 +1,74 @@
+"""Contains various tests for the codec module."""
+import datetime
+
+import numpy as np
+import pytest
+from thetadata import DataType, Exchange, MessageType, QuoteCondition, TradeCondition, codec
+from thetadata.client import Contract, Quote, Trade
+from thetadata.exceptions import _EnumParseError
+
+
+def test_header_round_trip():
+    """Ensure that a header decodes to the fields it was encoded from."""
+    data = codec.encode_header(MessageType.HIST, 7, 12, 0, 3, 1 << 20)
+    assert len(data) == codec.HEADER_SIZE == 20
+    assert codec.decode_header(data) == (MessageType.HIST, 7, 12, 0, 3, 1 << 20)
+    with pytest.raises(_EnumParseError):
+        codec.decode_header(codec.HEADER.pack(65535, 0, 0, 0, 0, 0))
+
+
+def test_ticks_round_trip():
+    """Ensure that ticks are encoded w/ their format tick and null tick, and decode back."""
+    format_tick = [DataType.MS_OF_DAY, DataType.PRICE, DataType.DATE]
+    ticks = np.array([[1, 2, 20230103], [4, -5, 20230104]], dtype=np.int32)
+    data = codec.encode_ticks(format_tick, ticks)
+    assert len(data) == 4 * 3 * 4
+    assert codec.decode_format(data, 3) == format_tick
+    decoded = codec.decode_ticks(data, 3)
+    assert decoded.dtype == np.int32
+    np.testing.assert_array_equal(decoded[1:-1], ticks)
+    assert not decoded[-1].any()
+
+
+@pytest.mark.parametrize("option", [False, True])
+def test_contract_round_trip(option):
+    """Ensure that stream contracts decode like the ThetaClient stream does."""
+    data = codec.encode_contract("SPY", option, 20230120, True, 380000) if option else codec.encode_contract("SPY")
+    assert data[0] == len(data)
+    contract = Contract()
+    contract.from_bytes(data)
+    assert contract.root == "SPY" and contract.isOption == option
+    if option:
+        assert contract.exp == datetime.date(2023, 1, 20)
+        assert contract.isCall and contract.strike == 380.0
+
+
+def test_stream_messages():
+    """Ensure that stream payloads decode w/ their price types and enum codes."""
+    trade = Trade()
+    trade.from_bytes(codec.TRADE.pack(34200000, 5, 100, 0, 15025, 1, 8, 20230103))
+    assert (trade.ms_of_day, trade.sequence, trade.size) == (34200000, 5, 100)
+    assert trade.price == 150.25
+    assert trade.condition == codec.from_code(TradeCondition, 0)
+    assert trade.exchange == codec.from_code(Exchange, 1)
+    assert trade.date == datetime.date(2023, 1, 3)
+
+    quote = Quote()
+    quote.from_bytes(codec.QUOTE.pack(34200000, 10, 1, 15025, 0, 20, 1, 15030, 0, 8, 20230103))
+    assert (quote.bid_price, quote.ask_price) == (150.25, 150.3)
+    assert (quote.bid_size, quote.ask_size) == (10, 20)
+    assert quote.bid_condition == codec.from_code(QuoteCondition, 0)
+    assert quote.date == datetime.date(2023, 1, 3)
+
+
+def test_stream_messages_unknown_condition():
+    """Ensure that unknown condition codes decode as UNDEFINED instead of failing the stream message."""
+    trade = Trade()
+    trade.from_bytes(codec.TRADE.pack(34200000, 5, 100, 9999, 15025, 1, 8, 20230103))
+    assert trade.condition == TradeCondition.UNDEFINED and trade.price == 150.25
+
+    quote = Quote()
+    quote.from_bytes(codec.QUOTE.pack(34200000, 10, 1, 15025, 9999, 20, 1, 15030, 9998, 8, 20230103))
+    assert quote.bid_condition == quote.ask_condition == QuoteCondition.UNDEFINED
+    with pytest.raises(_EnumParseError):
+        codec.from_code(TradeCondition, 9999)
@@ -0,0 +1,30 @@
+"""Contains various tests for the enums module."""
+import datetime
+
+import pytest
+from thetadata import DateRange
+
+
+def test_date_range_split():
+    """Ensure that splitting a date range covers it w/ consecutive sub-ranges."""
+    date_range = DateRange(datetime.date(2023, 1, 4), datetime.date(2023, 1, 20))
+    weeks = date_range.split("week")
+    assert [(r.start.day, r.end.day) for r in weeks] == [(4, 8), (9, 15), (16, 20)]
+    assert [(r.start.day, r.end.day) for r in date_range.split(7)] == [(4, 10), (11, 17), (18, 20)]
+    days = date_range.split("day")
+    assert len(days) == 17 and all(r.start == r.end for r in days)
+    with pytest.raises(AssertionError):
+        date_range.split(0)
+
+
+def test_date_range_split_trading_days():
+    """Ensure that splitting on trading days skips weekends and holidays."""
+    date_range = DateRange(datetime.date(2023, 1, 1), datetime.date(2023, 1, 22))
+    weeks = date_range.split("week", trading_days=True)
+    # New Year's Day is observed on Monday the 2nd, Martin Luther King Jr. Day is Monday the 16th
+    assert [(r.start.day, r.end.day) for r in weeks] == [(3, 6), (9, 13), (17, 20)]
+    assert [(r.start.day, r.end.day) for r in date_range.split(3, trading_days=True)] == [
+        (3, 5), (6, 10), (11, 13), (17, 19), (20, 20)
+    ]
+    assert len(date_range.split("day", trading_days=True)) == 13 == len(date_range.days(trading_only=True))
+    assert DateRange(datetime.date(2023, 1, 14), datetime.date(2023, 1, 16)).split("day", trading_days=True) == []
@@ -0,0 +1,47 @@
+"""Contains tests of the partitioned Parquet and Feather exports of historical data."""
+import datetime
+import os
+
+import pytest
+from thetadata import DateRange, OptionReqType, OptionRight, StockReqType, ThetaClient
+from . import tcp_terminal, tick_response
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset  # noqa: E402
+import pyarrow.feather  # noqa: E402
+
+FMT = [0, 1, 134, 4]
+ROWS = [[20230103, 1, 100, 8], [20230103, 2, 101, 8], [20230103, 3, 102, 8], [20230104, 4, 103, 8], [20230105, 5, 104, 8]]
+DATE_RANGE = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 5))
+
+
+def test_export_hist_stock(tmp_path):
+    """Ensure that ticks decoded in chunks are written to a file per date that read back as the whole request."""
+    with tcp_terminal(lambda line: tick_response(FMT, ROWS)) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect():
+            paths = client.export_hist_stock(StockReqType.TRADE, "aapl", DATE_RANGE, str(tmp_path), chunk_rows=2)
+            expected = client.get_hist_stock(StockReqType.TRADE, "AAPL", DATE_RANGE, output="arrow")
+    assert [os.path.relpath(p, tmp_path) for p in paths] == [
+        os.path.join("root=AAPL", f"date={day}", "trade.parquet") for day in (20230103, 20230104, 20230105)
+    ]
+    assert pa.parquet.ParquetFile(paths[0]).num_row_groups == 2  # rows 0-1 and 2 of the first day
+    table = pa.dataset.dataset(str(tmp_path), format="parquet", partitioning="hive").to_table()
+    assert table.column("date").to_pylist() == [20230103] * 3 + [20230104, 20230105]
+    assert table.drop_columns(["root", "date"]).equals(expected.drop_columns(["date"]))
+    assert not any(name.endswith(".tmp") for _, _, files in os.walk(tmp_path) for name in files)
+
+
+def test_export_hist_option_feather(tmp_path):
+    """Ensure that options are partitioned by expiration and named after their contract."""
+    with tcp_terminal(lambda line: tick_response(FMT, ROWS)) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect():
+            paths = client.export_hist_option(
+                OptionReqType.TRADE, "AAPL", datetime.date(2023, 1, 20), 150, OptionRight.CALL, DATE_RANGE,
+                str(tmp_path), file_format="feather",
+            )
+    assert os.path.relpath(paths[0], tmp_path) == os.path.join(
+        "root=AAPL", "exp=20230120", "date=20230103", "trade_C_150000.feather"
+    )
+    assert pa.feather.read_table(paths[0]).column("price").to_pylist() == [1.0, 1.01, 1.02]
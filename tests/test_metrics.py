@@ -0,0 +1,72 @@
+"""Contains various tests for the metrics module."""
+import datetime
+
+import pytest
+from thetadata import (
+    DateRange,
+    MetricsAggregator,
+    NoData,
+    OptionReqType,
+    OptionRight,
+    RequestMetrics,
+    StockReqType,
+    ThetaClient,
+)
+from thetadata.metrics import request_type
+from . import error_response, fake_terminal, list_response, tick_response
+
+
+def test_request_type():
+    """Ensure that requests are named by their message, security and request types."""
+    assert request_type("MSG_CODE=200&root=AAPL&sec=STOCK&req=201&rth=True\n") == "HIST/STOCK/TRADE"
+    assert request_type("MSG_CODE=200&root=AAPL&sec=OPTION&req=101\n") == "HIST/OPTION/QUOTE"
+    assert request_type("MSG_CODE=201&root=AAPL\n") == "ALL_EXPIRATIONS"
+
+
+def test_metrics_hook():
+    """Ensure that every sent request is recorded w/ its size, rows and error, including pipelined requests."""
+    aggregator = MetricsAggregator()
+    client = ThetaClient(launch=False, metrics_hook=aggregator)
+    date_range = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3))
+    trades = tick_response([0, 1, 134, 4], [[20230103, i, 100, 8] for i in range(5)])
+    with fake_terminal(client, trades, list_response([20230120, 20230217]), error_response("No data")):
+        client.get_hist_stock(StockReqType.TRADE, "AAPL", date_range)
+        client.get_expirations("AAPL")
+        with pytest.raises(NoData):
+            client.get_hist_stock(StockReqType.TRADE, "AAPL", date_range)
+
+    hist = aggregator.samples("HIST/STOCK/TRADE")
+    assert [(m.rows, m.error) for m in hist] == [(5, None), (0, "NoData")]
+    assert hist[0].n_bytes == len(trades) - 20
+    assert all(m.ttfb >= 0 and m.recv_time >= 0 and m.parse_time > 0 for m in hist)
+    assert [m.rows for m in aggregator.samples("ALL_EXPIRATIONS")] == [2]
+
+    reqs = [
+        dict(req=OptionReqType.EOD, root="AAPL", exp=datetime.date(2023, 1, 20), strike=strike,
+             right=OptionRight.CALL, date_range=date_range)
+        for strike in (140, 145)
+    ]
+    eod = tick_response([0, 194, 4], [[20230103, 1000, 8]])
+    with fake_terminal(client, eod, eod):
+        client.get_hist_option_many(reqs, window=1)
+    assert [m.rows for m in aggregator.samples("HIST/OPTION/EOD")] == [1, 1]
+
+    summary = aggregator.summary()
+    assert summary.loc["HIST/STOCK/TRADE", "count"] == 2
+    assert summary.loc["HIST/STOCK/TRADE", "errors"] == 1
+    assert summary.loc["HIST/OPTION/EOD", "rows_p50"] == 1
+    assert {"ttfb_p50", "ttfb_p99", "mb_per_sec_p99", "parse_time_p50", "latency_p99"} <= set(summary.columns)
+    aggregator.reset()
+    assert aggregator.summary().empty
+
+
+def test_metrics_aggregator_quantiles():
+    """Ensure that summaries compute quantiles over the most recent `max_samples` requests."""
+    aggregator = MetricsAggregator(max_samples=100)
+    for i in range(200):
+        aggregator(RequestMetrics("HIST/STOCK/TRADE", "", 0.0, None, ttfb=i / 1000, recv_time=0.5, n_bytes=10**6))
+    summary = aggregator.summary(quantiles=(0.5, 0.99))
+    assert summary.loc["HIST/STOCK/TRADE", "count"] == 100
+    assert summary.loc["HIST/STOCK/TRADE", "ttfb_p50"] == pytest.approx(0.1495)
+    assert summary.loc["HIST/STOCK/TRADE", "mb_per_sec_p99"] == pytest.approx(2.0)
+    assert summary["latency_p50"].isna().all()
@@ -0,0 +1,108 @@
+"""Contains various tests for parsing Terminal responses."""
+import numpy as np
+import pandas as pd
+import pytest
+from thetadata import DataType, Header, TickBody
+from thetadata.exceptions import ResponseParseError
+from . import tick_response
+
+
+def parse_response(response: bytes, **kwargs) -> pd.DataFrame:
+    """Parse an encoded tick response."""
+    header = Header.parse("test", response[:20])
+    return TickBody.parse("test", header, bytearray(response[20:]), **kwargs)
+
+
+def test_tick_body_price_scaling():
+    """Ensure that every price is scaled by the multiplier of its own price type."""
+    df = parse_response(tick_response(
+        [0, 1, 103, 133, 107, 4],
+        [[20230103, 1, 150, 5, 151, 8], [20230104, 2, 150, 6, 151, 10], [20230105, 3, 7, 7, 9, 0]],
+    ))
+    assert list(df.columns) == [DataType.DATE, DataType.MS_OF_DAY, DataType.BID, DataType.CONDITION, DataType.ASK]
+    assert df[DataType.BID].tolist() == pytest.approx([1.5, 150.0, 0.0])
+    assert df[DataType.ASK].tolist() == pytest.approx([1.51, 151.0, 0.0])
+    assert df[DataType.BID].dtype == np.float64
+    assert df[DataType.CONDITION].tolist() == [5, 6, 7]
+    assert df[DataType.DATE].tolist() == list(pd.to_datetime(["2023-01-03", "2023-01-04", "2023-01-05"]))
+
+
+def test_tick_body_concat():
+    """Ensure that concatenated tick bodies drop their trailing null ticks."""
+    bodies = [
+        TickBody.from_response("test", Header.parse("test", r[:20]), r[20:])
+        for r in (tick_response([0, 1], [[20230103, 1]]), tick_response([0, 1], [[20230104, 2], [20230104, 3]]))
+    ]
+    df = TickBody.concat(bodies)._to_dataframe()
+    assert df[DataType.MS_OF_DAY].tolist() == [1, 2, 3]
+
+
+def test_yyyymmdd_to_datetime64():
+    """Ensure that integer dates convert to the same datetimes as string parsing, including leap days."""
+    from thetadata.parsing import _yyyymmdd_to_datetime64
+    dates = [19991231, 20000229, 20000229, 20230103, 20231231, 20240229]
+    expected = pd.to_datetime([str(d) for d in dates], format="%Y%m%d")
+    assert list(_yyyymmdd_to_datetime64(np.array(dates, dtype=np.int32))) == list(expected)
+    assert len(_yyyymmdd_to_datetime64(np.array([], dtype=np.int32))) == 0
+    # invalid dates fail instead of rolling over into the next month
+    for invalid in (20230229, 21000229, 20230431, 20231301, 20230001, 20230100, 0):
+        with pytest.raises(ResponseParseError):
+            _yyyymmdd_to_datetime64(np.array([20230103, invalid], dtype=np.int32))
+
+
+def test_tick_body_timestamp():
+    """Ensure that the timestamp column combines date and ms of day in exchange time across DST changes."""
+    response = tick_response([0, 1, 4], [[20230310, 34_200_000, 1], [20230313, 34_200_000, 1]])
+    header = Header.parse("test", response[:20])
+    local = TickBody.parse("test", header, response[20:], timestamp="local")
+    assert list(local.columns)[0] == "timestamp"
+    assert local["timestamp"].tolist() == [
+        pd.Timestamp("2023-03-10 09:30", tz="America/New_York"),
+        pd.Timestamp("2023-03-13 09:30", tz="America/New_York"),
+    ]
+    utc = TickBody.parse("test", header, response[20:], timestamp="utc")
+    assert utc["timestamp"].tolist() == [pd.Timestamp("2023-03-10 14:30", tz="UTC"),
+                                         pd.Timestamp("2023-03-13 13:30", tz="UTC")]
+    assert "timestamp" not in TickBody.parse("test", header, response[20:]).columns
+
+
+@pytest.mark.parametrize("output", ["numpy", "arrow", "polars"])
+def test_tick_body_output_formats(output):
+    """Ensure that every output format holds the same decoded columns as the pandas DataFrame."""
+    if output != "numpy":
+        pytest.importorskip("pyarrow" if output == "arrow" else "polars")
+    response = tick_response(
+        [0, 1, 103, 133, 107, 4], [[20230313, 34_200_000, 150, 5, 151, 8], [20230314, 34_200_001, 7, 7, 9, 0]]
+    )
+    header = Header.parse("test", response[:20])
+    expected = TickBody.parse("test", header, response[20:], timestamp="utc")
+    result = TickBody.parse("test", header, response[20:], timestamp="utc", output=output)
+    result = pd.DataFrame(result) if output == "numpy" else result.to_pandas()
+    assert list(result.columns) == ["timestamp", "date", "ms_of_day", "bid", "condition", "ask"]
+    assert result["bid"].tolist() == pytest.approx(expected[DataType.BID].tolist())
+    assert result["condition"].tolist() == expected[DataType.CONDITION].tolist()
+    assert list(result["date"]) == list(expected[DataType.DATE])
+    assert list(pd.to_datetime(result["timestamp"], utc=True)) == list(expected["timestamp"])
+
+
+def test_tick_body_compact():
+    """Ensure that compact mode downcasts the columns whose values fit and reports the bytes saved."""
+    response = tick_response([0, 101, 102, 103, 104, 4], [[20230103, 10, 5, 150, 7, 8], [20230103, 20, 6, 151, 300, 8]])
+    df = parse_response(response)
+    compact = parse_response(response, compact=True)
+    assert compact[DataType.BID_SIZE].dtype == np.uint32
+    assert compact[DataType.BID_EXCHANGE].dtype == np.uint8
+    assert compact[DataType.BID].dtype == np.float32
+    assert compact[DataType.BID_CONDITION].dtype == np.int32  # 300 does not fit in uint8
+    assert compact[DataType.BID].tolist() == pytest.approx(df[DataType.BID].tolist())
+    assert compact[DataType.BID_EXCHANGE].tolist() == df[DataType.BID_EXCHANGE].tolist()
+    assert compact.attrs["compact_bytes_saved"] == 2 * 3 + 2 * 4
+    assert "compact_bytes_saved" not in df.attrs
+
+    # prices w/ more digits than float32 can hold stay float64
+    df = parse_response(tick_response([103, 4], [[123_456_789, 10]]), compact=True)
+    assert df[DataType.BID].dtype == np.float64
+    df = parse_response(tick_response([103, 4], [[(1 << 23) + 1, 10]]), compact=True)
+    assert df[DataType.BID].dtype == np.float64
+    df = parse_response(tick_response([103, 4], [[(1 << 23) - 1, 10]]), compact=True)
+    assert df[DataType.BID].dtype == np.float32
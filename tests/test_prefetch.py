@@ -0,0 +1,57 @@
+"""Contains tests of the executor that overlaps receiving responses w/ parsing them."""
+import datetime
+import time
+from urllib.parse import parse_qs
+
+import pytest
+from thetadata import DataType, DateRange, NoData, PrefetchExecutor, StockReqType, ThetaClient
+from . import error_response, tcp_terminal, tick_response
+
+DATE_RANGE = DateRange(datetime.date(2023, 1, 3), datetime.date(2023, 1, 3))
+ROOTS = ["AAPL", "MSFT", "SPY", "QQQ", "IWM"]
+
+
+def handler(line: str) -> bytes:
+    root = parse_qs(line)["root"][0]
+    if root == "NONE":
+        return error_response("No data for the specified timeframe.")
+    time.sleep(0.05)  # network time to hide parsing behind
+    n_rows = 10 * (ROOTS.index(root) + 1)  # later bodies are larger, so the buffers are regrown
+    return tick_response([0, 1, 134, 4], [[20230103, i, ROOTS.index(root), 8] for i in range(n_rows)])
+
+
+def reqs(roots):
+    return [dict(req=StockReqType.TRADE, root=root, date_range=DATE_RANGE) for root in roots]
+
+
+def test_prefetch_hist_stock():
+    """Ensure that prefetched responses are parsed in order and the parse time hidden is reported."""
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect(pool_size=1):
+            executor = PrefetchExecutor(client)
+            dfs = list(executor.hist_stock(reqs(ROOTS)))
+    assert [len(df.index) for df in dfs] == [10, 20, 30, 40, 50]
+    assert [df[DataType.PRICE].iloc[0] for df in dfs] == [0.0, 0.01, 0.02, 0.03, 0.04]
+    stats = executor.stats()
+    assert stats["requests"] == 5
+    assert stats["recv_time"] >= 5 * 0.05
+    assert 0 <= stats["hidden_time"] <= stats["parse_time"]
+
+
+def test_prefetch_errors_and_close_early():
+    """Ensure that failed requests can be returned and that closing a scan early keeps the connection usable."""
+    with tcp_terminal(handler) as port:
+        client = ThetaClient(port=port, launch=False)
+        with client.connect(pool_size=1):
+            executor = PrefetchExecutor(client)
+            results = list(executor.hist_stock(reqs(["AAPL", "NONE", "MSFT"]), return_exceptions=True))
+            assert isinstance(results[1], NoData) and len(results[2].index) == 20
+            with pytest.raises(NoData):
+                list(executor.hist_stock(reqs(["NONE", "AAPL"])))
+
+            scan = executor.hist_stock(reqs(ROOTS))
+            assert len(next(scan).index) == 10
+            scan.close()
+            df = client.get_hist_stock(StockReqType.TRADE, "SPY", DATE_RANGE)
+    assert len(df.index) == 30
@@ -0,0 +1,110 @@
+"""Contains integration tests of the ThetaClient against the Terminal simulator."""
+import threading
+from datetime import date
+
+import pandas as pd
+import pytest
+from thetadata import (
+    DataType,
+    DateRange,
+    NoData,
+    OptionReqType,
+    OptionRight,
+    ReconnectingToServer,
+    SecType,
+    StockReqType,
+    StreamMsgType,
+    StreamResponseType,
+    ThetaClient,
+)
+from thetadata.simulator import DataGenerator, TerminalSimulator
+
+DATE_RANGE = DateRange(date(2022, 9, 12), date(2022, 9, 16))  # a Monday through a Friday
+
+
+@pytest.fixture
+def sim():
+    with TerminalSimulator(generator=DataGenerator(rows_per_day=50)) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def client(sim):
+    client = ThetaClient(port=sim.port, streaming_port=sim.stream_port, launch=False)
+    with client.connect():
+        yield client
+
+
+def test_hist_stock(client):
+    df = client.get_hist_stock(StockReqType.QUOTE, "AAPL", DATE_RANGE)
+    assert len(df.index) == 5 * 50
+    assert (df[DataType.ASK] > df[DataType.BID]).all()
+    assert df[DataType.DATE].min() == pd.Timestamp(2022, 9, 12)
+    # the generated data is deterministic
+    assert df.equals(client.get_hist_stock(StockReqType.QUOTE, "AAPL", DATE_RANGE))
+
+
+def test_hist_option_intervals(client):
+    df = client.get_hist_option(
+        OptionReqType.OHLC, "AAPL", date(2022, 9, 16), 150, OptionRight.CALL, DATE_RANGE, interval_size=60_000
+    )
+    assert len(df.index) == 5 * 390  # one tick per minute of regular trading hours
+    assert (df[DataType.HIGH] >= df[DataType.LOW]).all()
+
+
+def test_lists(client):
+    assert "SPY" in client.get_roots(SecType.STOCK).tolist()
+    exps = client.get_expirations("AAPL")
+    assert all(exp.weekday() == 4 for exp in exps)
+    strikes = client.get_strikes("AAPL", exps.iloc[0])
+    assert len(strikes) > 0 and (strikes % 5 == 0).all()
+
+
+def test_error_injection():
+    with TerminalSimulator(no_data_rate=1.0) as sim:
+        client = ThetaClient(port=sim.port, launch=False)
+        with client.connect():
+            with pytest.raises(NoData):
+                client.get_hist_stock(StockReqType.QUOTE, "AAPL", DATE_RANGE)
+    with TerminalSimulator(disconnect_rate=1.0) as sim:
+        client = ThetaClient(port=sim.port, launch=False)
+        with client.connect():
+            with pytest.raises(ReconnectingToServer):
+                client.get_roots(SecType.STOCK)
+
+
+def test_hist_rest(sim, client):
+    df = client.get_hist_stock_REST(StockReqType.QUOTE, "AAPL", DATE_RANGE, port=str(sim.rest_port))
+    assert len(df.index) == 5 * 50
+
+
+def test_stream(sim):
+    client = ThetaClient(port=sim.port, streaming_port=sim.stream_port, launch=False)
+    quotes = []
+    received = threading.Event()
+
+    def callback(msg):
+        if msg.type == StreamMsgType.QUOTE:
+            quotes.append(msg.quote.bid_price)
+            received.set()
+
+    thread = client.connect_stream(callback)
+    try:
+        req_id = client.req_quote_stream_opt("SPY", date(2022, 9, 16), 400, OptionRight.CALL)
+        assert client.verify(req_id) == StreamResponseType.SUBSCRIBED
+        assert received.wait(5)
+    finally:
+        client.close_stream()
+        thread.join(15)
+    assert quotes[0] > 0
+
+
+def test_hist_early_close(client):
+    """Ensure that no ticks are generated after the early close of the day after Thanksgiving."""
+    date_range = DateRange(date(2022, 11, 23), date(2022, 11, 25))  # Thanksgiving is on the 24th
+    df = client.get_hist_stock(StockReqType.QUOTE, "AAPL", date_range)
+    assert len(df.index) == 2 * 50
+    early = df[df[DataType.DATE] == pd.Timestamp(2022, 11, 25)]
+    assert len(early.index) == 50 and early[DataType.MS_OF_DAY].max() < 13 * 3_600_000
+    df = client.get_hist_stock(StockReqType.OHLC, "AAPL", date_range, interval_size=60_000)
+    assert (df[DataType.DATE] == pd.Timestamp(2022, 11, 25)).sum() == 210  # 09:30 through 13:00
@@ -0,0 +1,46 @@
+"""Contains various tests for the memory-mapped tick store."""
+import datetime
+
+import numpy as np
+import pytest
+from thetadata import DataType, DateRange, Header, TickBody, TickStore, write_store
+from . import tick_response
+
+
+def body_of(response: bytes) -> TickBody:
+    """Parse an encoded tick response w/o decoding it."""
+    return TickBody.from_response("test", Header.parse("test", response[:20]), response[20:])
+
+
+def test_store_round_trip(tmp_path):
+    """Ensure that a store reads back the same ticks as the bodies it was written from."""
+    fmt = [0, 1, 103, 4]
+    bodies = [
+        body_of(tick_response(fmt, [[20230103, 1, 150, 8], [20230103, 2, 151, 8]])),
+        body_of(tick_response(fmt, [[20230104, 3, 152, 8], [20230105, 4, 153, 7]])),
+    ]
+    path = str(tmp_path / "quotes.ticks")
+    assert write_store(path, bodies) == 4
+
+    store = TickStore(path)
+    assert len(store) == 4
+    assert store.format_tick == [DataType.DATE, DataType.MS_OF_DAY, DataType.BID, DataType.PRICE_TYPE]
+    assert isinstance(store.column(DataType.MS_OF_DAY), np.memmap)
+    assert store.read().equals(TickBody.concat(bodies)._to_dataframe())
+
+    df = store.read(date_range=DateRange(datetime.date(2023, 1, 4), datetime.date(2023, 1, 5)))
+    assert df[DataType.MS_OF_DAY].tolist() == [3, 4]
+    assert df[DataType.BID].tolist() == pytest.approx([1.52, 0.153])
+    assert store.read(rows=slice(1, 2))[DataType.MS_OF_DAY].tolist() == [2]
+
+
+def test_store_empty_and_invalid(tmp_path):
+    """Ensure that empty stores can be opened and other files are rejected."""
+    path = str(tmp_path / "empty.ticks")
+    write_store(path, [body_of(tick_response([0, 1], []))])
+    assert len(TickStore(path)) == 0
+    assert len(TickStore(path).read()) == 0
+
+    (tmp_path / "other").write_bytes(b"not a store")
+    with pytest.raises(ValueError):
+        TickStore(str(tmp_path / "other"))
@@ -1,4 +1,9 @@
 from .client import ThetaClient
+from .async_client import AsyncThetaClient
+from .cache import HistCache, ListCache
+from .metrics import MetricsAggregator, RequestMetrics
+from .prefetch import PrefetchExecutor
+from .store import TickStore, write_store
 from .client import StreamMsg
 from .client import Trade
 from .client import Quote
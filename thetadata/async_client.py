@@ -0,0 +1,445 @@
+"""Module that contains the asyncio Theta Client class."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
+
+import pandas as pd
+
+from .client import (
+    _VERSION,
+    _NOT_CONNECTED_MSG,
+    _hist_option_msg,
+    _hist_stock_msg,
+    _at_time_option_msg,
+    _at_time_stock_msg,
+    _last_option_msg,
+    _last_stock_msg,
+    _dates_stock_msg,
+    _dates_option_msg,
+    _dates_option_bulk_msg,
+    _expirations_msg,
+    _strikes_msg,
+    _roots_msg,
+    _parse_strikes,
+)
+from .enums import *
+from .exceptions import ResponseParseError
+from .parsing import Header, TickBody, ListBody
+
+# bodies larger than this are parsed in the default executor so the event loop is not blocked
+_EXECUTOR_PARSE_SIZE = 1 << 20
+# response bodies are read in chunks of at most this many bytes, each w/ its own timeout
+_READ_SIZE = 1 << 16
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncThetaClient:
+    """An asyncio client used to fetch historical market data from an already running Theta Terminal.
+    Requests can be made concurrently from a single event loop; at most `pool_size` of them are sent to the
+    Terminal at once. Use `ThetaClient` to launch the Terminal."""
+
+    def __init__(self, port: int = 11000, timeout: Optional[float] = 60, host: str = "127.0.0.1"):
+        """Construct an asyncio client instance to interface with market data.
+
+        :param port: The port number specified in the Theta Terminal config, which can usually be found under
+                        %user.home%/ThetaData/ThetaTerminal.
+        :param timeout: The max number of seconds to wait for a response before throwing a TimeoutError
+        :param host: The host name or IP address of Theta Terminal server
+        """
+        self.host: str = host
+        self.port: int = port
+        self.timeout = timeout
+        self._pool: Optional[asyncio.LifoQueue] = None  # None while disconnected
+
+    @asynccontextmanager
+    async def connect(self, pool_size: int = 8) -> AsyncIterator[None]:
+        """Initiate a connection with the Theta Terminal. Requests can only be made inside this
+            generator aka the `async with client.connect()` block.
+
+        :param pool_size: The number of connections to keep open to the Terminal, which is the max number of
+                            requests in flight. Other requests wait for a free connection.
+        :raises ConnectionRefusedError: If the connection failed.
+        """
+        assert pool_size > 0, "pool_size must be positive"
+        conns = await asyncio.gather(*[self._open_connection() for _ in range(pool_size)], return_exceptions=True)
+        errors = [conn for conn in conns if isinstance(conn, BaseException)]
+        if errors:
+            # close the connections that did open instead of leaking them
+            for conn in conns:
+                if not isinstance(conn, BaseException):
+                    conn[1].close()
+            raise errors[0]
+        self._pool = asyncio.LifoQueue()
+        for conn in conns:
+            self._pool.put_nowait(conn)
+        try:
+            yield
+        finally:
+            pool, self._pool = self._pool, None
+            while not pool.empty():
+                conn = pool.get_nowait()
+                if conn is not None:
+                    conn[1].close()
+
+    async def _open_connection(self) -> _Connection:
+        """Open a new connection to the Terminal and send it this API version."""
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout)
+        ver_msg = f"MSG_CODE={MessageType.HIST.value}&version={_VERSION}\n"
+        writer.write(ver_msg.encode("utf-8"))
+        await writer.drain()
+        return reader, writer
+
+    async def _request(self, msg: str) -> Tuple[Header, bytearray]:
+        """Send a request to the Terminal and receive its response.
+
+        A connection that fails mid-request is closed and lazily replaced by a new connection.
+
+        :return: The parsed response header and the raw response body.
+        """
+        assert self._pool is not None, _NOT_CONNECTED_MSG
+        pool = self._pool
+        conn = await pool.get()
+        try:
+            if conn is None:
+                conn = await self._open_connection()
+            reader, writer = conn
+            writer.write(msg.encode("utf-8"))
+            await writer.drain()
+            header = Header.parse(msg, await asyncio.wait_for(reader.readexactly(20), self.timeout))
+            body = await self._read_body(reader, header.size)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.CancelledError,
+                ResponseParseError):
+            if conn is not None:
+                conn[1].close()
+                conn = None
+            raise
+        finally:
+            if self._pool is pool:
+                pool.put_nowait(conn)
+            elif conn is not None:
+                conn[1].close()  # the client disconnected while the request was in flight
+        return header, body
+
+    async def _read_body(self, reader: asyncio.StreamReader, n_bytes: int) -> bytearray:
+        """Receive a response body in chunks, so the timeout applies to each chunk rather than to the whole body
+            and a large body that is still arriving does not time out.
+
+        :param reader:  The connection to receive from.
+        :param n_bytes: The size of the body.
+        :return:        The raw response body.
+        :raises asyncio.IncompleteReadError: If the Terminal closed the connection before `n_bytes` were received.
+        """
+        body = bytearray()
+        while len(body) < n_bytes:
+            chunk = await asyncio.wait_for(reader.read(min(n_bytes - len(body), _READ_SIZE)), self.timeout)
+            if not chunk:
+                raise asyncio.IncompleteReadError(bytes(body), n_bytes)
+            body += chunk
+        return body
+
+    async def _request_ticks(
+        self, msg: str, timestamp: Optional[str] = None, output: str = "pandas", compact: bool = False
+    ) -> pd.DataFrame:
+        """Send a request and parse its response as a tick body."""
+        header, body = await self._request(msg)
+        if len(body) < _EXECUTOR_PARSE_SIZE:
+            return TickBody.parse(msg, header, body, timestamp, output, compact)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, TickBody.parse, msg, header, body, timestamp, output, compact)
+
+    async def _request_list(self, msg: str, dates: bool = False) -> pd.Series:
+        """Send a request and parse its response as a list body."""
+        header, body = await self._request(msg)
+        return ListBody.parse(msg, header, body, dates=dates).lst
+
+    # HIST DATA
+
+    async def get_hist_option(
+        self,
+        req: OptionReqType,
+        root: str,
+        exp: date,
+        strike: float,
+        right: OptionRight,
+        date_range: DateRange,
+        interval_size: int = 0,
+        use_rth: bool = True,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """
+         Get historical options data.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param exp:            The expiration date. Must be after the start of `date_range`.
+        :param strike:         The strike price in USD, rounded to 1/10th of a cent.
+        :param right:          The right of an option. CALL = Bullish; PUT = Bearish
+        :param date_range:     The dates to fetch.
+        :param interval_size:  The interval size in milliseconds. Applicable to most requests except ReqType.TRADE.
+        :param use_rth:        If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored
+                                  (only applicable to intervals requests).
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        msg = _hist_option_msg(req, root, exp, strike, right, date_range, interval_size, use_rth)
+        return await self._request_ticks(msg, timestamp, output, compact)
+
+    async def get_hist_stock(
+        self,
+        req: StockReqType,
+        root: str,
+        date_range: DateRange,
+        interval_size: int = 0,
+        use_rth: bool = True,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """
+         Get historical stock data.
+
+        :param req:            The request type.
+        :param root:           The root symbol.
+        :param date_range:     The dates to fetch.
+        :param interval_size:  The interval size in milliseconds. Applicable only to OHLC & QUOTE requests.
+        :param use_rth:         If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        msg = _hist_stock_msg(req, root, date_range, interval_size, use_rth)
+        return await self._request_ticks(msg, timestamp, output, compact)
+
+    async def get_opt_at_time(
+        self,
+        req: OptionReqType,
+        root: str,
+        exp: date,
+        strike: float,
+        right: OptionRight,
+        date_range: DateRange,
+        ms_of_day: int = 0,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """
+         Returns the last tick at a provided millisecond of the day for a given request type.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param exp:            The expiration date. Must be after the start of `date_range`.
+        :param strike:         The strike price in USD, rounded to 1/10th of a cent.
+        :param right:          The right of an option. CALL = Bullish; PUT = Bearish
+        :param date_range:     The dates to fetch.
+        :param ms_of_day:      The time of day in milliseconds.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        msg = _at_time_option_msg(req, root, exp, strike, right, date_range, ms_of_day)
+        return await self._request_ticks(msg, timestamp, output, compact)
+
+    async def get_stk_at_time(
+        self,
+        req: StockReqType,
+        root: str,
+        date_range: DateRange,
+        ms_of_day: int = 0,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """
+         Returns the last tick at a provided millisecond of the day for a given request type.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param date_range:     The dates to fetch.
+        :param ms_of_day:      The time of day in milliseconds.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        msg = _at_time_stock_msg(req, root, date_range, ms_of_day)
+        return await self._request_ticks(msg, timestamp, output, compact)
+
+    # LISTING DATA
+
+    async def get_dates_stk(self, root: str, req: StockReqType) -> pd.Series:
+        """
+        Get all dates of data available for a given stock contract and request type.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+
+        :return:               All dates that Theta Data provides data for given a request.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_list(_dates_stock_msg(root, req), dates=True)
+
+    async def get_dates_opt(
+        self,
+        req: OptionReqType,
+        root: str,
+        exp: date,
+        strike: float,
+        right: OptionRight,
+    ) -> pd.Series:
+        """
+        Get all dates of data available for a given options contract and request type.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param exp:            The expiration date. Must be after the start of `date_range`.
+        :param strike:         The strike price in USD.
+        :param right:          The right of an options.
+
+        :return:               All dates that Theta Data provides data for given a request.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_list(_dates_option_msg(req, root, exp, strike, right), dates=True)
+
+    async def get_dates_opt_bulk(self, req: OptionReqType, root: str, exp: date) -> pd.Series:
+        """
+        Get all dates of data available for a given options expiration and request type.
+
+        :param req:            The request type.
+        :param root:           The root symbol.
+        :param exp:            The expiration date. Must be after the start of `date_range`.
+
+        :return:               All dates that Theta Data provides data for given options chain (expiration).
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_list(_dates_option_bulk_msg(req, root, exp), dates=True)
+
+    async def get_expirations(self, root: str) -> pd.Series:
+        """
+        Get all options expirations for a provided underlying root.
+
+        :param root:           The root / underlying / ticker / symbol.
+
+        :return:               All expirations that ThetaData provides data for.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_list(_expirations_msg(root), dates=True)
+
+    async def get_strikes(self, root: str, exp: date, date_range: DateRange = None) -> pd.Series:
+        """
+        Get all options strike prices in US tenths of a cent.
+
+        :param root:           The root / underlying / ticker / symbol.
+        :param exp:            The expiration date.
+        :param date_range:     If specified, this function will return strikes only if they have data for every
+                                day in the date range.
+
+        :return:               The strike prices on the expiration.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return _parse_strikes(await self._request_list(_strikes_msg(root, exp, date_range)))
+
+    async def get_roots(self, sec: SecType) -> pd.Series:
+        """
+        Get all roots for a certain security type.
+
+        :param sec: The type of security.
+
+        :return: All roots / underlyings / tickers / symbols for the security type.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_list(_roots_msg(sec))
+
+    # LIVE DATA
+
+    async def get_last_option(
+        self,
+        req: OptionReqType,
+        root: str,
+        exp: date,
+        strike: float,
+        right: OptionRight,
+        output: str = "pandas",
+    ) -> pd.DataFrame:
+        """
+        Get the most recent options tick.
+
+        :param req:            The request type.
+        :param root:           The root symbol.
+        :param exp:            The expiration date.
+        :param strike:         The strike price in USD, rounded to 1/10th of a cent.
+        :param right:          The right of an options.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_ticks(_last_option_msg(req, root, exp, strike, right), output=output)
+
+    async def get_last_stock(self, req: StockReqType, root: str, output: str = "pandas") -> pd.DataFrame:
+        """
+        Get the most recent stock tick.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_ticks(_last_stock_msg(req, root), output=output)
+
+    async def get_req(self, req: str) -> pd.DataFrame:
+        """
+        Make a historical data request given the raw text output of a data request. Typically used for debugging.
+
+        :param req:            The raw request.
+
+        :return:               The requested data as a pandas DataFrame.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        return await self._request_ticks(req + "\n")
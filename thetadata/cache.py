@@ -0,0 +1,283 @@
+"""Module that contains caches of Terminal responses."""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .enums import DateRange
+from .parsing import Header
+
+_CACHE_FILE_EXT = ".bin"
+
+
+def _request_key(msg: str) -> str:
+    """Normalize a request to its sorted, case-folded parameters.
+
+    The request builders already format strikes, dates and flags consistently, so equivalent requests
+    that only differ in the case of the root or the order of the parameters share a key.
+    """
+    return "&".join(sorted(msg.strip().lower().split("&")))
+
+
+class HistCache:
+    """A persistent on-disk cache of raw historical responses.
+
+    Each response is stored as its 20 byte header followed by its binary tick body in a file named after the
+    request. Once the total size of the files exceeds `max_bytes`, the least recently used ones are removed.
+    Ticks of past trading days never change, so requests whose date range includes today are never cached.
+    The cache is safe to share between the threads of a connection pool.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 << 30):
+        """Open a cache in the directory `path`, which is created if it does not exist.
+
+        :param path:      The directory to store responses in. Files left by a previous run are reused.
+        :param max_bytes: The max total size of the cached responses in bytes.
+        """
+        assert max_bytes > 0, "max_bytes must be positive"
+        os.makedirs(path, exist_ok=True)
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+        # file name -> size in bytes, from least to most recently used
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        files = [entry for entry in os.scandir(path) if entry.name.endswith(_CACHE_FILE_EXT)]
+        for entry in sorted(files, key=lambda e: e.stat().st_mtime):
+            self._entries[entry.name] = entry.stat().st_size
+            self._size += entry.stat().st_size
+
+    @staticmethod
+    def cacheable(date_range: DateRange) -> bool:
+        """:return: True if responses for `date_range` can be cached, which is if it ends before today."""
+        return date_range.end < date.today()
+
+    @staticmethod
+    def _file_name(msg: str) -> str:
+        """Name the file of a request by a hash of its key, see `_request_key`."""
+        return hashlib.sha256(_request_key(msg).encode("utf-8")).hexdigest() + _CACHE_FILE_EXT
+
+    def get(self, msg: str) -> Optional[Tuple[Header, memoryview]]:
+        """Look up the cached response of a request.
+
+        :param msg: The Terminal message of the request.
+        :return:    The response header and body, or None if the response is not cached.
+        """
+        name = self._file_name(msg)
+        with self._lock:
+            found = name in self._entries
+            if found:
+                self._entries.move_to_end(name)
+        data = None
+        if found:
+            try:
+                with open(os.path.join(self.path, name), "rb") as f:
+                    data = f.read()
+                os.utime(os.path.join(self.path, name))  # keep the LRU order across runs
+            except FileNotFoundError:
+                pass  # evicted by another thread after the lookup
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return Header.parse(msg, data[:20]), memoryview(data)[20:]
+
+    def put(self, msg: str, header: Header, body: bytes) -> None:
+        """Cache the response of a request and evict the least recently used responses if the cache is full.
+
+        Responses larger than `max_bytes` are not cached.
+
+        :param msg:    The Terminal message of the request.
+        :param header: The response header.
+        :param body:   The binary response body.
+        """
+        size = 20 + len(body)
+        if size > self.max_bytes:
+            return
+        name = self._file_name(msg)
+        file = os.path.join(self.path, name)
+        tmp_file = f"{file}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(header.to_bytes())
+            f.write(body)
+        os.replace(tmp_file, file)  # readers never see a partially written response
+
+        with self._lock:
+            self._size += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            while self._size > self.max_bytes:
+                evicted, evicted_size = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                try:
+                    os.remove(os.path.join(self.path, evicted))
+                except OSError:
+                    pass  # already removed, or still open for reading on Windows
+
+    def discard(self, msg: str) -> None:
+        """Remove the cached response of a request, if any."""
+        name = self._file_name(msg)
+        with self._lock:
+            self._size -= self._entries.pop(name, 0)
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Remove every cached response and reset the hit/miss stats."""
+        with self._lock:
+            for name in self._entries:
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """:return: The total size of the cached responses in bytes."""
+        return self._size
+
+    def stats(self) -> dict:
+        """:return: The number of hits, misses and cached responses and the total size of the cache in bytes."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._size}
+
+
+class ListCache:
+    """A thread-safe in-memory cache of list responses, such as roots, expirations, strikes and dates.
+
+    Lists change at most daily, so entries expire `ttl` seconds after they were cached. Once more than
+    `max_entries` lists are cached, the least recently used ones are evicted. Cached lists are copied
+    on the way out, so callers can modify them freely.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 1024):
+        """Create an empty cache.
+
+        :param ttl:         The number of seconds a list is served from the cache after it was fetched.
+        :param max_entries: The max number of cached lists.
+        """
+        assert ttl > 0, "ttl must be positive"
+        assert max_entries > 0, "max_entries must be positive"
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+        # key -> (expiry time, root or None, list), from least to most recently used
+        self._entries: OrderedDict[str, Tuple[float, Optional[str], pd.Series]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[pd.Series]:
+        """Look up a cached list.
+
+        :param key: The request that returned the list.
+        :return:    A copy of the list, or None if it is not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[2].copy()
+
+    def put(self, key: str, lst: pd.Series, root: Optional[str] = None) -> None:
+        """Cache a list, evicting the least recently used list if the cache is full.
+
+        :param key:  The request that returned the list.
+        :param lst:  The list.
+        :param root: The root the list belongs to, if any, so it can be invalidated by root.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, None if root is None else root.upper(), lst.copy())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, root: Optional[str] = None) -> None:
+        """Remove cached lists so they are fetched again.
+
+        :param root: If specified, only remove the lists of this root. Otherwise, remove every list.
+        """
+        with self._lock:
+            if root is None:
+                self._entries.clear()
+                return
+            root = root.upper()
+            for key in [key for key, (_, entry_root, _) in self._entries.items() if entry_root == root]:
+                del self._entries[key]
+
+    @property
+    def hit_rate(self) -> float:
+        """:return: The fraction of lookups that were served from the cache, or 0 if there were none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def stats(self) -> dict:
+        """:return: The number of hits, misses and cached lists and the hit rate."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "hit_rate": self.hit_rate}
+
+
+class _SingleFlight:
+    """Coalesces concurrent calls w/ the same key, so only the first one runs while the others wait for its
+    result or exception.
+    """
+
+    def __init__(self):
+        self.calls: int = 0
+        self.deduplicated: int = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Call `fn`, unless a call w/ the same key is in flight, in which case wait for its result instead.
+
+        :return: The result, and whether this call ran `fn` itself.
+        :raises Exception: Whatever `fn` raised.
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.deduplicated += 1
+        if not leader:
+            return future.result(), False
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+        future.set_result(result)
+        return result, True
+
+    def stats(self) -> dict:
+        """:return: The number of calls and the number of calls that waited for an identical call in flight."""
+        with self._lock:
+            return {"requests": self.calls, "deduplicated": self.deduplicated}
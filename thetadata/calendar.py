@@ -0,0 +1,123 @@
+"""Module that contains the trading calendar of US equities and options, which follow the NYSE holidays."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List
+
+OPEN_MS = 34_200_000  # 09:30 ET
+CLOSE_MS = 57_600_000  # 16:00 ET
+EARLY_CLOSE_MS = 46_800_000  # 13:00 ET
+
+# unscheduled closures, such as national days of mourning
+_SPECIAL_CLOSURES = {
+    date(2001, 9, 11): "September 11",
+    date(2001, 9, 12): "September 11",
+    date(2001, 9, 13): "September 11",
+    date(2001, 9, 14): "September 11",
+    date(2004, 6, 11): "Day of mourning for Ronald Reagan",
+    date(2007, 1, 2): "Day of mourning for Gerald Ford",
+    date(2012, 10, 29): "Hurricane Sandy",
+    date(2012, 10, 30): "Hurricane Sandy",
+    date(2018, 12, 5): "Day of mourning for George H. W. Bush",
+    date(2025, 1, 9): "Day of mourning for Jimmy Carter",
+}
+
+
+def _easter(year: int) -> date:
+    """:return: Easter Sunday of a year, w/ the anonymous Gregorian algorithm."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """:return: The `n`-th `weekday` (0 is Monday) of a month, or the last one if `n` is -1."""
+    if n == -1:
+        last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        return last - timedelta(days=(last.weekday() - weekday) % 7)
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _observed(day: date) -> date:
+    """:return: The day a holiday is observed on, the Friday before a Saturday and the Monday after a Sunday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def holidays(year: int) -> Dict[date, str]:
+    """:return: The weekdays of a year on which the exchanges are closed, by the name of the holiday."""
+    days = {}
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # not observed on the last trading day of the previous year
+        days[_observed(new_year)] = "New Year's Day"
+    if year >= 1998:
+        days[_nth_weekday(year, 1, 0, 3)] = "Martin Luther King Jr. Day"
+    days[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    days[_easter(year) - timedelta(days=2)] = "Good Friday"
+    days[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+    if year >= 2022:
+        days[_observed(date(year, 6, 19))] = "Juneteenth"
+    days[_observed(date(year, 7, 4))] = "Independence Day"
+    days[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+    days[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+    days[_observed(date(year, 12, 25))] = "Christmas Day"
+    days.update({day: name for day, name in _SPECIAL_CLOSURES.items() if day.year == year})
+    return days
+
+
+@lru_cache(maxsize=None)
+def early_closes(year: int) -> Dict[date, str]:
+    """:return: The days of a year on which the exchanges close at 13:00 ET, by the name of the holiday."""
+    days = {}
+    july_3 = date(year, 7, 3)
+    if july_3.weekday() < 4:  # Independence Day is on a weekday after it
+        days[july_3] = "Independence Day"
+    days[_nth_weekday(year, 11, 3, 4) + timedelta(days=1)] = "Thanksgiving Day"
+    christmas_eve = date(year, 12, 24)
+    if christmas_eve.weekday() < 4:
+        days[christmas_eve] = "Christmas Day"
+    return days
+
+
+def is_trading_day(day: date) -> bool:
+    """:return: True if the exchanges are open on a day, i.e. it is a weekday that is not a holiday."""
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+
+def trading_days(start: date, end: date) -> List[date]:
+    """:return: The trading days between `start` and `end`, inclusive, in order."""
+    return [day for day in (start + timedelta(days=i) for i in range((end - start).days + 1)) if is_trading_day(day)]
+
+
+def next_trading_day(day: date) -> date:
+    """:return: The first trading day after `day`."""
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def previous_trading_day(day: date) -> date:
+    """:return: The last trading day before `day`."""
+    day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def close_ms(day: date) -> int:
+    """:return: The time the exchanges close on a trading day in ms of the day, ET."""
+    return EARLY_CLOSE_MS if day in early_closes(day.year) else CLOSE_MS
@@ -1,33 +1,53 @@
 """Module that contains Theta Client class."""
-from datetime import time
+from datetime import time, timedelta
+import queue
 import threading
 import time
 import traceback
 from decimal import Decimal
 from threading import Thread
 from time import sleep
-from typing import Optional
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from contextlib import closing, contextmanager
+from urllib.parse import urlencode, urlparse
 
 import socket
 import requests
 
 from pandas import DataFrame
 from tqdm import tqdm
+import numpy as np
 import pandas as pd
 
-from . import terminal
+from . import calendar, codec, terminal
+from .cache import HistCache, ListCache, _SingleFlight, _request_key
 from .enums import *
+from .exceptions import NoData, ReconnectingToServer, ResponseParseError
+from .export import _PartitionWriter
+from .metrics import RequestMetrics, request_type
 from .parsing import (
     Header,
     TickBody,
     ListBody,
+    _check_body_errors,
+    _output_converter,
+    raw_n_rows,
     parse_list_REST, parse_flexible_REST, parse_hist_REST, parse_hist_REST_stream, parse_hist_REST_stream_ijson,
 )
 from .terminal import check_download, launch_terminal
 
 _NOT_CONNECTED_MSG = "You must establish a connection first."
 _VERSION = '0.9.11'
+_NO_DATA_MSG = b"No data for the specified timeframe."
+# cached in place of the response of a past day w/o data
+_NO_DATA_RESPONSE = (
+    Header(message_type=MessageType.ERROR, id=0, latency=0, error=0, format_len=0, size=len(_NO_DATA_MSG)),
+    _NO_DATA_MSG,
+)
+_DEFAULT_RECV_SIZE = 1 << 20  # 1 MiB per recv_into call
+_RETRY_BACKOFF = 1.0  # seconds before the first retry of a checkpointed request, doubled before each retry
+_CHECKPOINT_MAX_BYTES = 1 << 62  # checkpoints are never evicted
 URL_BASE = "http://127.0.0.1:25510/"
 
 
@@ -41,6 +61,126 @@ def _format_date(dt: date) -> str:
     return dt.strftime("%Y%m%d")
 
 
+def _hist_option_msg(req: OptionReqType, root: str, exp: date, strike: float, right: OptionRight,
+                     date_range: DateRange, interval_size: int = 0, use_rth: bool = True) -> str:
+    """Build the Terminal message of a historical options request."""
+    strike = _format_strike(strike)
+    exp_fmt = _format_date(exp)
+    start_fmt = _format_date(date_range.start)
+    end_fmt = _format_date(date_range.end)
+    return f"MSG_CODE={MessageType.HIST.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}&rth={use_rth}&IVL={interval_size}\n"
+
+
+def _hist_stock_msg(req: StockReqType, root: str, date_range: DateRange, interval_size: int = 0,
+                    use_rth: bool = True) -> str:
+    """Build the Terminal message of a historical stock request."""
+    start_fmt = _format_date(date_range.start)
+    end_fmt = _format_date(date_range.end)
+    return f"MSG_CODE={MessageType.HIST.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&sec={SecType.STOCK.value}&req={req.value}&rth={use_rth}&IVL={interval_size}\n"
+
+
+def _at_time_option_msg(req: OptionReqType, root: str, exp: date, strike: float, right: OptionRight,
+                        date_range: DateRange, ms_of_day: int = 0) -> str:
+    """Build the Terminal message of an options at-time request."""
+    strike = _format_strike(strike)
+    exp_fmt = _format_date(exp)
+    start_fmt = _format_date(date_range.start)
+    end_fmt = _format_date(date_range.end)
+    return f"MSG_CODE={MessageType.AT_TIME.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}&IVL={ms_of_day}\n"
+
+
+def _at_time_stock_msg(req: StockReqType, root: str, date_range: DateRange, ms_of_day: int = 0) -> str:
+    """Build the Terminal message of a stock at-time request."""
+    start_fmt = _format_date(date_range.start)
+    end_fmt = _format_date(date_range.end)
+    return f"MSG_CODE={MessageType.AT_TIME.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&sec={SecType.STOCK.value}&req={req.value}&IVL={ms_of_day}\n"
+
+
+def _last_option_msg(req: OptionReqType, root: str, exp: date, strike: float, right: OptionRight) -> str:
+    """Build the Terminal message of a last options tick request."""
+    strike = _format_strike(strike)
+    exp_fmt = _format_date(exp)
+    return f"MSG_CODE={MessageType.LAST.value}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}\n"
+
+
+def _last_stock_msg(req: StockReqType, root: str) -> str:
+    """Build the Terminal message of a last stock tick request."""
+    return f"MSG_CODE={MessageType.LAST.value}&root={root}&sec={SecType.STOCK.value}&req={req.value}\n"
+
+
+def _dates_stock_msg(root: str, req: StockReqType) -> str:
+    """Build the Terminal message of a stock dates listing request."""
+    return f"MSG_CODE={MessageType.ALL_DATES.value}&root={root}&sec={SecType.STOCK.value}&req={req.value}\n"
+
+
+def _dates_option_msg(req: OptionReqType, root: str, exp: date, strike: float, right: OptionRight) -> str:
+    """Build the Terminal message of an options contract dates listing request."""
+    strike = _format_strike(strike)
+    exp_fmt = _format_date(exp)
+    return f"MSG_CODE={MessageType.ALL_DATES.value}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}\n"
+
+
+def _dates_option_bulk_msg(req: OptionReqType, root: str, exp: date) -> str:
+    """Build the Terminal message of an options expiration dates listing request."""
+    exp_fmt = _format_date(exp)
+    return f"MSG_CODE={MessageType.ALL_DATES_BULK.value}&root={root}&exp={exp_fmt}&sec={SecType.OPTION.value}&req={req.value}\n"
+
+
+def _expirations_msg(root: str) -> str:
+    """Build the Terminal message of an expirations listing request."""
+    return f"MSG_CODE={MessageType.ALL_EXPIRATIONS.value}&root={root}\n"
+
+
+def _strikes_msg(root: str, exp: date, date_range: Optional[DateRange] = None) -> str:
+    """Build the Terminal message of a strikes listing request."""
+    assert isinstance(exp, date)
+    exp_fmt = _format_date(exp)
+    if date_range is not None:
+        start_fmt = _format_date(date_range.start)
+        end_fmt = _format_date(date_range.end)
+        return f"MSG_CODE={MessageType.ALL_STRIKES.value}&root={root}&exp={exp_fmt}&START_DATE={start_fmt}&END_DATE={end_fmt}\n"
+    return f"MSG_CODE={MessageType.ALL_STRIKES.value}&root={root}&exp={exp_fmt}\n"
+
+
+def _roots_msg(sec: SecType) -> str:
+    """Build the Terminal message of a roots listing request."""
+    return f"MSG_CODE={MessageType.ALL_ROOTS.value}&sec={sec.value}\n"
+
+
+def _tick_body_or_none(msg: str, header: Header, body_data: bytes) -> Optional[TickBody]:
+    """Parse a tick response, or return None if it has no data."""
+    try:
+        return TickBody.from_response(msg, header, body_data)
+    except NoData:
+        return None
+
+
+def _n_rows(result: Any) -> int:
+    """:return: The number of rows of a parsed response."""
+    if isinstance(result, TickBody):
+        return len(result._trimmed())
+    if isinstance(result, tuple) and isinstance(result[0], Header):
+        return raw_n_rows(result[0])
+    return len(result)
+
+
+def _contiguous_ranges(days: List[date]) -> List[DateRange]:
+    """Group sorted trading days into the date ranges of their runs of consecutive trading days."""
+    ranges: List[DateRange] = []
+    for day in days:
+        if len(ranges) > 0 and calendar.next_trading_day(ranges[-1].end) == day:
+            ranges[-1] = DateRange(ranges[-1].start, day)
+        else:
+            ranges.append(DateRange(day, day))
+    return ranges
+
+
+def _parse_strikes(body: pd.Series) -> pd.Series:
+    """Convert strikes listed in tenths of a cent to USD."""
+    div = Decimal(1000)
+    return pd.Series([float(Decimal(i) / div) for i in body], dtype='float64')
+
+
 def ms_to_time(ms_of_day: int) -> datetime.time:
     """Converts milliseconds of day to a time object."""
     return datetime(year=2000, month=1, day=1, hour=int((ms_of_day / (1000 * 60 * 60)) % 24),
@@ -86,16 +226,14 @@ class Trade:
 
     def from_bytes(self, data: bytearray):
         """Deserializes a trade."""
-        view = memoryview(data)
-        parse_int = lambda d: int.from_bytes(d, "big")
-        self.ms_of_day = parse_int(view[0:4])
-        self.sequence = parse_int(view[4:8]) & 0xffffffffffffffff
-        self.size = parse_int(view[8:12])
-        self.condition = TradeCondition.from_code(parse_int(view[12:16]))
-        self.price = round(parse_int(view[16:20]) * _pt_to_price_mul[parse_int(view[24:28])], 4)
-        self.exchange = Exchange.from_code(parse_int(view[20:24]))
-        date_raw = str(parse_int(view[28:32]))
-        self.date = date(year=int(date_raw[0:4]), month=int(date_raw[4:6]), day=int(date_raw[6:8]))
+        ms_of_day, sequence, size, condition, price, exchange, price_type, date_raw = codec.TRADE.unpack(data)
+        self.ms_of_day = ms_of_day
+        self.sequence = sequence
+        self.size = size
+        self.condition = codec.from_code(TradeCondition, condition, TradeCondition.UNDEFINED)
+        self.price = round(price * _pt_to_price_mul[price_type], 4)
+        self.exchange = codec.from_code(Exchange, exchange)
+        self.date = codec.to_date(date_raw)
 
     def copy_from(self, other_trade):
         self.ms_of_day = other_trade.ms_of_day
@@ -128,17 +266,16 @@ class OHLCVC:
 
     def from_bytes(self, data: bytearray):
         """Deserializes a trade."""
-        view = memoryview(data)
-        parse_int = lambda d: int.from_bytes(d, "big")
-        self.ms_of_day = parse_int(view[0:4])
-        self.open   = round(parse_int(view[4:8]) * _pt_to_price_mul[parse_int(view[28:32])], 4)
-        self.high   = round(parse_int(view[8:12]) * _pt_to_price_mul[parse_int(view[28:32])], 4)
-        self.low    = round(parse_int(view[12:16]) * _pt_to_price_mul[parse_int(view[28:32])], 4)
-        self.close  = round(parse_int(view[16:20]) * _pt_to_price_mul[parse_int(view[28:32])], 4)
-        self.volume = parse_int(view[20:24])
-        self.count  = parse_int(view[24:28])
-        date_raw = str(parse_int(view[32:36]))
-        self.date = date(year=int(date_raw[0:4]), month=int(date_raw[4:6]), day=int(date_raw[6:8]))
+        ms_of_day, open_, high, low, close, volume, count, price_type, date_raw = codec.OHLCVC.unpack(data)
+        mult = _pt_to_price_mul[price_type]
+        self.ms_of_day = ms_of_day
+        self.open   = round(open_ * mult, 4)
+        self.high   = round(high * mult, 4)
+        self.low    = round(low * mult, 4)
+        self.close  = round(close * mult, 4)
+        self.volume = volume
+        self.count  = count
+        self.date = codec.to_date(date_raw)
 
     def copy_from(self, other_ohlcvc):
         self.ms_of_day = other_ohlcvc.ms_of_day
@@ -174,20 +311,19 @@ class Quote:
 
     def from_bytes(self, data: bytes):
         """Deserializes a trade."""
-        view = memoryview(data)
-        parse_int = lambda d: int.from_bytes(d, "big")
-        mult = _pt_to_price_mul[parse_int(view[36:40])]
-        self.ms_of_day     = parse_int(view[0:4])
-        self.bid_size      = parse_int(view[4:8])
-        self.bid_exchange  = Exchange.from_code(parse_int(view[8:12]))
-        self.bid_price     = round(parse_int(view[12:16]) * mult, 4)
-        self.bid_condition = QuoteCondition.from_code(parse_int(view[16:20]))
-        self.ask_size      = parse_int(view[20:24])
-        self.ask_exchange  = Exchange.from_code(parse_int(view[24:28]))
-        self.ask_price     = round(parse_int(view[28:32]) * mult, 4)
-        self.ask_condition = QuoteCondition.from_code(parse_int(view[32:36]))
-        date_raw           = str(parse_int(view[40:44]))
-        self.date          = date(year=int(date_raw[0:4]), month=int(date_raw[4:6]), day=int(date_raw[6:8]))
+        (ms_of_day, bid_size, bid_exchange, bid, bid_condition,
+         ask_size, ask_exchange, ask, ask_condition, price_type, date_raw) = codec.QUOTE.unpack(data)
+        mult = _pt_to_price_mul[price_type]
+        self.ms_of_day     = ms_of_day
+        self.bid_size      = bid_size
+        self.bid_exchange  = codec.from_code(Exchange, bid_exchange)
+        self.bid_price     = round(bid * mult, 4)
+        self.bid_condition = codec.from_code(QuoteCondition, bid_condition, QuoteCondition.UNDEFINED)
+        self.ask_size      = ask_size
+        self.ask_exchange  = codec.from_code(Exchange, ask_exchange)
+        self.ask_price     = round(ask * mult, 4)
+        self.ask_condition = codec.from_code(QuoteCondition, ask_condition, QuoteCondition.UNDEFINED)
+        self.date          = codec.to_date(date_raw)
 
     def copy_from(self, other_quote):
         self.ms_of_day = other_quote.ms_of_day
@@ -219,11 +355,9 @@ class OpenInterest:
 
     def from_bytes(self, data: bytearray):
         """Deserializes open interest."""
-        view = memoryview(data)
-        parse_int = lambda d: int.from_bytes(d, "big")
-        self.open_interest = parse_int(view[0:4])
-        date_raw = str(parse_int(view[4:8]))
-        self.date = date(year=int(date_raw[0:4]), month=int(date_raw[4:6]), day=int(date_raw[6:8]))
+        open_interest, date_raw = codec.OPEN_INTEREST.unpack(data)
+        self.open_interest = open_interest
+        self.date = codec.to_date(date_raw)
 
     def copy_from(self, other_open_interest):
         self.open_interest = other_open_interest.open_interest
@@ -246,21 +380,14 @@ class Contract:
 
     def from_bytes(self, data: bytes):
         """Deserializes a contract."""
-        view = memoryview(data)
-        parse_int = lambda d: int.from_bytes(d, "big")
-        # parse
-        len = parse_int(view[:1])
-        root_len = parse_int(view[1:2])
-        self.root = data[2:2 + root_len].decode("ascii")
-
-        opt = parse_int(data[root_len + 2: root_len + 3])
-        self.isOption = opt == 1
+        root, is_option, exp, is_call, strike = codec.decode_contract(data)
+        self.root = root
+        self.isOption = is_option
         if not self.isOption:
             return
-        date_raw = str(parse_int(view[root_len + 3: root_len + 7]))
-        self.exp = date(year=int(date_raw[0:4]), month=int(date_raw[4:6]), day=int(date_raw[6:8]))
-        self.isCall = parse_int(view[root_len + 7: root_len + 8]) == 1
-        self.strike = parse_int(view[root_len + 9: root_len + 13]) / 1000.0
+        self.exp = codec.to_date(exp)
+        self.isCall = is_call
+        self.strike = strike / 1000.0
 
     def to_string(self) -> str:
         """String representation of open interest."""
@@ -290,7 +417,10 @@ class ThetaClient:
 
     def __init__(self, port: int = 11000, timeout: Optional[float] = 60, launch: bool = True, jvm_mem: int = 0,
                  username: str = "default", passwd: str = "default", auto_update: bool = True, use_bundle: bool = True,
-                 host: str = "127.0.0.1", streaming_port: int = 10000, stable: bool = True):
+                 host: str = "127.0.0.1", streaming_port: int = 10000, stable: bool = True,
+                 recv_size: int = _DEFAULT_RECV_SIZE, rcvbuf: Optional[int] = None, tcp_nodelay: bool = True,
+                 hist_cache: Optional[HistCache] = None, list_cache: Optional[ListCache] = None,
+                 metrics_hook: Optional[Callable[[RequestMetrics], None]] = None, coalesce: bool = True):
         """Construct a client instance to interface with market data. If no username and passwd fields are provided,
             the terminal will connect to thetadata servers with free data permissions.
 
@@ -307,12 +437,35 @@ class ThetaClient:
             this class is instantiated. If false, the terminal will use the current jar terminal file. If none exists,
             it will download the latest version.
         :param use_bundle: Will download / use open-jdk-19.0.1 if True and the operating system is windows.
+        :param recv_size: The max number of bytes read from the Terminal socket per receive call.
+        :param rcvbuf: If specified, the kernel receive buffer size (SO_RCVBUF) in bytes of the Terminal socket.
+        :param tcp_nodelay: Disables Nagle's algorithm (TCP_NODELAY) on the Terminal socket if true.
+        :param hist_cache: If specified, historical responses of past days are served from and saved to this
+            on-disk cache instead of being downloaded again.
+        :param list_cache: If specified, the list calls (roots, expirations, strikes and dates) and their REST
+            twins are served from this in-memory cache until its entries expire.
+        :param metrics_hook: If specified, called w/ the RequestMetrics of every request that is sent once its
+            response is parsed, on the thread that parsed it. A MetricsAggregator collects them for p50/p99
+            summaries. Responses served from a cache and the iter_hist_* calls are not recorded.
+        :param coalesce: If true, a request that is identical to one in flight on another thread waits for and
+            shares its response instead of being sent again. Each caller parses the response on its own.
+            Applies to single requests, not to split, pipelined or iter_hist_* requests. See `coalesce_stats`.
         """
+        assert recv_size > 0, "recv_size must be positive"
         self.host: str = host
         self.port: int = port
         self.streaming_port: int = streaming_port
         self.timeout = timeout
+        self.recv_size: int = recv_size
+        self.rcvbuf: Optional[int] = rcvbuf
+        self.tcp_nodelay: bool = tcp_nodelay
+        self.hist_cache: Optional[HistCache] = hist_cache
+        self.list_cache: Optional[ListCache] = list_cache
+        self.metrics_hook: Optional[Callable[[RequestMetrics], None]] = metrics_hook
+        self._single_flight: Optional[_SingleFlight] = _SingleFlight() if coalesce else None
         self._server: Optional[socket.socket] = None  # None while disconnected
+        self._pool: Optional[queue.LifoQueue] = None  # None while disconnected; None items are reconnected lazily
+        self._pool_size: int = 0
         self._stream_server: Optional[socket.socket] = None  # None while disconnected
         self.launch = launch
         self._stream_impl = None
@@ -336,31 +489,247 @@ class ThetaClient:
             print("You are not launching the terminal. This means you should have an external instance already running.")
 
     @contextmanager
-    def connect(self):
+    def connect(self, pool_size: int = 1):
         """Initiate a connection with the Theta Terminal. Requests can only be made inside this
             generator aka the `with client.connect()` block.
 
+        :param pool_size: The number of connections to keep open to the Terminal. Each request checks a
+                            connection out of the pool for its duration, so up to `pool_size` threads can
+                            make requests concurrently. Requests wait for a free connection otherwise.
         :raises ConnectionRefusedError: If the connection failed.
         :raises TimeoutError: If the timeout is set and has been reached.
         """
-
+        assert pool_size > 0, "pool_size must be positive"
+        socks = []
         try:
-            for i in range(15):
-                try:
-                    self._server = socket.socket()
-                    self._server.connect((self.host, self.port))
-                    self._server.settimeout(1)
-                    break
-                except ConnectionError:
-                    if i == 14:
-                        raise ConnectionError('Unable to connect to the local Theta Terminal process.'
-                                              ' Try restarting your system.')
-                    sleep(1)
-            self._server.settimeout(self.timeout)
-            self._send_ver()
+            for _ in range(pool_size):
+                socks.append(self._open_socket())
+            self._init_pool(socks)
             yield
         finally:
-            self._server.close()
+            for sock in socks:
+                sock.close()
+            while self._pool is not None and not self._pool.empty():
+                sock = self._pool.get_nowait()
+                if sock is not None:
+                    sock.close()
+            self._pool = None
+
+    def _open_socket(self) -> socket.socket:
+        """Open a new connection to the Terminal and send it this API version.
+
+        :raises ConnectionError: If the connection failed.
+        """
+        for i in range(15):
+            try:
+                sock = socket.socket()
+                self._configure_socket(sock)
+                sock.connect((self.host, self.port))
+                sock.settimeout(1)
+                break
+            except ConnectionError:
+                if i == 14:
+                    raise ConnectionError('Unable to connect to the local Theta Terminal process.'
+                                          ' Try restarting your system.')
+                sleep(1)
+        sock.settimeout(self.timeout)
+        self._send_ver(sock)
+        return sock
+
+    def _init_pool(self, socks: List[socket.socket]) -> None:
+        """Make `socks` available to requests."""
+        self._server = socks[0]
+        self._pool_size = len(socks)
+        self._pool = queue.LifoQueue()
+        for sock in socks:
+            self._pool.put(sock)
+
+    @contextmanager
+    def _checkout(self) -> Iterator[socket.socket]:
+        """Check a connection out of the pool for the duration of a request.
+
+        A connection that fails mid-request can no longer be trusted to be aligned w/ the start of a response,
+        so it is closed and lazily replaced by a new connection.
+        """
+        assert self._pool is not None, _NOT_CONNECTED_MSG
+        sock = self._pool.get()
+        try:
+            if sock is None:
+                sock = self._open_socket()
+            yield sock
+        except (OSError, ResponseParseError):
+            if sock is not None:
+                sock.close()
+                sock = None
+            raise
+        finally:
+            self._pool.put(sock)
+
+    def _request(self, msg: str, progress_bar: bool = False,
+                 parse: Optional[Callable[[Header, bytearray], Any]] = None) -> Any:
+        """Send a request to the Terminal and receive its response.
+
+        :param msg:           The request.
+        :param progress_bar:  Print a progress bar displaying download progress.
+        :param parse:         If specified, parses the response header and body. Its duration and the number of
+                                  rows it returns are recorded in the metrics of the request.
+        :return:              The parsed response header and the raw response body, or the result of `parse`.
+        """
+        if self._single_flight is None:
+            header, body, metrics = self._exchange(msg, progress_bar)
+        else:
+            (header, body, metrics), sent = self._single_flight.do(
+                _request_key(msg), lambda: self._exchange(msg, progress_bar)
+            )
+            if not sent:
+                metrics = None  # recorded by the caller that sent the request
+        if parse is None:
+            return header, body
+        return self._parse_recorded(metrics, lambda: parse(header, body))
+
+    def _exchange(self, msg: str, progress_bar: bool = False) -> Tuple[Header, bytearray, Optional[RequestMetrics]]:
+        """Send a request over a pooled connection and receive its response.
+
+        :return: The parsed response header, the raw response body and its metrics if there is a metrics hook.
+        """
+        with self._checkout() as sock:
+            sent_at = time.time()
+            sent = time.perf_counter()
+            sock.sendall(msg.encode("utf-8"))
+            header = Header.parse(msg, self._recv(20, sock=sock))
+            received_header = time.perf_counter()
+            body = self._recv(header.size, progress_bar=progress_bar, sock=sock)
+            received_body = time.perf_counter()
+        return header, body, self._metrics(msg, header, sent_at, sent, received_header, received_body)
+
+    def coalesce_stats(self) -> dict:
+        """:return: The number of single requests made and how many of them were deduplicated, i.e. shared the
+                    response of an identical request in flight instead of being sent.
+        """
+        if self._single_flight is None:
+            return {"requests": 0, "deduplicated": 0}
+        return self._single_flight.stats()
+
+    def _request_ticks(self, msg: str, progress_bar: bool = False, timestamp: Optional[str] = None,
+                       output: str = "pandas", compact: bool = False):
+        """Send a request to the Terminal and parse its response w/ `TickBody.parse`."""
+        return self._request(
+            msg, progress_bar, lambda header, body: TickBody.parse(msg, header, body, timestamp, output, compact)
+        )
+
+    def _request_raw(self, msg: str, progress_bar: bool = False) -> Tuple[Header, memoryview]:
+        """Send a request to the Terminal and return its tick body undecoded, see `decode_raw`.
+
+        Identical requests in flight share their response body, so it is returned as a read-only view.
+        """
+
+        def check(header: Header, body: bytearray) -> Tuple[Header, memoryview]:
+            _check_body_errors(header, body)
+            return header, memoryview(body).toreadonly()
+
+        return self._request(msg, progress_bar, check)
+
+    def _request_REST(self, url: str, params: dict, parse: Callable[[requests.Response], Any]) -> Any:
+        """Send a request to the REST server and parse its response, recording its metrics.
+
+        The REST server does not report its latency, and its responses are received in full before they are parsed.
+        """
+
+        def get() -> Tuple[requests.Response, float, float]:
+            t1 = time.time()
+            response = requests.get(url, params=params)
+            return response, t1, time.time()
+
+        if self._single_flight is None:
+            (response, t1, t2), sent = get(), True
+        else:
+            (response, t1, t2), sent = self._single_flight.do(f"{url}?{urlencode(sorted(params.items()))}", get)
+        if self.metrics_hook is None or not sent:
+            return parse(response)
+        ttfb = response.elapsed.total_seconds()
+        metrics = RequestMetrics(
+            request_type="REST " + urlparse(url).path.strip("/"),
+            request=response.url,
+            sent_at=t1,
+            latency=None,
+            ttfb=ttfb,
+            recv_time=max(t2 - t1 - ttfb, 0.0),
+            n_bytes=len(response.content),
+        )
+        return self._parse_recorded(metrics, lambda: parse(response))
+
+    def _metrics(self, msg: str, header: Header, sent_at: float, sent: float, received_header: float,
+                 received_body: float) -> Optional[RequestMetrics]:
+        """Build the metrics of a received response, or return None if there is no metrics hook.
+
+        :param sent_at: The unix time at which the request was sent.
+        :param sent, received_header, received_body: `time.perf_counter` timestamps of when the request was sent,
+                                                        and its response header and body were received.
+        """
+        if self.metrics_hook is None:
+            return None
+        return RequestMetrics(
+            request_type=request_type(msg),
+            request=msg.strip(),
+            sent_at=sent_at,
+            latency=header.latency / 1000,
+            ttfb=received_header - sent,
+            recv_time=received_body - received_header,
+            n_bytes=header.size,
+        )
+
+    def _parse_recorded(self, metrics: Optional[RequestMetrics], parse: Callable[[], Any]) -> Any:
+        """Call `parse`, then complete `metrics` w/ its duration, row count or error and pass them to the
+        metrics hook. If `metrics` is None, only call `parse`.
+        """
+        if metrics is None:
+            return parse()
+        start = time.perf_counter()
+        try:
+            result = parse()
+            metrics.rows = _n_rows(result)
+            return result
+        except Exception as e:
+            metrics.error = type(e).__name__
+            raise
+        finally:
+            metrics.parse_time = time.perf_counter() - start
+            self.metrics_hook(metrics)
+
+    def _request_list(self, msg: str, root: Optional[str] = None, dates: bool = False) -> pd.Series:
+        """Send a list request to the Terminal, or serve it from `list_cache` if its response is cached.
+
+        :param msg:   The request.
+        :param root:  The root the list belongs to, if any.
+        :param dates: Whether the list contains dates.
+        """
+        if self.list_cache is not None:
+            cached = self.list_cache.get(msg)
+            if cached is not None:
+                return cached
+        lst = self._request(msg, parse=lambda header, body: ListBody.parse(msg, header, body, dates=dates).lst)
+        if self.list_cache is not None:
+            self.list_cache.put(msg, lst, root)
+        return lst
+
+    def _request_list_REST(self, url: str, params: dict, root: Optional[str] = None,
+                           dates: bool = False) -> pd.Series:
+        """Send a list request to the REST server, or serve it from `list_cache` if its response is cached.
+
+        :param url:    The url of the request.
+        :param params: The query parameters of the request.
+        :param root:   The root the list belongs to, if any.
+        :param dates:  Whether the list contains dates.
+        """
+        key = f"{url}?{urlencode(sorted(params.items()))}"
+        if self.list_cache is not None:
+            cached = self.list_cache.get(key)
+            if cached is not None:
+                return cached
+        lst = self._request_REST(url, params, lambda response: parse_list_REST(response, dates=dates))
+        if self.list_cache is not None:
+            self.list_cache.put(key, lst, root)
+        return lst
 
     def connect_stream(self, callback) -> Thread:
         """Initiate a connection with the Theta Terminal Stream server.
@@ -535,33 +904,32 @@ class ThetaClient:
           """
         msg = StreamMsg()
         msg.client = self
-        parse_int = lambda d: int.from_bytes(d, "big")
         self._stream_server.settimeout(10)
         while self._stream_connected:
             try:
-                msg.type = StreamMsgType.from_code(parse_int(self._read_stream(1)[:1]))
-                msg.contract.from_bytes(self._read_stream(parse_int(self._read_stream(1)[:1])))
+                msg.type = codec.from_code(StreamMsgType, self._read_stream(1)[0])
+                msg.contract.from_bytes(self._read_stream(self._read_stream(1)[0]))
                 if msg.type == StreamMsgType.QUOTE:
-                    msg.quote.from_bytes(self._read_stream(44))
+                    msg.quote.from_bytes(self._read_stream(codec.QUOTE.size))
                 elif msg.type == StreamMsgType.TRADE:
-                    data = self._read_stream(n_bytes=32)
+                    data = self._read_stream(n_bytes=codec.TRADE.size)
                     msg.trade.from_bytes(data)
                 elif msg.type == StreamMsgType.OHLCVC:
-                    data = self._read_stream(n_bytes=36)
+                    data = self._read_stream(n_bytes=codec.OHLCVC.size)
                     msg.ohlcvc.from_bytes(data)
                 elif msg.type == StreamMsgType.PING:
-                    self._read_stream(n_bytes=4)
+                    self._read_stream(n_bytes=codec.STREAM_INT.size)
                 elif msg.type == StreamMsgType.OPEN_INTEREST:
-                    data = self._read_stream(n_bytes=8)
+                    data = self._read_stream(n_bytes=codec.OPEN_INTEREST.size)
                     msg.open_interest.from_bytes(data)
                 elif msg.type == StreamMsgType.REQ_RESPONSE:
-                    msg.req_response_id = parse_int(self._read_stream(4))
-                    msg.req_response = StreamResponseType.from_code(parse_int(self._read_stream(4)))
+                    msg.req_response_id, response = codec.REQ_RESPONSE.unpack(self._read_stream(codec.REQ_RESPONSE.size))
+                    msg.req_response = codec.from_code(StreamResponseType, response)
                     self._stream_responses[msg.req_response_id] = msg.req_response
                 elif msg.type == StreamMsgType.STOP or msg.type == StreamMsgType.START:
-                    msg.date = datetime.strptime(str(parse_int(self._read_stream(4))), "%Y%m%d").date()
+                    msg.date = codec.to_date(codec.STREAM_INT.unpack(self._read_stream(codec.STREAM_INT.size))[0])
                 elif msg.type == StreamMsgType.DISCONNECTED or msg.type == StreamMsgType.RECONNECTED:
-                    self._read_stream(4)  # Future use.
+                    self._read_stream(codec.STREAM_INT.size)  # Future use.
                 else:
                     raise ValueError('undefined msg type: ' + str(msg.type))
             except (ConnectionResetError, OSError) as e:
@@ -584,47 +952,378 @@ class ThetaClient:
 
         while total < n_bytes:
             part = self._stream_server.recv(n_bytes - total)
-            if part.__len__() < 0:
-                continue
+            if part.__len__() == 0:
+                raise ConnectionResetError("The Terminal closed the stream connection.")
             total += part.__len__()
             buffer.extend(part)
         return buffer
 
-    def _send_ver(self):
+    def _send_ver(self, sock: socket.socket):
         """Sends this API version to the Theta Terminal."""
         ver_msg = f"MSG_CODE={MessageType.HIST.value}&version={_VERSION}\n"
-        self._server.sendall(ver_msg.encode("utf-8"))
+        sock.sendall(ver_msg.encode("utf-8"))
+
+    def _configure_socket(self, sock: socket.socket) -> None:
+        """Apply the socket tuning options of this client to a Terminal socket."""
+        if self.rcvbuf is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        if self.tcp_nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
-    def _recv(self, n_bytes: int, progress_bar: bool = False) -> bytearray:
+    def _recv(self, n_bytes: int, progress_bar: bool = False, sock: Optional[socket.socket] = None) -> bytearray:
         """Wait for a response from the Terminal.
         :param n_bytes:       The number of bytes to receive.
         :param progress_bar:  Print a progress bar displaying download progress.
+        :param sock:          The connection to receive from. Defaults to the first connection of the pool.
         :return:              A response from the Terminal.
+        :raises ConnectionError: If the Terminal closed the connection before `n_bytes` were received.
         """
-        assert self._server is not None, _NOT_CONNECTED_MSG
+        buffer = bytearray(n_bytes)
+        self._recv_into(memoryview(buffer), progress_bar, sock)
+        return buffer
 
-        # receive body data in parts
-        MAX_PART_SIZE = 256  # 4 KiB recommended for most machines
+    def _recv_into(self, view: memoryview, progress_bar: bool = False, sock: Optional[socket.socket] = None) -> None:
+        """Fill a buffer w/ a response from the Terminal, see `_recv`. The view is released once it is filled.
 
-        buffer = bytearray(n_bytes)
+        :raises ConnectionError: If the Terminal closed the connection before the buffer was filled.
+        """
+        sock = self._server if sock is None else sock
+        assert sock is not None, _NOT_CONNECTED_MSG
+
+        # recv_into may return fewer bytes than requested
+        n_bytes = len(view)
+        recv_size = self.recv_size
         bytes_downloaded = 0
 
         # tqdm disable=True is slow bc it still calls __new__, which takes nearly 4ms
-        range_ = range(0, n_bytes, MAX_PART_SIZE)
-        iterable = tqdm(range_, desc="Downloading") if progress_bar else range_
-
-        start = 0
-        for i in iterable:
-            part_size = min(MAX_PART_SIZE, n_bytes - bytes_downloaded)
-            bytes_downloaded += part_size
-            part = self._server.recv(part_size)
-            if part.__len__() < 0:
+        pbar = tqdm(total=n_bytes, desc="Downloading", unit="B", unit_scale=True) if progress_bar else None
+        try:
+            while bytes_downloaded < n_bytes:
+                part_size = sock.recv_into(
+                    view[bytes_downloaded:], min(recv_size, n_bytes - bytes_downloaded)
+                )
+                if part_size == 0:
+                    raise ConnectionError(f"The Terminal closed the connection after {bytes_downloaded} of "
+                                          f"{n_bytes} bytes were received.")
+                bytes_downloaded += part_size
+                if pbar is not None:
+                    pbar.update(part_size)
+        finally:
+            view.release()
+            if pbar is not None:
+                pbar.close()
+
+    def _pipeline(self, msgs: List[str], window: int,
+                  progress_bar: bool = False) -> Iterator[Tuple[Header, bytearray, Optional[RequestMetrics]]]:
+        """Send `msgs` back-to-back, keeping at most `window` of them in flight, and receive their responses.
+
+        The Terminal answers requests on a connection in the order they were sent, so the n-th response
+        belongs to the n-th message. Every response is read, so the connection remains usable even if the
+        caller fails to parse one of them or closes the generator early.
+
+        :return: The response header and body of each message, and its metrics if there is a metrics hook, which
+                 the caller passes on w/ `_parse_recorded`. The time to first byte of a pipelined request
+                 includes the time it waited behind the requests sent before it.
+        """
+        assert window > 0, "window must be positive"
+        with self._checkout() as sock:
+            n_sent = min(window, len(msgs))
+            n_recv = 0
+            sent_at = [time.time()] * n_sent
+            sent = [time.perf_counter()] * n_sent
+            sock.sendall("".join(msgs[:n_sent]).encode("utf-8"))
+            iterable = tqdm(msgs, desc="Responses") if progress_bar else msgs
+            try:
+                for msg in iterable:
+                    header = Header.parse(msg, self._recv(20, sock=sock))
+                    received_header = time.perf_counter()
+                    body = self._recv(header.size, sock=sock)
+                    metrics = self._metrics(msg, header, sent_at[n_recv], sent[n_recv], received_header,
+                                            time.perf_counter())
+                    n_recv += 1
+                    # refill the window before handing the response over to be parsed
+                    if n_sent < len(msgs):
+                        sent_at.append(time.time())
+                        sent.append(time.perf_counter())
+                        sock.sendall(msgs[n_sent].encode("utf-8"))
+                        n_sent += 1
+                    yield header, body, metrics
+            except GeneratorExit:
+                # discard the responses to requests that are already in flight
+                for msg in msgs[n_recv:n_sent]:
+                    header = Header.parse(msg, self._recv(20, sock=sock))
+                    self._recv(header.size, sock=sock)
+                raise
+
+    def _pipeline_ticks(self, msgs: List[str], window: int, return_exceptions: bool,
+                        progress_bar: bool = False, timestamp: Optional[str] = None,
+                        output: str = "pandas", compact: bool = False) -> list:
+        """Pipeline `msgs` and parse each response as a tick body."""
+        results = []
+        for msg, (header, body, metrics) in zip(msgs, self._pipeline(msgs, window, progress_bar)):
+            try:
+                results.append(self._parse_recorded(
+                    metrics, lambda: TickBody.parse(msg, header, body, timestamp, output, compact)
+                ))
+            except Exception as e:
+                results.append(e)
+        if not return_exceptions:
+            for res in results:
+                if isinstance(res, Exception):
+                    raise res
+        return results
+
+    def _fetch_tick_bodies(self, msgs: List[str], date_ranges: Optional[List[DateRange]] = None,
+                           progress_bar: bool = False, window: int = 64,
+                           checkpoint: Optional[HistCache] = None) -> List[Optional[TickBody]]:
+        """Send `msgs` concurrently over the connection pool and parse their responses as tick bodies.
+
+        The requests are dealt round-robin to one worker per pooled connection, and each worker pipelines
+        its share of the requests on its connection. Requests whose responses are in `hist_cache` are not sent.
+
+        :param date_ranges: If specified, the dates of each request, which decide whether its response can be cached.
+                            Otherwise, `hist_cache` is not used.
+        :param checkpoint:  If specified, used in place of `hist_cache` for every request regardless of its dates.
+                            Each response is saved as soon as it is received, including "no data" responses.
+        :return: The tick bodies in the order of `msgs`, w/ None in place of requests that have no data.
+        """
+        results: List[Optional[TickBody]] = [None] * len(msgs)
+        pbar = tqdm(total=len(msgs), desc="Requests") if progress_bar else None
+        cache = self.hist_cache if checkpoint is None else checkpoint
+        if checkpoint is not None:
+            cacheable = [True] * len(msgs)
+        elif self.hist_cache is None or date_ranges is None:
+            cacheable = [False] * len(msgs)
+        else:
+            cacheable = [HistCache.cacheable(dr) for dr in date_ranges]
+        pending = []
+        for i, msg in enumerate(msgs):
+            cached = cache.get(msg) if cacheable[i] else None
+            if cached is None:
+                pending.append(i)
                 continue
-            start += 1
-            buffer[i: i + part_size] = part
+            results[i] = _tick_body_or_none(msg, *cached)
+            if pbar is not None:
+                pbar.update(1)
+        n_workers = max(1, min(self._pool_size, len(pending)))
+
+        def fetch(worker: int) -> None:
+            indices = pending[worker::n_workers]
+            group = [msgs[i] for i in indices]
+            for i, msg, (header, body, metrics) in zip(indices, group, self._pipeline(group, window)):
+                if cacheable[i] and header.message_type != MessageType.ERROR:
+                    cache.put(msg, header, body)
+                try:
+                    results[i] = self._parse_recorded(metrics, lambda: TickBody.from_response(msg, header, body))
+                except NoData:
+                    if checkpoint is not None:
+                        checkpoint.put(msg, *_NO_DATA_RESPONSE)
+                if pbar is not None:
+                    pbar.update(1)
 
-        assert bytes_downloaded == n_bytes
-        return buffer
+        try:
+            if len(pending) > 0:
+                with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                    for future in [executor.submit(fetch, worker) for worker in range(n_workers)]:
+                        future.result()
+        finally:
+            if pbar is not None:
+                pbar.close()
+        return results
+
+    def _get_split_ticks(self, msgs: List[str], progress_bar: bool = False,
+                         timestamp: Optional[str] = None, output: str = "pandas",
+                         compact: bool = False) -> pd.DataFrame:
+        """Fetch the sub-range requests `msgs` and build a single DataFrame from their ticks in order.
+
+        :raises NoData: If none of the sub-ranges have data.
+        """
+        _output_converter(output)
+        bodies = [body for body in self._fetch_tick_bodies(msgs, progress_bar=progress_bar) if body is not None]
+        if len(bodies) == 0:
+            raise NoData(f"No data for any of the {len(msgs)} sub-ranges of the request.")
+        return TickBody.concat(bodies)._to_output(output, timestamp, compact)
+
+    def _get_hist_days(self, build_msg: Callable[[DateRange], str], date_range: DateRange,
+                       split: Union[str, int, None] = None, progress_bar: bool = False,
+                       timestamp: Optional[str] = None, output: str = "pandas", compact: bool = False):
+        """Fetch a historical request through `hist_cache` at the granularity of single days.
+
+        Only trading days are considered, see `calendar`. Past days that are cached are read from the cache. The
+        other days are grouped into runs of consecutive trading days, which are fetched concurrently over the
+        connection pool (split further by `split` if specified). The response of each run is broken up into days,
+        which are cached, including the days w/o data. The days are then stitched back together in date order.
+
+        :param build_msg: Builds the Terminal message of the request for a date range.
+        :raises NoData:   If none of the days have data.
+        """
+        _output_converter(output)
+        pieces: List[Tuple[date, Optional[TickBody]]] = []
+        missing: List[date] = []
+        for day in date_range.days(trading_only=True):
+            cached = None
+            if HistCache.cacheable(DateRange(day, day)):
+                msg = build_msg(DateRange(day, day))
+                cached = self.hist_cache.get(msg)
+            if cached is None:
+                missing.append(day)
+            else:
+                pieces.append((day, _tick_body_or_none(msg, *cached)))
+
+        runs = _contiguous_ranges(missing)
+        if split is not None:
+            runs = [sub_range for run in runs for sub_range in run.split(split, trading_days=True)]
+        msgs = [build_msg(run) for run in runs]
+        for run, body in zip(runs, self._fetch_tick_bodies(msgs, progress_bar=progress_bar)):
+            pieces.append((run.start, body))
+            self._cache_days(build_msg, run, body)
+
+        pieces.sort(key=lambda piece: piece[0])
+        bodies = [body for _, body in pieces if body is not None]
+        if len(bodies) == 0:
+            raise NoData(f"No data for any day of {build_msg(date_range).strip()}")
+        return TickBody.concat(bodies)._to_output(output, timestamp, compact)
+
+    def _get_checkpointed(self, build_msg: Callable[[DateRange], str], date_range: DateRange,
+                          checkpoint_dir: str, split: Union[str, int, None] = None, retries: int = 3,
+                          progress_bar: bool = False, timestamp: Optional[str] = None, output: str = "pandas",
+                          compact: bool = False):
+        """Fetch a historical request in sub-range units that are saved to `checkpoint_dir` as they complete.
+
+        Units that are already in `checkpoint_dir`, e.g. from a run that crashed, are not fetched again. If the
+        Terminal reconnects to Theta Data or a connection fails or times out, the missing units are fetched again
+        up to `retries` times, waiting twice as long before each retry. The units of the request are removed from
+        `checkpoint_dir` once it completes.
+
+        :param build_msg: Builds the Terminal message of the request for a date range.
+        :param split:     The size of the units in trading days, see `DateRange.split`. Defaults to a "day".
+        :raises NoData:   If none of the units have data.
+        """
+        assert retries >= 0, "retries must be nonnegative"
+        _output_converter(output)
+        checkpoint = HistCache(checkpoint_dir, max_bytes=_CHECKPOINT_MAX_BYTES)
+        msgs = [build_msg(unit) for unit in date_range.split("day" if split is None else split, trading_days=True)]
+        for attempt in range(retries + 1):
+            try:
+                bodies = self._fetch_tick_bodies(msgs, progress_bar=progress_bar, checkpoint=checkpoint)
+                break
+            except (ReconnectingToServer, OSError):
+                if attempt == retries:
+                    raise
+                sleep(_RETRY_BACKOFF * 2 ** attempt)
+        for msg in msgs:
+            checkpoint.discard(msg)
+        bodies = [body for body in bodies if body is not None]
+        if len(bodies) == 0:
+            raise NoData(f"No data for any of the {len(msgs)} units of {build_msg(date_range).strip()}")
+        return TickBody.concat(bodies)._to_output(output, timestamp, compact)
+
+    def _cache_days(self, build_msg: Callable[[DateRange], str], run: DateRange, body: Optional[TickBody]) -> None:
+        """Break the response of a run of days up into one cached response per past day.
+
+        Days w/o ticks are cached as "no data" responses. Responses w/o a date column can only be broken up if
+        the run is a single day.
+        """
+        if body is not None and DataType.DATE not in body.format_tick and run.start != run.end:
+            return
+        ticks = dates = None
+        if body is not None:
+            ticks = body._trimmed()
+            if DataType.DATE in body.format_tick:
+                dates = ticks[:, body.format_tick.index(DataType.DATE)]
+        for day in run.days(trading_only=True):
+            day_range = DateRange(day, day)
+            if not HistCache.cacheable(day_range):
+                continue
+            day_ticks = ticks
+            if dates is not None:
+                yyyymmdd = day.year * 10000 + day.month * 100 + day.day
+                day_ticks = ticks[np.searchsorted(dates, yyyymmdd, "left"):np.searchsorted(dates, yyyymmdd, "right")]
+            if day_ticks is None or len(day_ticks) == 0:
+                header, data = _NO_DATA_RESPONSE
+            else:
+                header, data = TickBody(body.format_tick, day_ticks).to_response()
+            self.hist_cache.put(build_msg(day_range), header, data)
+
+    def _iter_ticks(self, msg: str, chunk_rows: int, progress_bar: bool = False,
+                    timestamp: Optional[str] = None, output: str = "pandas",
+                    compact: bool = False) -> Iterator[pd.DataFrame]:
+        """Send a request and parse its tick body in chunks of at most `chunk_rows` rows as it is received.
+
+        If the generator is closed early, the rest of the body is drained so the connection stays usable.
+        """
+        _output_converter(output)
+        with closing(self._iter_tick_bodies(msg, chunk_rows, progress_bar)) as tbodies:
+            for tbody in tbodies:
+                try:
+                    df = tbody._to_output(output, timestamp, compact)
+                except Exception as e:
+                    raise ResponseParseError(
+                        f"Failed to parse body for request: {msg}. Please send this error to support."
+                    ) from e
+                del tbody
+                if len(df) > 0:
+                    yield df
+
+    def _iter_tick_bodies(self, msg: str, chunk_rows: int, progress_bar: bool = False) -> Iterator[TickBody]:
+        """Send a request and decode its tick body in chunks of at most `chunk_rows` rows as it is received.
+
+        If the generator is closed early, the rest of the body is drained so the connection stays usable.
+        """
+        assert chunk_rows > 0, "chunk_rows must be positive"
+        with self._checkout() as sock:
+            sock.sendall(msg.encode("utf-8"))
+            header: Header = Header.parse(msg, self._recv(20, sock=sock))
+            if header.message_type == MessageType.ERROR:
+                TickBody.parse(msg, header, self._recv(header.size, sock=sock))
+
+            row_size = header.format_len * 4
+            remaining = header.size
+            pbar = tqdm(total=header.size, desc="Downloading", unit="B", unit_scale=True) if progress_bar else None
+            try:
+                format_data = self._recv(row_size, sock=sock)
+                remaining -= row_size
+                try:
+                    format_tick = TickBody._parse_format(header, format_data)
+                except Exception as e:
+                    raise ResponseParseError(
+                        f"Failed to parse body for request: {msg}. Please send this error to support."
+                    ) from e
+                if pbar is not None:
+                    pbar.update(row_size)
+
+                while remaining > 0:
+                    chunk_size = min(chunk_rows * row_size, remaining)
+                    data = self._recv(chunk_size, sock=sock)
+                    remaining -= chunk_size
+                    if pbar is not None:
+                        pbar.update(chunk_size)
+                    try:
+                        ticks = TickBody._parse_ticks(data, header.format_len)
+                    except Exception as e:
+                        raise ResponseParseError(
+                            f"Failed to parse body for request: {msg}. Please send this error to support."
+                        ) from e
+                    del data
+                    yield TickBody(format_tick, ticks)
+            except (GeneratorExit, ResponseParseError):
+                # keep the socket aligned w/ the next response header if we stopped early
+                while remaining > 0:
+                    remaining -= len(self._recv(min(self.recv_size, remaining), sock=sock))
+                raise
+            finally:
+                if pbar is not None:
+                    pbar.close()
+
+    def _export(self, msg: str, writer: _PartitionWriter, chunk_rows: int, progress_bar: bool) -> List[str]:
+        """Send a request and write its tick body w/ `writer` in chunks as it is received.
+
+        :return: The paths of the written files.
+        """
+        with writer, closing(self._iter_tick_bodies(msg, chunk_rows, progress_bar)) as tbodies:
+            for tbody in tbodies:
+                writer.write(tbody)
+        return writer.paths
 
     def kill(self, ignore_err=True) -> None:
         """Remotely kill the Terminal process. All subsequent requests will time out after this. A new instance of this
@@ -635,8 +1334,9 @@ class ThetaClient:
 
         kill_msg = f"MSG_CODE={MessageType.KILL.value}\n"
         try:
-            self._server.sendall(kill_msg.encode("utf-8"))
-        except OSError:
+            with self._checkout() as sock:
+                sock.sendall(kill_msg.encode("utf-8"))
+        except (OSError, AssertionError):
             if ignore_err:
                 pass
             else:
@@ -655,6 +1355,13 @@ class ThetaClient:
         interval_size: int = 0,
         use_rth: bool = True,
         progress_bar: bool = False,
+        split: Union[str, int, None] = None,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+        checkpoint_dir: Optional[str] = None,
+        retries: int = 3,
+        raw: bool = False,
     ) -> pd.DataFrame:
         """
          Get historical options data.
@@ -669,30 +1376,263 @@ class ThetaClient:
         :param use_rth:        If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored
                                   (only applicable to intervals requests).
         :param progress_bar:   Print a progress bar displaying download progress.
-
-        :return:               The requested data as a pandas DataFrame.
+        :param split:          If specified, `date_range` is split into sub-ranges of a "day", a "week" or the
+                                  provided number of trading days, which are fetched concurrently over the
+                                  connection pool and reassembled in date order. An int counts trading days, not
+                                  calendar days, e.g. 5 is a full trading week. Sub-ranges without data are
+                                  skipped, and weekends and exchange holidays are not requested at all, see
+                                  `calendar`.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+        :param checkpoint_dir: If specified, download `date_range` in units of `split` (a day by default) that are
+                                  saved to this directory as they complete, so a request that fails or whose process
+                                  crashes resumes from the completed units when it is made again. Units are fetched
+                                  again after a reconnect, connection failure or timeout up to `retries` times, w/
+                                  exponential backoff. Takes precedence over `hist_cache`.
+        :param retries:        The max number of retries of a checkpointed request.
+        :param raw:            If True, return the response header and a read-only, zero-copy memoryview of the
+                                  tick body as received instead of decoding it. Decode it later w/ `decode_raw`.
+                                  Cannot be combined w/ `split` or `checkpoint_dir`, and bypasses `hist_cache`.
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format, or
+                                  the response header and tick body if `raw` is True.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        # format data
-        strike = _format_strike(strike)
-        exp_fmt = _format_date(exp)
-        start_fmt = _format_date(date_range.start)
-        end_fmt = _format_date(date_range.end)
+        if raw:
+            assert split is None and checkpoint_dir is None, "raw cannot be combined w/ split or checkpoint_dir."
+            return self._request_raw(
+                _hist_option_msg(req, root, exp, strike, right, date_range, interval_size, use_rth), progress_bar
+            )
+        if checkpoint_dir is not None:
+            return self._get_checkpointed(
+                lambda dr: _hist_option_msg(req, root, exp, strike, right, dr, interval_size, use_rth),
+                date_range, checkpoint_dir, split, retries, progress_bar, timestamp, output, compact,
+            )
+        if self.hist_cache is not None:
+            return self._get_hist_days(
+                lambda dr: _hist_option_msg(req, root, exp, strike, right, dr, interval_size, use_rth),
+                date_range, split, progress_bar, timestamp, output, compact,
+            )
+        if split is not None:
+            sub_ranges = date_range.split(split, trading_days=True)
+            msgs = [
+                _hist_option_msg(req, root, exp, strike, right, sub_range, interval_size, use_rth)
+                for sub_range in sub_ranges
+            ]
+            return self._get_split_ticks(msgs, progress_bar, timestamp, output, compact)
 
         # send request
-        hist_msg = f"MSG_CODE={MessageType.HIST.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}&rth={use_rth}&IVL={interval_size}\n"
-        self._server.sendall(hist_msg.encode("utf-8"))
+        hist_msg = _hist_option_msg(req, root, exp, strike, right, date_range, interval_size, use_rth)
+        body: DataFrame = self._request_ticks(hist_msg, progress_bar, timestamp, output, compact)
+        return body
 
-        # parse response header
-        header_data = self._server.recv(20)
-        header: Header = Header.parse(hist_msg, header_data)
+    def iter_hist_option(
+        self,
+        req: OptionReqType,
+        root: str,
+        exp: date,
+        strike: float,
+        right: OptionRight,
+        date_range: DateRange,
+        interval_size: int = 0,
+        use_rth: bool = True,
+        chunk_rows: int = 1_000_000,
+        progress_bar: bool = False,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """
+         Get historical options data in chunks of at most `chunk_rows` rows, which are parsed as they are
+         received from the Terminal. Memory usage stays bounded regardless of the size of `date_range`.
 
-        # parse response body
-        body_data = self._recv(header.size, progress_bar=progress_bar)
-        body: DataFrame = TickBody.parse(hist_msg, header, body_data)
-        return body
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param exp:            The expiration date. Must be after the start of `date_range`.
+        :param strike:         The strike price in USD, rounded to 1/10th of a cent.
+        :param right:          The right of an option. CALL = Bullish; PUT = Bearish
+        :param date_range:     The dates to fetch.
+        :param interval_size:  The interval size in milliseconds. Applicable to most requests except ReqType.TRADE.
+        :param use_rth:        If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored
+                                  (only applicable to intervals requests).
+        :param chunk_rows:     The max number of rows in each yielded DataFrame.
+        :param progress_bar:   Print a progress bar displaying download progress.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+
+        :return:               A generator of pandas DataFrames, in the order the data was received.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        assert self._server is not None, _NOT_CONNECTED_MSG
+        hist_msg = _hist_option_msg(req, root, exp, strike, right, date_range, interval_size, use_rth)
+        return self._iter_ticks(hist_msg, chunk_rows, progress_bar, timestamp, output, compact)
+
+    def export_hist_option(
+        self,
+        req: OptionReqType,
+        root: str,
+        exp: date,
+        strike: float,
+        right: OptionRight,
+        date_range: DateRange,
+        path: str,
+        interval_size: int = 0,
+        use_rth: bool = True,
+        file_format: str = "parquet",
+        chunk_rows: int = 1_000_000,
+        progress_bar: bool = False,
+        timestamp: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> List[str]:
+        """
+         Export historical options data to files partitioned by root, expiration and date, w/o building a
+         DataFrame of the whole request. Ticks are decoded and written in chunks as they are received from the
+         Terminal, so memory usage stays bounded regardless of the size of `date_range`.
+
+         Each day is written to <path>/root=<root>/exp=<YYYYMMDD>/date=<YYYYMMDD>/<req>_<right>_<strike>.<ext>
+         w/ the strike in 1/10th of a cent, and the columns of `get_hist_option(output="arrow")` except the date,
+         which is read from the path like the other partition keys.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param exp:            The expiration date. Must be after the start of `date_range`.
+        :param strike:         The strike price in USD, rounded to 1/10th of a cent.
+        :param right:          The right of an option. CALL = Bullish; PUT = Bearish
+        :param date_range:     The dates to fetch.
+        :param path:           The root directory of the exported dataset, which is created if it does not exist.
+        :param interval_size:  The interval size in milliseconds. Applicable to most requests except ReqType.TRADE.
+        :param use_rth:        If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored
+                                  (only applicable to intervals requests).
+        :param file_format:    "parquet" or "feather" (Arrow IPC). Both require pyarrow.
+        :param chunk_rows:     The number of rows decoded and written at a time, which bounds memory usage. Each
+                                  chunk becomes at least one row group or record batch.
+        :param progress_bar:   Print a progress bar displaying download progress.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param compression:    The compression codec, e.g. "zstd". Defaults to snappy for Parquet and lz4 for Feather.
+
+        :return:               The paths of the written files, in date order.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        :raises ImportError:   If pyarrow is not installed.
+        """
+        assert self._server is not None, _NOT_CONNECTED_MSG
+        writer = _PartitionWriter(
+            path, [("root", root.upper()), ("exp", _format_date(exp))],
+            f"{req.name.lower()}_{right.value}_{_format_strike(strike)}", file_format, timestamp, compression,
+        )
+        hist_msg = _hist_option_msg(req, root, exp, strike, right, date_range, interval_size, use_rth)
+        return self._export(hist_msg, writer, chunk_rows, progress_bar)
+
+    def get_hist_option_many(
+        self,
+        reqs: Iterable[dict],
+        window: int = 64,
+        return_exceptions: bool = False,
+        progress_bar: bool = False,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> list:
+        """
+         Get historical options data for many requests at once. Requests are pipelined, meaning that up to `window`
+         requests are written to the Terminal back-to-back before their responses are read, so a loop of small
+         requests does not pay one full round-trip per request.
+
+        :param reqs:              The requests, each a dict of keyword arguments accepted by `get_hist_option`,
+                                     excluding `progress_bar`.
+        :param window:            The max number of requests sent to the Terminal that have not been responded to.
+        :param return_exceptions: If true, a request that failed has its exception returned in place of a
+                                     DataFrame. If false, the first exception is raised after all responses
+                                     have been received.
+        :param progress_bar:      Print a progress bar displaying the number of responses received.
+        :param timestamp:         If "local" or "utc", add a time zone aware "timestamp" column built from the
+                                     date and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:            The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                     pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:           If True, downcast columns to uint8 exchange & condition codes, uint32 sizes
+                                     and float32 prices where no digits are lost.
+
+        :return:                  The requested data as a list of pandas DataFrames, in the order of `reqs`.
+        :raises ResponseError:    If a request failed.
+        :raises NoData:           If there is no data available for a request.
+        """
+        assert self._server is not None, _NOT_CONNECTED_MSG
+        msgs = [_hist_option_msg(**kwargs) for kwargs in reqs]
+        return self._pipeline_ticks(
+            msgs, window, return_exceptions, progress_bar, timestamp, output, compact
+        )
+
+    def get_hist_chain(
+        self,
+        req: OptionReqType,
+        root: str,
+        exp: date,
+        date_range: DateRange,
+        rights: Iterable[OptionRight] = (OptionRight.CALL, OptionRight.PUT),
+        strikes: Optional[Iterable[float]] = None,
+        interval_size: int = 0,
+        use_rth: bool = True,
+        progress_bar: bool = False,
+        timestamp: Optional[str] = None,
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """
+         Get historical options data for every contract of an expiration. The contracts are fetched
+         concurrently over the connection pool.
+
+        :param req:            The request type.
+        :param root:           The root / underlying / ticker / symbol.
+        :param exp:            The expiration date. Must be after the start of `date_range`.
+        :param date_range:     The dates to fetch.
+        :param rights:         The rights of the contracts to fetch.
+        :param strikes:        The strike prices in USD of the contracts to fetch. Defaults to all strikes listed for
+                                  the expiration.
+        :param interval_size:  The interval size in milliseconds. Applicable to most requests except ReqType.TRADE.
+        :param use_rth:        If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored
+                                  (only applicable to intervals requests).
+        :param progress_bar:   Print a progress bar displaying the number of contracts fetched.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+
+        :return:               The requested data as a pandas DataFrame indexed by strike, right, date and
+                                  ms of day. Contracts without data are omitted.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for any contract.
+        """
+        assert self._server is not None, _NOT_CONNECTED_MSG
+        if strikes is None:
+            strikes = self.get_strikes(root, exp)
+        contracts = [(strike, right) for strike in strikes for right in rights]
+        msgs = [
+            _hist_option_msg(req, root, exp, strike, right, date_range, interval_size, use_rth)
+            for strike, right in contracts
+        ]
+        bodies = self._fetch_tick_bodies(msgs, [date_range] * len(msgs), progress_bar=progress_bar)
+        found = [(contract, body) for contract, body in zip(contracts, bodies) if body is not None]
+        if len(found) == 0:
+            raise NoData(f"No data for any of the {len(contracts)} contracts of {root} {exp}.")
+
+        # tag each tick w/ the contract it belongs to
+        n_ticks = [len(body._trimmed()) for _, body in found]
+        df = TickBody.concat([body for _, body in found])._to_dataframe(timestamp, compact)
+        df.insert(0, "strike", np.repeat([strike for (strike, _), _ in found], n_ticks).astype(float))
+        df.insert(1, "right", np.repeat([right.value for (_, right), _ in found], n_ticks))
+        index = ["strike", "right"] + [col for col in (DataType.DATE, DataType.MS_OF_DAY) if col in df.columns]
+        return df.set_index(index)
 
     def get_hist_option_REST(
         self,
@@ -705,7 +1645,8 @@ class ThetaClient:
         interval_size: int = 0,
         use_rth: bool = True,
         host: str = "127.0.0.1",
-        port: str = "25510"
+        port: str = "25510",
+        output: str = "pandas",
     ) -> pd.DataFrame:
         """
          Get historical options data.
@@ -721,8 +1662,10 @@ class ThetaClient:
                                   (only applicable to intervals requests).
         :param host:           The ip address of the server
         :param port:           The port of the server
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
@@ -737,13 +1680,7 @@ class ThetaClient:
         querystring = {"root": root, "start_date": start_fmt, "end_date": end_fmt,
                        "strike": strike_fmt, "exp": exp_fmt, "right": right_fmt,
                        "ivl": interval_size, "rth": use_rth_fmt}
-        t1 = time.time()
-        response = requests.get(url, params=querystring)
-        t2 = time.time()
-        df = parse_flexible_REST(response)
-        t3 = time.time()
-
-        return df
+        return self._request_REST(url, querystring, lambda response: parse_flexible_REST(response, output))
 
     def get_opt_at_time(
             self,
@@ -754,6 +1691,10 @@ class ThetaClient:
             right: OptionRight,
             date_range: DateRange,
             ms_of_day: int = 0,
+            timestamp: Optional[str] = None,
+            output: str = "pandas",
+            compact: bool = False,
+            raw: bool = False,
     ) -> pd.DataFrame:
         """
          Returns the last tick at a provided millisecond of the day for a given request type.
@@ -765,29 +1706,26 @@ class ThetaClient:
         :param right:          The right of an option. CALL = Bullish; PUT = Bearish
         :param date_range:     The dates to fetch.
         :param ms_of_day:      The time of day in milliseconds.
-
-        :return:               The requested data as a pandas DataFrame.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+        :param raw:            If True, return the response header and a read-only, zero-copy memoryview of the
+                                  tick body as received instead of decoding it. Decode it later w/ `decode_raw`.
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format, or
+                                  the response header and tick body if `raw` is True.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        # format data
-        strike = _format_strike(strike)
-        exp_fmt = _format_date(exp)
-        start_fmt = _format_date(date_range.start)
-        end_fmt = _format_date(date_range.end)
-
         # send request
-        hist_msg = f"MSG_CODE={MessageType.AT_TIME.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}&IVL={ms_of_day}\n"
-        self._server.sendall(hist_msg.encode("utf-8"))
-
-        # parse response header
-        header_data = self._server.recv(20)
-        header: Header = Header.parse(hist_msg, header_data)
-
-        # parse response body
-        body_data = self._recv(header.size, progress_bar=False)
-        body: DataFrame = TickBody.parse(hist_msg, header, body_data)
+        hist_msg = _at_time_option_msg(req, root, exp, strike, right, date_range, ms_of_day)
+        if raw:
+            return self._request_raw(hist_msg)
+        body: DataFrame = self._request_ticks(hist_msg, timestamp=timestamp, output=output, compact=compact)
         return body
 
     def get_opt_at_time_REST(
@@ -800,7 +1738,8 @@ class ThetaClient:
             date_range: DateRange,
             ms_of_day: int = 0,
             host: str = "127.0.0.1",
-            port: str = "25510"
+            port: str = "25510",
+            output: str = "pandas",
     ) -> pd.DataFrame:
         """
          Returns the last tick at a provided millisecond of the day for a given request type.
@@ -814,8 +1753,10 @@ class ThetaClient:
         :param ms_of_day:      The time of day in milliseconds.
         :param host:           The ip address of the server
         :param port:           The port of the server
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
@@ -830,9 +1771,7 @@ class ThetaClient:
         url = f"http://{host}:{port}/at_time/option/{req_fmt}"
         querystring = {"root": root, "start_date": start_fmt, "end_date": end_fmt, "strike": strike_fmt,
                        "exp": exp_fmt, "right": right_fmt, "ivl": ms_of_day}
-        response = requests.get(url, params=querystring)
-        df = parse_flexible_REST(response)
-        return df
+        return self._request_REST(url, querystring, lambda response: parse_flexible_REST(response, output))
 
     def get_stk_at_time(
             self,
@@ -840,6 +1779,10 @@ class ThetaClient:
             root: str,
             date_range: DateRange,
             ms_of_day: int = 0,
+            timestamp: Optional[str] = None,
+            output: str = "pandas",
+            compact: bool = False,
+            raw: bool = False,
     ) -> pd.DataFrame:
         """
          Returns the last tick at a provided millisecond of the day for a given request type.
@@ -848,27 +1791,26 @@ class ThetaClient:
         :param root:           The root / underlying / ticker / symbol.
         :param date_range:     The dates to fetch.
         :param ms_of_day:      The time of day in milliseconds.
-
-        :return:               The requested data as a pandas DataFrame.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+        :param raw:            If True, return the response header and a read-only, zero-copy memoryview of the
+                                  tick body as received instead of decoding it. Decode it later w/ `decode_raw`.
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format, or
+                                  the response header and tick body if `raw` is True.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        # format data
-        start_fmt = _format_date(date_range.start)
-        end_fmt = _format_date(date_range.end)
-
         # send request
-        hist_msg = f"MSG_CODE={MessageType.AT_TIME.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&sec={SecType.STOCK.value}&req={req.value}&IVL={ms_of_day}\n"
-        self._server.sendall(hist_msg.encode("utf-8"))
-
-        # parse response header
-        header_data = self._server.recv(20)
-        header: Header = Header.parse(hist_msg, header_data)
-
-        # parse response body
-        body_data = self._recv(header.size, progress_bar=False)
-        body: DataFrame = TickBody.parse(hist_msg, header, body_data)
+        hist_msg = _at_time_stock_msg(req, root, date_range, ms_of_day)
+        if raw:
+            return self._request_raw(hist_msg)
+        body: DataFrame = self._request_ticks(hist_msg, timestamp=timestamp, output=output, compact=compact)
         return body
 
     def get_stk_at_time_REST(
@@ -878,7 +1820,8 @@ class ThetaClient:
             date_range: DateRange,
             ms_of_day: int = 0,
             host: str = "127.0.0.1",
-            port: str = "25510"
+            port: str = "25510",
+            output: str = "pandas",
     ) -> pd.DataFrame:
         """
          Returns the last tick at a provided millisecond of the day for a given request type.
@@ -889,8 +1832,10 @@ class ThetaClient:
         :param ms_of_day:      The time of day in milliseconds.
         :param host:           The ip address of the server
         :param port:           The port of the server
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
@@ -902,9 +1847,7 @@ class ThetaClient:
         url = f"http://{host}:{port}/at_time/stock/{req_fmt}"
         querystring = {"root": root_fmt, "start_date": start_fmt,
                        "end_date": end_fmt, "ivl": ms_of_day}
-        response = requests.get(url, params=querystring)
-        df = parse_flexible_REST(response)
-        return df
+        return self._request_REST(url, querystring, lambda response: parse_flexible_REST(response, output))
 
     def get_hist_stock(
             self,
@@ -914,6 +1857,13 @@ class ThetaClient:
             interval_size: int = 0,
             use_rth: bool = True,
             progress_bar: bool = False,
+            split: Union[str, int, None] = None,
+            timestamp: Optional[str] = None,
+            output: str = "pandas",
+            compact: bool = False,
+            checkpoint_dir: Optional[str] = None,
+            retries: int = 3,
+            raw: bool = False,
     ) -> pd.DataFrame:
         """
          Get historical stock data.
@@ -924,28 +1874,182 @@ class ThetaClient:
         :param interval_size:  The interval size in milliseconds. Applicable only to OHLC & QUOTE requests.
         :param use_rth:         If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored.
         :param progress_bar:   Print a progress bar displaying download progress.
-
-        :return:               The requested data as a pandas DataFrame.
+        :param split:          If specified, `date_range` is split into sub-ranges of a "day", a "week" or the
+                                  provided number of trading days, which are fetched concurrently over the
+                                  connection pool and reassembled in date order. An int counts trading days, not
+                                  calendar days, e.g. 5 is a full trading week. Sub-ranges without data are
+                                  skipped, and weekends and exchange holidays are not requested at all, see
+                                  `calendar`.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+        :param checkpoint_dir: If specified, download `date_range` in units of `split` (a day by default) that are
+                                  saved to this directory as they complete, so a request that fails or whose process
+                                  crashes resumes from the completed units when it is made again. Units are fetched
+                                  again after a reconnect, connection failure or timeout up to `retries` times, w/
+                                  exponential backoff. Takes precedence over `hist_cache`.
+        :param retries:        The max number of retries of a checkpointed request.
+        :param raw:            If True, return the response header and a read-only, zero-copy memoryview of the
+                                  tick body as received instead of decoding it. Decode it later w/ `decode_raw`.
+                                  Cannot be combined w/ `split` or `checkpoint_dir`, and bypasses `hist_cache`.
+
+        :return:               The requested data as a pandas DataFrame, or in the requested output format, or
+                                  the response header and tick body if `raw` is True.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        # format data
-        start_fmt = _format_date(date_range.start)
-        end_fmt = _format_date(date_range.end)
+        if raw:
+            assert split is None and checkpoint_dir is None, "raw cannot be combined w/ split or checkpoint_dir."
+            return self._request_raw(_hist_stock_msg(req, root, date_range, interval_size, use_rth), progress_bar)
+        if checkpoint_dir is not None:
+            return self._get_checkpointed(
+                lambda dr: _hist_stock_msg(req, root, dr, interval_size, use_rth),
+                date_range, checkpoint_dir, split, retries, progress_bar, timestamp, output, compact,
+            )
+        if self.hist_cache is not None:
+            return self._get_hist_days(
+                lambda dr: _hist_stock_msg(req, root, dr, interval_size, use_rth),
+                date_range, split, progress_bar, timestamp, output, compact,
+            )
+        if split is not None:
+            sub_ranges = date_range.split(split, trading_days=True)
+            msgs = [_hist_stock_msg(req, root, sub_range, interval_size, use_rth) for sub_range in sub_ranges]
+            return self._get_split_ticks(msgs, progress_bar, timestamp, output, compact)
 
         # send request
-        hist_msg = f"MSG_CODE={MessageType.HIST.value}&START_DATE={start_fmt}&END_DATE={end_fmt}&root={root}&sec={SecType.STOCK.value}&req={req.value}&rth={use_rth}&IVL={interval_size}\n"
-        self._server.sendall(hist_msg.encode("utf-8"))
+        hist_msg = _hist_stock_msg(req, root, date_range, interval_size, use_rth)
+        body: DataFrame = self._request_ticks(hist_msg, progress_bar, timestamp, output, compact)
+        return body
 
-        # parse response header
-        header_data = self._server.recv(20)
-        header: Header = Header.parse(hist_msg, header_data)
+    def iter_hist_stock(
+            self,
+            req: StockReqType,
+            root: str,
+            date_range: DateRange,
+            interval_size: int = 0,
+            use_rth: bool = True,
+            chunk_rows: int = 1_000_000,
+            progress_bar: bool = False,
+            timestamp: Optional[str] = None,
+            output: str = "pandas",
+            compact: bool = False,
+    ) -> Iterator[pd.DataFrame]:
+        """
+         Get historical stock data in chunks of at most `chunk_rows` rows, which are parsed as they are
+         received from the Terminal. Memory usage stays bounded regardless of the size of `date_range`.
 
-        # parse response body
-        body_data = self._recv(header.size, progress_bar=progress_bar)
-        body: DataFrame = TickBody.parse(hist_msg, header, body_data)
-        return body
+        :param req:            The request type.
+        :param root:           The root symbol.
+        :param date_range:     The dates to fetch.
+        :param interval_size:  The interval size in milliseconds. Applicable only to OHLC & QUOTE requests.
+        :param use_rth:         If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored.
+        :param chunk_rows:     The max number of rows in each yielded DataFrame.
+        :param progress_bar:   Print a progress bar displaying download progress.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:        If True, downcast columns to uint8 exchange & condition codes, uint32 sizes and
+                                  float32 prices where no digits are lost. Bytes saved are in attrs["compact_bytes_saved"].
+
+        :return:               A generator of pandas DataFrames, in the order the data was received.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        """
+        assert self._server is not None, _NOT_CONNECTED_MSG
+        hist_msg = _hist_stock_msg(req, root, date_range, interval_size, use_rth)
+        return self._iter_ticks(hist_msg, chunk_rows, progress_bar, timestamp, output, compact)
+
+    def export_hist_stock(
+            self,
+            req: StockReqType,
+            root: str,
+            date_range: DateRange,
+            path: str,
+            interval_size: int = 0,
+            use_rth: bool = True,
+            file_format: str = "parquet",
+            chunk_rows: int = 1_000_000,
+            progress_bar: bool = False,
+            timestamp: Optional[str] = None,
+            compression: Optional[str] = None,
+    ) -> List[str]:
+        """
+         Export historical stock data to files partitioned by root and date, w/o building a DataFrame of the
+         whole request. Ticks are decoded and written in chunks as they are received from the Terminal, so memory
+         usage stays bounded regardless of the size of `date_range`.
+
+         Each day is written to <path>/root=<root>/date=<YYYYMMDD>/<req>.<ext> w/ the columns of
+         `get_hist_stock(output="arrow")` except the date, which is read from the path like the root.
+
+        :param req:            The request type.
+        :param root:           The root symbol.
+        :param date_range:     The dates to fetch.
+        :param path:           The root directory of the exported dataset, which is created if it does not exist.
+        :param interval_size:  The interval size in milliseconds. Applicable only to OHLC & QUOTE requests.
+        :param use_rth:         If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored.
+        :param file_format:    "parquet" or "feather" (Arrow IPC). Both require pyarrow.
+        :param chunk_rows:     The number of rows decoded and written at a time, which bounds memory usage. Each
+                                  chunk becomes at least one row group or record batch.
+        :param progress_bar:   Print a progress bar displaying download progress.
+        :param timestamp:      If "local" or "utc", add a time zone aware "timestamp" column built from the date
+                                  and ms of day of each tick, in exchange time or UTC respectively.
+        :param compression:    The compression codec, e.g. "zstd". Defaults to snappy for Parquet and lz4 for Feather.
+
+        :return:               The paths of the written files, in date order.
+        :raises ResponseError: If the request failed.
+        :raises NoData:        If there is no data available for the request.
+        :raises ImportError:   If pyarrow is not installed.
+        """
+        assert self._server is not None, _NOT_CONNECTED_MSG
+        writer = _PartitionWriter(
+            path, [("root", root.upper())], req.name.lower(), file_format, timestamp, compression
+        )
+        hist_msg = _hist_stock_msg(req, root, date_range, interval_size, use_rth)
+        return self._export(hist_msg, writer, chunk_rows, progress_bar)
+
+    def get_hist_stock_many(
+        self,
+        reqs: Iterable[dict],
+        window: int = 64,
+        return_exceptions: bool = False,
+        progress_bar: bool = False,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> list:
+        """
+         Get historical stock data for many requests at once. Requests are pipelined, meaning that up to `window`
+         requests are written to the Terminal back-to-back before their responses are read, so a loop of small
+         requests does not pay one full round-trip per request.
+
+        :param reqs:              The requests, each a dict of keyword arguments accepted by `get_hist_stock`,
+                                     excluding `progress_bar`.
+        :param window:            The max number of requests sent to the Terminal that have not been responded to.
+        :param return_exceptions: If true, a request that failed has its exception returned in place of a
+                                     DataFrame. If false, the first exception is raised after all responses
+                                     have been received.
+        :param progress_bar:      Print a progress bar displaying the number of responses received.
+        :param timestamp:         If "local" or "utc", add a time zone aware "timestamp" column built from the
+                                     date and ms of day of each tick, in exchange time or UTC respectively.
+        :param output:            The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                     pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
+        :param compact:           If True, downcast columns to uint8 exchange & condition codes, uint32 sizes
+                                     and float32 prices where no digits are lost.
+
+        :return:                  The requested data as a list of pandas DataFrames, in the order of `reqs`.
+        :raises ResponseError:    If a request failed.
+        :raises NoData:           If there is no data available for a request.
+        """
+        assert self._server is not None, _NOT_CONNECTED_MSG
+        msgs = [_hist_stock_msg(**kwargs) for kwargs in reqs]
+        return self._pipeline_ticks(
+            msgs, window, return_exceptions, progress_bar, timestamp, output, compact
+        )
 
     def get_hist_stock_REST(
             self,
@@ -955,7 +2059,8 @@ class ThetaClient:
             interval_size: int = 0,
             use_rth: bool = True,
             host: str = "127.0.0.1",
-            port: str = "25510"
+            port: str = "25510",
+            output: str = "pandas",
     ) -> pd.DataFrame:
         """
          Get historical stock data.
@@ -967,8 +2072,10 @@ class ThetaClient:
         :param use_rth:         If true, timestamps prior to 09:30 EST and after 16:00 EST will be ignored.
         :param host:           The ip address of the server
         :param port:           The port of the server
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
@@ -980,9 +2087,7 @@ class ThetaClient:
         url = f"http://{host}:{port}/hist/stock/{req_fmt}"
         params = {"root": root, "start_date": start_fmt, "end_date": end_fmt,
                       "ivl": interval_size, "rth": use_rth_fmt}
-        response = requests.get(url, params=params)
-        df = parse_flexible_REST(response)
-        return df
+        return self._request_REST(url, params, lambda response: parse_flexible_REST(response, output))
 
     # LISTING DATA
 
@@ -998,11 +2103,8 @@ class ThetaClient:
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        out = f"MSG_CODE={MessageType.ALL_DATES.value}&root={root}&sec={SecType.STOCK.value}&req={req.value}\n"
-        self._server.send(out.encode("utf-8"))
-        header = Header.parse(out, self._server.recv(20))
-        body = ListBody.parse(out, header, self._recv(header.size), dates=True)
-        return body.lst
+        out = _dates_stock_msg(root, req)
+        return self._request_list(out, root, dates=True)
 
     def get_dates_stk_REST(self, root: str, req: StockReqType, host: str = "127.0.0.1", port: str = "25510") -> pd.Series:
         """
@@ -1021,9 +2123,7 @@ class ThetaClient:
         req_fmt = req.name.lower()
         url = f"http://{host}:{port}/list/dates/stock/{req_fmt}"
         params = {'root': root_fmt}
-        response = requests.get(url, params=params)
-        series = parse_list_REST(response, dates=True)
-        return series
+        return self._request_list_REST(url, params, root, dates=True)
 
     def get_dates_opt(
             self,
@@ -1046,13 +2146,8 @@ class ThetaClient:
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        strike = _format_strike(strike)
-        exp_fmt = _format_date(exp)
-        out = f"MSG_CODE={MessageType.ALL_DATES.value}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}\n"
-        self._server.send(out.encode("utf-8"))
-        header = Header.parse(out, self._server.recv(20))
-        body = ListBody.parse(out, header, self._recv(header.size), dates=True)
-        return body.lst
+        out = _dates_option_msg(req, root, exp, strike, right)
+        return self._request_list(out, root, dates=True)
 
     def get_dates_opt_REST(
             self,
@@ -1085,9 +2180,7 @@ class ThetaClient:
         sec = SecType.OPTION.value.lower()
         url = f"http://{host}:{port}/list/dates/{sec}/{req}"
         params = {'root': root, 'exp': exp_fmt, 'strike': strike_fmt, 'right': right}
-        response = requests.get(url, params=params)
-        df = parse_list_REST(response, dates=True)
-        return df
+        return self._request_list_REST(url, params, root, dates=True)
 
     def get_dates_opt_bulk(
             self,
@@ -1106,12 +2199,8 @@ class ThetaClient:
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        exp_fmt = _format_date(exp)
-        out = f"MSG_CODE={MessageType.ALL_DATES_BULK.value}&root={root}&exp={exp_fmt}&sec={SecType.OPTION.value}&req={req.value}\n"
-        self._server.send(out.encode("utf-8"))
-        header = Header.parse(out, self._server.recv(20))
-        body = ListBody.parse(out, header, self._recv(header.size), dates=True)
-        return body.lst
+        out = _dates_option_bulk_msg(req, root, exp)
+        return self._request_list(out, root, dates=True)
 
     def get_dates_opt_bulk_REST(
             self,
@@ -1140,9 +2229,7 @@ class ThetaClient:
         sec = SecType.OPTION.value.lower()
         url = f"http://{host}:{port}/list/dates/{sec}/{req}"
         params = {'root': root, 'exp': exp_fmt}
-        response = requests.get(url, params=params)
-        df = parse_list_REST(response, dates=True)
-        return df
+        return self._request_list_REST(url, params, root, dates=True)
 
     def get_expirations(self, root: str) -> pd.Series:
         """
@@ -1155,11 +2242,8 @@ class ThetaClient:
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        out = f"MSG_CODE={MessageType.ALL_EXPIRATIONS.value}&root={root}\n"
-        self._server.send(out.encode("utf-8"))
-        header = Header.parse(out, self._server.recv(20))
-        body = ListBody.parse(out, header, self._recv(header.size), dates=True)
-        return body.lst
+        out = _expirations_msg(root)
+        return self._request_list(out, root, dates=True)
 
     def get_expirations_REST(self, root: str, host: str = "127.0.0.1", port: str = "25510") -> pd.Series:
         """
@@ -1175,9 +2259,7 @@ class ThetaClient:
         """
         url = f"http://{host}:{port}/list/expirations"
         params = {"root": root}
-        response = requests.get(url, params=params)
-        df = parse_list_REST(response, dates=True)
-        return df
+        return self._request_list_REST(url, params, root, dates=True)
 
     def get_strikes(self, root: str, exp: date, date_range: DateRange = None,) -> pd.Series:
         """
@@ -1193,26 +2275,8 @@ class ThetaClient:
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        assert isinstance(exp, date)
-        exp_fmt = _format_date(exp)
-
-        if date_range is not None:
-            start_fmt = _format_date(date_range.start)
-            end_fmt = _format_date(date_range.end)
-            out = f"MSG_CODE={MessageType.ALL_STRIKES.value}&root={root}&exp={exp_fmt}&START_DATE={start_fmt}&END_DATE={end_fmt}\n"
-        else:
-            out = f"MSG_CODE={MessageType.ALL_STRIKES.value}&root={root}&exp={exp_fmt}\n"
-        self._server.send(out.encode("utf-8"))
-        header = Header.parse(out, self._server.recv(20))
-        body = ListBody.parse(out, header, self._recv(header.size)).lst
-        div = Decimal(1000)
-        s = pd.Series([], dtype='float64')
-        c = 0
-        for i in body:
-            s[c] = Decimal(i) / div
-            c += 1
-
-        return s
+        out = _strikes_msg(root, exp, date_range)
+        return _parse_strikes(self._request_list(out, root))
 
 
     def get_strikes_REST(self, root: str, exp: date, date_range: DateRange = None, host: str = "127.0.0.1", port: str = "25510") -> pd.Series:
@@ -1240,8 +2304,7 @@ class ThetaClient:
         else:
             querystring = {"root": root_fmt, "exp": exp_fmt}
         url = f"http://{host}:{port}/list/strikes"
-        response = requests.get(url, params=querystring)
-        ser = parse_list_REST(response)
+        ser = self._request_list_REST(url, querystring, root)
         ser = ser.divide(1000)
         return ser
 
@@ -1256,11 +2319,8 @@ class ThetaClient:
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        out = f"MSG_CODE={MessageType.ALL_ROOTS.value}&sec={sec.value}\n"
-        self._server.send(out.encode("utf-8"))
-        header = Header.parse(out, self._server.recv(20))
-        body = ListBody.parse(out, header, self._recv(header.size))
-        return body.lst
+        out = _roots_msg(sec)
+        return self._request_list(out)
 
     def get_roots_REST(self, sec: SecType, host: str = "127.0.0.1", port: str = "25510") -> pd.Series:
         """
@@ -1276,9 +2336,7 @@ class ThetaClient:
         """
         url = f"http://{host}:{port}/list/roots"
         params = {'sec': sec.value}
-        response = requests.get(url, params=params)
-        df = parse_list_REST(response)
-        return df
+        return self._request_list_REST(url, params)
 
     # LIVE DATA
 
@@ -1289,6 +2347,7 @@ class ThetaClient:
         exp: date,
         strike: float,
         right: OptionRight,
+        output: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get the most recent options tick.
@@ -1298,25 +2357,17 @@ class ThetaClient:
         :param exp:            The expiration date.
         :param strike:         The strike price in USD, rounded to 1/10th of a cent.
         :param right:          The right of an options.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-        # format data
-        strike = _format_strike(strike)
-        exp_fmt = _format_date(exp)
-
         # send request
-        hist_msg = f"MSG_CODE={MessageType.LAST.value}&root={root}&exp={exp_fmt}&strike={strike}&right={right.value}&sec={SecType.OPTION.value}&req={req.value}\n"
-        self._server.sendall(hist_msg.encode("utf-8"))
-
-        # parse response
-        header: Header = Header.parse(hist_msg, self._server.recv(20))
-        body: DataFrame = TickBody.parse(
-            hist_msg, header, self._recv(header.size)
-        )
+        hist_msg = _last_option_msg(req, root, exp, strike, right)
+        body: DataFrame = self._request_ticks(hist_msg, output=output)
         return body
 
     def get_last_option_REST(
@@ -1327,7 +2378,8 @@ class ThetaClient:
         strike: float,
         right: OptionRight,
         host: str = "127.0.0.1",
-        port: str = "25510"
+        port: str = "25510",
+        output: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get the most recent options tick.
@@ -1339,8 +2391,10 @@ class ThetaClient:
         :param right:          The right of an options.
         :param host:           The ip address of the server
         :param port:           The port of the server
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
@@ -1352,36 +2406,30 @@ class ThetaClient:
 
         url = f"http://{host}:{port}/snapshot/option/{req_fmt}"
         querystring = {"root": root_fmt, "strike": strike_fmt, "exp": exp_fmt, "right": right_fmt}
-        response = requests.get(url, params=querystring)
-        df = parse_flexible_REST(response)
-        return df
+        return self._request_REST(url, querystring, lambda response: parse_flexible_REST(response, output))
 
     def get_last_stock(
         self,
         req: StockReqType,
         root: str,
+        output: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get the most recent stock tick.
 
         :param req:            The request type.
         :param root:           The root / underlying / ticker / symbol.
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
-
         # send request
-        hist_msg = f"MSG_CODE={MessageType.LAST.value}&root={root}&sec={SecType.STOCK.value}&req={req.value}\n"
-        self._server.sendall(hist_msg.encode("utf-8"))
-
-        # parse response
-        header: Header = Header.parse(hist_msg, self._server.recv(20))
-        body: DataFrame = TickBody.parse(
-            hist_msg, header, self._recv(header.size)
-        )
+        hist_msg = _last_stock_msg(req, root)
+        body: DataFrame = self._request_ticks(hist_msg, output=output)
         return body
 
     def get_last_stock_REST(
@@ -1389,7 +2437,8 @@ class ThetaClient:
         req: StockReqType,
         root: str,
         host: str = "127.0.0.1",
-        port: str = "25510"
+        port: str = "25510",
+        output: str = "pandas",
     ) -> pd.DataFrame:
         """
         Get the most recent options tick.
@@ -1401,8 +2450,10 @@ class ThetaClient:
         :param right:          The right of an options.
         :param host:           The ip address of the server
         :param port:           The port of the server
+        :param output:         The result format: "pandas", "numpy" for a structured array, "arrow" for a
+                                  pyarrow Table or "polars" for a polars DataFrame. pyarrow and polars are optional.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or in the requested output format.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
@@ -1411,34 +2462,30 @@ class ThetaClient:
 
         url = f"http://{host}:{port}/snapshot/option/{req_fmt}"
         querystring = {"root": root_fmt}
-        response = requests.get(url, params=querystring)
-        df = parse_flexible_REST(response)
-        return df
+        return self._request_REST(url, querystring, lambda response: parse_flexible_REST(response, output))
 
     def get_req(
         self,
         req: str,
+        raw: bool = False,
     ) -> pd.DataFrame:
         """
         Make a historical data request given the raw text output of a data request. Typically used for debugging.
 
         :param req:            The raw request.
+        :param raw:            If True, return the response header and a read-only, zero-copy memoryview of the
+                                  tick body as received instead of decoding it. Decode it later w/ `decode_raw`.
 
-        :return:               The requested data as a pandas DataFrame.
+        :return:               The requested data as a pandas DataFrame, or the response header and tick body if
+                                  `raw` is True.
         :raises ResponseError: If the request failed.
         :raises NoData:        If there is no data available for the request.
         """
         assert self._server is not None, _NOT_CONNECTED_MSG
         # send request
         req = req + "\n"
-        self._server.sendall(req.encode("utf-8"))
-
-        # parse response header
-        header_data = self._server.recv(20)
-        header: Header = Header.parse(req, header_data)
-
-        # parse response body
-        body_data = self._recv(header.size, progress_bar=False)
-        body: DataFrame = TickBody.parse(req, header, body_data)
+        if raw:
+            return self._request_raw(req)
+        body: DataFrame = self._request_ticks(req)
         return body
 
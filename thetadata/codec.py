@@ -0,0 +1,170 @@
+"""Module that describes every binary layout of the Terminal protocols once, w/ precompiled codecs.
+
+Each layout is a `struct.Struct` or numpy dtype that is compiled when this module is imported, so decoding a
+message is a single call into C instead of slicing and converting it field by field.
+"""
+from __future__ import annotations
+
+import enum
+import struct
+from datetime import date
+from typing import List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from .enums import (
+    DataType,
+    Exchange,
+    MessageType,
+    QuoteCondition,
+    StreamMsgType,
+    StreamResponseType,
+    TradeCondition,
+)
+from .exceptions import _EnumParseError
+
+# HIST PROTOCOL
+
+"""
+Header format:
+    bytes | field
+        2 | message type
+        8 | id
+        2 | latency
+        2 | error
+        1 | reserved / special
+        1 | format length
+        4 | size
+"""
+HEADER = struct.Struct(">HQHHxBI")
+HEADER_SIZE = HEADER.size
+
+# body ticks are rows of 4 byte big endian integers, starting w/ the format tick of DataType codes
+TICK_DTYPE = np.dtype(">i4")
+
+# STREAM PROTOCOL
+
+"""
+Stream frame format:
+    bytes        | field
+        1        | StreamMsgType code
+        1        | contract length
+        n        | contract, see CONTRACT_PREFIX
+        variable | payload, whose layout depends on the message type
+"""
+STREAM_MSG_TYPE = struct.Struct(">B")
+# contract length, root length, then the root and CONTRACT_SEC
+CONTRACT_PREFIX = struct.Struct(">BB")
+# 1 if the contract is an option
+CONTRACT_SEC = struct.Struct(">B")
+# follows CONTRACT_SEC for options: expiration, 1 if a call, reserved, strike in 1/10th of a cent
+CONTRACT_OPTION = struct.Struct(">IBxI")
+
+# ms_of_day, sequence, size, condition, price, exchange, price type, date
+TRADE = struct.Struct(">8I")
+# ms_of_day, bid size, bid exchange, bid, bid condition, ask size, ask exchange, ask, ask condition,
+# price type, date
+QUOTE = struct.Struct(">11I")
+# ms_of_day, open, high, low, close, volume, count, price type, date
+OHLCVC = struct.Struct(">9I")
+# open interest, date
+OPEN_INTEREST = struct.Struct(">2I")
+# request id, StreamResponseType code
+REQ_RESPONSE = struct.Struct(">II")
+# a date for START / STOP messages, reserved otherwise
+STREAM_INT = struct.Struct(">I")
+
+def _code_table(enum_cls: Type[enum.Enum]) -> dict:
+    """Map the codes of an enum to its members, like its `from_code` does w/o scanning every member."""
+    table = {}
+    for member in enum_cls:
+        code = member.value[0] if isinstance(member.value, tuple) else member.value
+        table.setdefault(code, member)
+    return table
+
+
+_CODE_TABLES = {
+    enum_cls: _code_table(enum_cls)
+    for enum_cls in (
+        DataType, MessageType, Exchange, TradeCondition, QuoteCondition, StreamMsgType, StreamResponseType
+    )
+}
+
+
+def from_code(enum_cls: Type[enum.Enum], code: int, default: Optional[enum.Enum] = None):
+    """Create an enum member by its code w/ a table lookup.
+
+    :param default: Returned if the code does not match a member, e.g. the UNDEFINED condition.
+    :raises EnumParseError: If the code does not match a member and there is no default
+    """
+    try:
+        return _CODE_TABLES[enum_cls][code]
+    except KeyError:
+        if default is not None:
+            return default
+        raise _EnumParseError(code, enum_cls) from None
+
+
+def to_date(yyyymmdd: int) -> date:
+    """Convert a YYYYMMDD integer to a date w/ integer arithmetic."""
+    return date(yyyymmdd // 10000, yyyymmdd // 100 % 100, yyyymmdd % 100)
+
+
+def decode_header(data) -> Tuple[MessageType, int, int, int, int, int]:
+    """Decode a 20 byte header.
+
+    :return: The message type, id, latency, error, format length and body size.
+    """
+    msg_type, id_, latency, error, format_len, size = HEADER.unpack(data)
+    return from_code(MessageType, msg_type), id_, latency, error, format_len, size
+
+
+def encode_header(msg_type: MessageType, id_: int, latency: int, error: int, format_len: int, size: int) -> bytes:
+    """Encode a 20 byte header, the inverse of `decode_header`."""
+    return HEADER.pack(msg_type.value, id_, latency, error, format_len, size)
+
+
+def decode_format(data, format_len: int) -> List[DataType]:
+    """Decode the format tick at the start of a tick body."""
+    codes = np.frombuffer(data, dtype=TICK_DTYPE, count=format_len)
+    return [from_code(DataType, code) for code in codes.tolist()]
+
+
+def decode_ticks(data, n_cols: int) -> np.ndarray:
+    """Decode body ticks into a native int32 array w/ a row per tick."""
+    return np.frombuffer(data, dtype=TICK_DTYPE).reshape(-1, n_cols).astype(np.int32)
+
+
+def encode_ticks(format_tick: Sequence[DataType], ticks: np.ndarray) -> bytes:
+    """Encode a tick body: the format tick, the ticks and a trailing null tick."""
+    n_cols = len(format_tick)
+    rows = np.empty((len(ticks) + 2, n_cols), dtype=TICK_DTYPE)
+    rows[0] = [col.code() for col in format_tick]
+    rows[1:-1] = ticks
+    rows[-1] = 0
+    return rows.tobytes()
+
+
+def decode_contract(data) -> Tuple[str, bool, int, bool, int]:
+    """Decode a stream contract, which starts w/ its own length.
+
+    :return: The root, whether it is an option, and the expiration as YYYYMMDD, whether it is a call and the
+             strike in 1/10th of a cent, which are 0 / False if it is not an option.
+    """
+    _, root_len = CONTRACT_PREFIX.unpack_from(data)
+    root = bytes(data[2:2 + root_len]).decode("ascii")
+    (is_option,) = CONTRACT_SEC.unpack_from(data, 2 + root_len)
+    if is_option != 1:
+        return root, False, 0, False, 0
+    exp, is_call, strike = CONTRACT_OPTION.unpack_from(data, 3 + root_len)
+    return root, True, exp, is_call == 1, strike
+
+
+def encode_contract(root: str, is_option: bool = False, exp: int = 0, is_call: bool = False, strike: int = 0) -> bytes:
+    """Encode a stream contract w/ its length prefix, the inverse of `decode_contract`."""
+    root_bytes = root.encode("ascii")
+    tail = CONTRACT_SEC.pack(1 if is_option else 0)
+    if is_option:
+        tail += CONTRACT_OPTION.pack(exp, 1 if is_call else 0, strike)
+    length = CONTRACT_PREFIX.size + len(root_bytes) + len(tail)
+    return CONTRACT_PREFIX.pack(length, len(root_bytes)) + root_bytes + tail
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import enum
+import itertools
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass
+from typing import List, Union
 
-from . import exceptions
+from . import calendar, exceptions
 
 
 @enum.unique
@@ -353,14 +355,62 @@ class DateRange:
         ), f"Start date {self.start} is greater than end date {self.end}!"
 
     @classmethod
-    def from_days(cls, n: int) -> DateRange:
-        """Create a date range that spans the past `n` days."""
+    def from_days(cls, n: int, trading_days: bool = False) -> DateRange:
+        """Create a date range that spans the past `n` days.
+
+        :param trading_days: If True, count trading days instead, so the range starts `n` trading days ago.
+        """
         assert type(n) == int
         assert n >= 0, "n must be nonnegative"
         end = datetime.now().date()
         start = end - timedelta(days=n)
+        if trading_days:
+            start = end
+            for _ in range(n):
+                start = calendar.previous_trading_day(start)
         return cls(start, end)
 
+    def days(self, trading_only: bool = False) -> List[date]:
+        """:return: The days of this date range in order, or only its trading days, see `calendar`."""
+        if trading_only:
+            return calendar.trading_days(self.start, self.end)
+        return [self.start + timedelta(days=i) for i in range((self.end - self.start).days + 1)]
+
+    def split(self, step: Union[str, int], trading_days: bool = False) -> List[DateRange]:
+        """Split this date range into consecutive, non-overlapping sub-ranges that cover it.
+
+        :param step: "day" for one sub-range per day, "week" for one sub-range per Monday-Sunday week,
+                     or the number of days in each sub-range, which are trading days if `trading_days`.
+        :param trading_days: If True, only cover the trading days of this range, see `calendar`. An int `step`
+                             counts trading days rather than calendar days, sub-ranges start and end on trading
+                             days, and weeks w/o trading days are skipped.
+        :return: The sub-ranges in date order.
+        """
+        if trading_days:
+            days = self.days(trading_only=True)
+            if step == "week":
+                groups = [list(week) for _, week in itertools.groupby(days, key=lambda day: day.isocalendar()[:2])]
+            else:
+                step_days = 1 if step == "day" else step
+                assert isinstance(step_days, int) and step_days > 0, f"Cannot split a date range by {step}."
+                groups = [days[i:i + step_days] for i in range(0, len(days), step_days)]
+            return [DateRange(group[0], group[-1]) for group in groups]
+
+        if step == "week":
+            # the first sub-range ends on a Sunday to align the rest w/ calendar weeks
+            first_days, step_days = 7 - self.start.weekday(), 7
+        else:
+            step_days = 1 if step == "day" else step
+            assert isinstance(step_days, int) and step_days > 0, f"Cannot split a date range by {step}."
+            first_days = step_days
+
+        ranges = []
+        start, end = self.start, self.start + timedelta(days=first_days - 1)
+        while start <= self.end:
+            ranges.append(DateRange(start, min(end, self.end)))
+            start, end = end + timedelta(days=1), end + timedelta(days=step_days)
+        return ranges
+
 
 @enum.unique
 class StreamMsgType(enum.Enum):
@@ -0,0 +1,127 @@
+"""Module that contains the partitioned Parquet and Feather writers of the ThetaClient export calls."""
+from __future__ import annotations
+
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .enums import DataType
+from .parsing import TickBody, _column_name
+
+EXPORT_FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+# used if no compression codec is specified, the defaults of pyarrow
+_DEFAULT_COMPRESSION = {"parquet": "snappy", "feather": "lz4"}
+
+
+def _import_pyarrow():
+    """Import pyarrow, which exporting requires.
+
+    :raises ImportError: w/ installation instructions if pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Exporting requires pyarrow, which is not installed. Install it w/ `pip install thetadata[arrow]`."
+        ) from e
+    return pyarrow
+
+
+class _PartitionWriter:
+    """Writes the tick chunks of a request to one file per date as they are decoded.
+
+    Files are written to Hive style partition directories, e.g. root=AAPL/exp=20230120/date=20230103, so they can
+    be read back as a single dataset w/ pyarrow or polars. Like the other partition keys, the date is only stored
+    in the path, not as a column of the files. Responses are in date order, so only the file of the current date
+    is open, and each chunk is written as its own row groups / record batches. Memory usage is therefore bounded
+    by the chunk size regardless of the size of the export. Files are written next to their path and moved into
+    place once complete, so readers never open a partial file.
+    """
+
+    def __init__(self, path: str, partitions: List[Tuple[str, str]], file_name: str, file_format: str = "parquet",
+                 timestamp: Optional[str] = None, compression: Optional[str] = None):
+        """Create a writer.
+
+        :param path:        The root directory of the dataset, which is created if it does not exist.
+        :param partitions:  The (key, value) pairs of the partitions above the date partition, outermost first.
+        :param file_name:   The name of the file in each date partition, w/o its extension.
+        :param file_format: One of `EXPORT_FORMATS`.
+        :param timestamp:   If "local" or "utc", add a time zone aware "timestamp" column, see `TickBody.parse`.
+        :param compression: The compression codec, e.g. "zstd". Defaults to snappy for Parquet and lz4 for Feather.
+        :raises ImportError: If pyarrow is not installed.
+        """
+        assert file_format in EXPORT_FORMATS, f"file_format must be one of {list(EXPORT_FORMATS)}"
+        self._pa = _import_pyarrow()
+        self.path: str = path
+        self.partitions: List[Tuple[str, str]] = partitions
+        self.file_name: str = file_name
+        self.file_format: str = file_format
+        self.timestamp: Optional[str] = timestamp
+        self.compression: str = _DEFAULT_COMPRESSION[file_format] if compression is None else compression
+        self.paths: List[str] = []  # of the completed files, in the order they were written
+        self.rows: int = 0
+        self._writer = None
+        self._file: Optional[str] = None
+        self._date: Optional[int] = None
+
+    def __enter__(self) -> _PartitionWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, tbody: TickBody) -> None:
+        """Write a chunk of ticks, switching to the file of the next date where the date changes."""
+        ticks = tbody._trimmed()
+        if len(ticks) == 0:
+            return
+        assert DataType.DATE in tbody.format_tick, "Cannot partition ticks w/o a date column."
+        dates = ticks[:, tbody.format_tick.index(DataType.DATE)]
+        bounds = [0, *(np.flatnonzero(np.diff(dates)) + 1).tolist(), len(ticks)]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if dates[start] != self._date:
+                self.close()
+                self._open(int(dates[start]))
+            table = TickBody(tbody.format_tick, ticks[start:end])._to_output("arrow", self.timestamp, False)
+            table = table.drop_columns([_column_name(DataType.DATE)])  # in the path like the other partition keys
+            if self._writer is None:
+                self._writer = self._new_writer(table.schema)
+            self._writer.write_table(table)
+            self.rows += end - start
+
+    def _open(self, day: int) -> None:
+        """Start the file of a date."""
+        directory = os.path.join(self.path, *(f"{key}={value}" for key, value in self.partitions), f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        self._file = os.path.join(directory, self.file_name + EXPORT_FORMATS[self.file_format])
+        self._date = day
+
+    def _new_writer(self, schema):
+        tmp_file = f"{self._file}.tmp"
+        if self.file_format == "parquet":
+            return self._pa.parquet.ParquetWriter(tmp_file, schema, compression=self.compression)
+        options = self._pa.ipc.IpcWriteOptions(compression=self.compression)
+        return self._pa.ipc.new_file(tmp_file, schema, options=options)
+
+    def close(self) -> None:
+        """Complete the file of the current date, if any."""
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(f"{self._file}.tmp", self._file)
+            self.paths.append(self._file)
+        self._writer = None
+        self._file = None
+
+    def abort(self) -> None:
+        """Discard the partial file of the current date, if any. Files of completed dates are kept."""
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(f"{self._file}.tmp")
+        self._writer = None
+        self._file = None
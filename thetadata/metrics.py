@@ -0,0 +1,124 @@
+"""Module that contains per-request performance metrics of the ThetaClient."""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .enums import MessageType, OptionReqType, SecType, StockReqType
+
+# summarized by MetricsAggregator.summary, in this order
+_SUMMARY_FIELDS = ("latency", "ttfb", "recv_time", "mb_per_sec", "parse_time", "n_bytes", "rows")
+
+
+@dataclass
+class RequestMetrics:
+    """Timings of a single request, passed to the `metrics_hook` of a ThetaClient once its response is parsed.
+
+    Durations are in seconds. `ttfb` + `recv_time` + `parse_time` is the time the request took end to end.
+    """
+
+    request_type: str  # e.g. "HIST/OPTION/QUOTE", or "REST hist/option/quote"
+    request: str
+    sent_at: float  # unix time at which the request was sent
+    latency: Optional[float]  # as reported by the Terminal, None if unknown
+    ttfb: float  # time to first byte: from sending the request until its response header was received
+    recv_time: float  # from receiving the response header until the whole body was received
+    n_bytes: int  # of the response body
+    parse_time: float = 0.0
+    rows: int = 0
+    error: Optional[str] = None  # the name of the exception raised by the request, e.g. "NoData"
+
+    @property
+    def mb_per_sec(self) -> float:
+        """:return: The receive throughput of the response body in MB/s, or 0 if it was received instantly."""
+        return self.n_bytes / self.recv_time / 1e6 if self.recv_time > 0 else 0.0
+
+
+def request_type(msg: str) -> str:
+    """Name the type of a Terminal request by its message type, security type and request type.
+
+    :return: e.g. "HIST/OPTION/QUOTE" for a historical options quote request.
+    """
+    params = dict(param.split("=", 1) for param in msg.strip().split("&") if "=" in param)
+    parts = []
+    try:
+        parts.append(MessageType(int(params["MSG_CODE"])).name)
+    except (KeyError, ValueError):
+        parts.append(params.get("MSG_CODE", "UNKNOWN"))
+    if "sec" in params:
+        parts.append(params["sec"])
+    if "req" in params:
+        req_cls = StockReqType if params.get("sec") == SecType.STOCK.value else OptionReqType
+        try:
+            parts.append(req_cls(int(params["req"])).name)
+        except ValueError:
+            parts.append(params["req"])
+    return "/".join(parts)
+
+
+class MetricsAggregator:
+    """A thread-safe, in-process aggregator of request metrics, which can be passed as the `metrics_hook` of a
+    ThetaClient. The most recent `max_samples` requests of each request type are kept.
+    """
+
+    def __init__(self, max_samples: int = 10_000):
+        """Create an empty aggregator.
+
+        :param max_samples: The max number of requests kept per request type.
+        """
+        assert max_samples > 0, "max_samples must be positive"
+        self.max_samples: int = max_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[RequestMetrics]] = {}
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        """Record the metrics of a request."""
+        with self._lock:
+            samples = self._samples.get(metrics.request_type)
+            if samples is None:
+                samples = self._samples[metrics.request_type] = deque(maxlen=self.max_samples)
+            samples.append(metrics)
+
+    def samples(self, request_type: Optional[str] = None) -> list:
+        """:return: The recorded metrics of a request type, or of every request type if None, oldest first."""
+        with self._lock:
+            if request_type is not None:
+                return list(self._samples.get(request_type, ()))
+            return [metrics for samples in self._samples.values() for metrics in samples]
+
+    def summary(self, quantiles: Sequence[float] = (0.5, 0.99)) -> pd.DataFrame:
+        """Summarize the recorded metrics per request type.
+
+        :param quantiles: The quantiles to compute for each metric.
+        :return:          A DataFrame indexed by request type w/ the number of requests and errors, the total
+                          bytes received, and a column per metric and quantile, e.g. "ttfb_p50" and "ttfb_p99".
+                          Quantiles of the Terminal latency ignore requests w/o a reported latency.
+        """
+        with self._lock:
+            groups = {key: list(samples) for key, samples in self._samples.items()}
+        rows = {}
+        for key, samples in sorted(groups.items()):
+            row = {
+                "count": len(samples),
+                "errors": sum(metrics.error is not None for metrics in samples),
+                "total_bytes": sum(metrics.n_bytes for metrics in samples),
+            }
+            for field in _SUMMARY_FIELDS:
+                values = np.array(
+                    [getattr(metrics, field) for metrics in samples if getattr(metrics, field) is not None],
+                    dtype=np.float64,
+                )
+                for q in quantiles:
+                    row[f"{field}_p{q * 100:g}"] = np.quantile(values, q) if len(values) > 0 else np.nan
+            rows[key] = row
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def reset(self) -> None:
+        """Discard every recorded request."""
+        with self._lock:
+            self._samples.clear()
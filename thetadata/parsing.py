@@ -8,7 +8,7 @@ from urllib.request import urlopen
 
 import ijson
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 import requests
 from tqdm import tqdm
@@ -17,6 +17,7 @@ from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 from pandas import DataFrame, Series
+from . import codec
 from .exceptions import ResponseError, NoData, ResponseParseError, ReconnectingToServer
 from .enums import DataType, MessageType
 
@@ -59,27 +60,7 @@ class Header:
         assert (
             len(data) == 20
         ), f"Cannot parse header with {len(data)} bytes. Expected 20 bytes."
-        # avoid copying header data when slicing
-        data = memoryview(data)
-        """
-        Header format:
-            bytes | field
-                2 | message type
-                8 | id
-                2 | latency
-                2 | error
-                1 | reserved / special
-                1 | format length
-                4 | size
-        """
-        parse_int = lambda d: int.from_bytes(d, "big")
-        # parse
-        msgtype = MessageType.from_code(parse_int(data[:2]))
-        id = parse_int(data[2:10])
-        latency = parse_int(data[10:12])
-        error = parse_int(data[12:14])
-        format_len = data[15]
-        size = parse_int(data[16:20])
+        msgtype, id, latency, error, format_len, size = codec.decode_header(data)
         return cls(
             message_type=msgtype,
             id=id,
@@ -89,6 +70,12 @@ class Header:
             size=size,
         )
 
+    def to_bytes(self) -> bytes:
+        """Encode this header in the 20 byte binary format of the Terminal, see `codec.HEADER`."""
+        return codec.encode_header(
+            self.message_type, self.id, self.latency, self.error, self.format_len, self.size
+        )
+
 
 def parse_header_REST(response: requests.Response, header_string: str) -> dict:
     """Parse JSON header data into an object.
@@ -117,7 +104,7 @@ def _check_body_errors(header: Header, body_data: bytes):
                            helpful error message.
     """
     if header.message_type == MessageType.ERROR:
-        msg = body_data.decode("utf-8")
+        msg = bytes(body_data).decode("utf-8")
         if "no data" in msg.lower():
             raise NoData(msg)
         elif "disconnected" in msg.lower():
@@ -169,8 +156,179 @@ _pt_to_price_mul = [
     1000000000.0,
 ]
 
-# Vectorized function that maps price types to price multipliers
-_to_price_mul = np.vectorize(lambda pt: _pt_to_price_mul[pt], otypes=[float])
+# price multipliers indexed by price type
+_PRICE_MULTIPLIERS = np.array(_pt_to_price_mul, dtype=np.float64)
+
+# time zone of the exchanges that ms of day timestamps are relative to
+_EXCHANGE_TZ = "America/New_York"
+
+# narrowest dtypes of columns in compact mode, which are only applied if every value of the column fits
+_COMPACT_DTYPES = {
+    DataType.BID_EXCHANGE: np.uint8,
+    DataType.ASK_EXCHANGE: np.uint8,
+    DataType.BID_CONDITION: np.uint8,
+    DataType.ASK_CONDITION: np.uint8,
+    DataType.CONDITION: np.uint8,
+    DataType.CORRECTION: np.uint8,
+    DataType.BID_SIZE: np.uint32,
+    DataType.ASK_SIZE: np.uint32,
+    DataType.SIZE: np.uint32,
+    DataType.VOLUME: np.uint32,
+    DataType.COUNT: np.uint32,
+}
+
+# exclusive bound on the raw values of prices that keep all of their digits as float32: its 24 bit significand
+# holds every integer below this w/ a bit to spare for the rounding of the scaled, non binary price
+_FLOAT32_MAX_EXACT = 1 << 23
+
+# result formats that decoded ticks can be returned in
+OUTPUT_FORMATS = ("pandas", "numpy", "arrow", "polars")
+
+
+def _yyyymmdd_to_datetime64(dates) -> np.ndarray:
+    """Convert YYYYMMDD integer dates to datetime64 w/ integer arithmetic instead of string parsing.
+
+    Ticks arrive grouped by date, so only the first date of each run of equal dates is converted.
+
+    :param dates: an array-like of YYYYMMDD integers
+    :return: a datetime64[ns] array
+    :raises ResponseParseError: if a date has a month or day that does not exist, which the arithmetic would
+                                  otherwise silently roll over into another date
+    """
+    dates = np.asarray(dates)
+    if len(dates) == 0:
+        return np.empty(0, dtype="datetime64[ns]")
+    run_starts = np.concatenate(([0], np.flatnonzero(dates[1:] != dates[:-1]) + 1))
+    runs = dates[run_starts].astype(np.int64)
+    month_of_year = runs // 100 % 100
+    day_of_month = runs % 100
+    years = (runs // 10000 - 1970).astype("datetime64[Y]")
+    month_starts = years + (month_of_year - 1).astype("timedelta64[M]")
+    month_lengths = ((month_starts + 1).astype("datetime64[D]") - month_starts.astype("datetime64[D]")).astype(int)
+    invalid = (month_of_year < 1) | (month_of_year > 12) | (day_of_month < 1) | (day_of_month > month_lengths)
+    if invalid.any():
+        raise ResponseParseError(f"Invalid YYYYMMDD date {runs[invalid][0]} in the response.")
+    days = (day_of_month - 1).astype("timedelta64[D]")
+    converted = (month_starts.astype("datetime64[D]") + days).astype("datetime64[ns]")
+    return np.repeat(converted, np.diff(np.append(run_starts, len(dates))))
+
+
+def _build_timestamps(dates: np.ndarray, ms_of_day: np.ndarray, tz: str) -> pd.DatetimeIndex:
+    """Combine dates and ms of day (exchange time) into time zone aware timestamps.
+
+    :param dates: a datetime64 array of dates
+    :param ms_of_day: an integer array of milliseconds since midnight exchange time
+    :param tz: "local" for exchange time or "utc" for UTC
+    """
+    assert tz in ("local", "utc"), f"Expected timestamp to be 'local' or 'utc'. Got {tz}."
+    naive = dates.astype("datetime64[D]") + np.asarray(ms_of_day, dtype=np.int64).astype("timedelta64[ms]")
+    # ambiguous ticks during the DST fall back hour are treated as daylight time
+    local = pd.DatetimeIndex(naive.astype("datetime64[ns]")).tz_localize(
+        _EXCHANGE_TZ, ambiguous=True, nonexistent="shift_forward"
+    )
+    return local if tz == "local" else local.tz_convert("UTC")
+
+
+def _fits(raw: np.ndarray, dtype) -> bool:
+    """:return: True if every value of `raw` can be represented by the integer `dtype`."""
+    if len(raw) == 0:
+        return True
+    info = np.iinfo(dtype)
+    return info.min <= raw.min() and raw.max() <= info.max
+
+
+def _fits_float32(raw: np.ndarray) -> bool:
+    """:return: True if prices w/ the raw integer values `raw` keep all of their digits as float32."""
+    return len(raw) == 0 or max(-int(raw.min()), int(raw.max())) < _FLOAT32_MAX_EXACT
+
+
+def _with_bytes_saved(result, bytes_saved: int):
+    """Attach the number of bytes saved by compact mode to a result that can carry metadata.
+
+    pandas DataFrames report it in `attrs` and pyarrow Tables in their schema metadata, under the
+    "compact_bytes_saved" key. numpy structured arrays and polars DataFrames have nowhere to put it.
+    """
+    if isinstance(result, pd.DataFrame):
+        result.attrs["compact_bytes_saved"] = bytes_saved
+    elif hasattr(result, "replace_schema_metadata"):
+        result = result.replace_schema_metadata({"compact_bytes_saved": str(bytes_saved)})
+    return result
+
+
+def _import_optional(module: str, output: str):
+    """Import an optional dependency needed by an output format.
+
+    :raises ImportError: w/ installation instructions if the module is not installed
+    """
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise ImportError(
+            f"output='{output}' requires {module}, which is not installed. "
+            f"Install it w/ `pip install thetadata[{output}]`."
+        ) from e
+
+
+def _column_name(col) -> str:
+    """:return: The name of a decoded column outside of pandas, which are the lower case REST format names."""
+    return col.name.lower() if isinstance(col, DataType) else str(col)
+
+
+def _to_numpy(columns: dict) -> np.ndarray:
+    """Pack decoded columns into a numpy structured array w/ one field per column.
+
+    numpy has no time zone aware dtype, so timestamps are stored as naive datetime64 in their own time zone.
+    """
+    values = [
+        col.tz_localize(None).to_numpy() if isinstance(col, pd.DatetimeIndex) else col for col in columns.values()
+    ]
+    n_rows = len(values[0]) if values else 0
+    arr = np.empty(n_rows, dtype=[(_column_name(name), value.dtype) for name, value in zip(columns, values)])
+    for name, value in zip(columns, values):
+        arr[_column_name(name)] = value
+    return arr
+
+
+def _to_arrow(columns: dict):
+    """Build a pyarrow Table from decoded columns. Timestamps keep their time zone."""
+    pa = _import_optional("pyarrow", "arrow")
+    arrays = {}
+    for name, col in columns.items():
+        if isinstance(col, pd.DatetimeIndex):
+            utc_ns = col.tz_convert("UTC").tz_localize(None).to_numpy().view(np.int64)
+            col = pa.array(utc_ns, type=pa.timestamp("ns", tz=str(col.tz)))
+        arrays[_column_name(name)] = col
+    return pa.table(arrays)
+
+
+def _to_polars(columns: dict):
+    """Build a polars DataFrame from decoded columns. Timestamps keep their time zone."""
+    pl = _import_optional("polars", "polars")
+    series = []
+    for name, col in columns.items():
+        if isinstance(col, pd.DatetimeIndex):
+            utc = pl.Series(_column_name(name), col.tz_convert("UTC").tz_localize(None).to_numpy())
+            series.append(utc.dt.replace_time_zone("UTC").dt.convert_time_zone(str(col.tz)))
+        else:
+            series.append(pl.Series(_column_name(name), col))
+    return pl.DataFrame(series)
+
+
+def _output_converter(output: str) -> Callable[[dict], object]:
+    """Get the function that builds a result in the requested format from decoded columns.
+
+    This is called before a response is parsed so that a bad format or missing dependency fails fast.
+
+    :param output: one of `OUTPUT_FORMATS`
+    :raises ImportError: if the dependency of the output format is not installed
+    """
+    assert output in OUTPUT_FORMATS, f"Expected output to be one of {OUTPUT_FORMATS}. Got {output}."
+    if output == "pandas":
+        return lambda columns: pd.DataFrame(columns, copy=False)
+    if output == "numpy":
+        return _to_numpy
+    _import_optional("pyarrow" if output == "arrow" else "polars", output)
+    return _to_arrow if output == "arrow" else _to_polars
 
 
 class TickBody:
@@ -182,116 +340,233 @@ class TickBody:
         ), "Cannot initialize body bc ticks is not a DataFrame"
         self.format_tick: list[DataType] = format_tick
         self.body_ticks: np.ndarray = body_ticks
+        self.bytes_saved: int = 0  # by the last decode in compact mode
 
     @classmethod
-    def parse(cls, request: str, header: Header, data: bytearray) -> DataFrame:
+    def parse(
+        cls,
+        request: str,
+        header: Header,
+        data: bytes,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ) -> DataFrame:
         """Efficiently parse binary tick data.
 
         :param request: the request that returned the body data
         :param header: parsed header data
         :param data: the binary response body
-        :return: a processed pandas dataframe
+        :param timestamp: if "local" or "utc", add a time zone aware timestamp column combining the date and
+                          ms of day of each tick in exchange time or UTC respectively
+        :param output: the result format, one of `OUTPUT_FORMATS`
+        :param compact: if True, downcast columns to the narrowest dtype that holds their values, see `_decode`
+        :return: a processed pandas dataframe, or the result in the requested output format
+        :raises ResponseParseError: if parsing failed
+        :raises ImportError: if the dependency of the output format is not installed
+        """
+        _output_converter(output)
+        tbody = cls.from_response(request, header, data)
+        try:
+            return tbody._to_output(output, timestamp, compact)
+        except Exception as e:
+            raise ResponseParseError(
+                f"Failed to parse body for request: {request}. Please send this error to support."
+            ) from e
+
+    @classmethod
+    def from_response(cls, request: str, header: Header, data: bytes) -> TickBody:
+        """Parse binary tick data w/o post-processing it into a DataFrame.
+
+        :param request: the request that returned the body data
+        :param header: parsed header data
+        :param data: the binary response body
         :raises ResponseParseError: if parsing failed
         """
         assert isinstance(
-            data, bytearray
-        ), f"Expected data to be bytearray type. Got {type(data)}"
+            data, (bytes, bytearray, memoryview)
+        ), f"Expected data to be a bytes-like type. Got {type(data)}"
         _check_body_errors(header, data)
         try:
-            tbody = cls._parse(header, data)
-            df = tbody._to_dataframe()
-            return df
+            return cls._parse(header, data)
         except Exception as e:
             raise ResponseParseError(
                 f"Failed to parse body for request: {request}. Please send this error to support."
             ) from e
 
+    @classmethod
+    def concat(cls, bodies: list[TickBody]) -> TickBody:
+        """Concatenate tick bodies that share a format tick w/ a single copy of their ticks.
+
+        The trailing null tick of each body is dropped, so it does not end up in the middle of the result.
+        """
+        assert len(bodies) > 0, "Cannot concatenate zero tick bodies."
+        format_tick = bodies[0].format_tick
+        for body in bodies:
+            assert body.format_tick == format_tick, "Cannot concatenate tick bodies w/ different formats."
+        return cls(format_tick=format_tick, body_ticks=np.concatenate([body._trimmed() for body in bodies]))
+
+    def to_response(self, message_type: MessageType = MessageType.HIST) -> tuple[Header, bytes]:
+        """Encode this tick data as a binary Terminal response, the inverse of `from_response`.
+
+        :return: The response header and body, which ends w/ a null tick like the responses of the Terminal.
+        """
+        body = codec.encode_ticks(self.format_tick, self._trimmed())
+        header = Header(
+            message_type=message_type, id=0, latency=0, error=0, format_len=len(self.format_tick), size=len(body)
+        )
+        return header, body
+
+    def _trimmed(self) -> np.ndarray:
+        """:return: The body ticks w/o the trailing null tick if it exists."""
+        if len(self.body_ticks) > 0 and not self.body_ticks[-1].any():
+            return self.body_ticks[:-1]
+        return self.body_ticks
+
     @classmethod
     def _parse(cls, header: Header, data: bytearray) -> TickBody:
         assert (
             len(data) == header.size
         ), f"Cannot parse body with {len(data)} bytes. Expected {header.size} bytes."
-        n_cols = header.format_len
-        n_ticks = int(header.size / (header.format_len * 4))
-
-        # parse format tick
-        format: list[DataType] = []
-        for ci in range(n_cols):
-            int_ = int.from_bytes(data[ci * 4 : ci * 4 + 4], "big")
-            format.append(DataType.from_code(int_))
-
-        # parse the rest of the ticks
-        # 4 byte integers w/ big endian order
-        dtype = np.dtype("int32").newbyteorder(">")
-        ticks = (
-            np.frombuffer(data, dtype=dtype, offset=(header.format_len * 4))
-            .reshape((n_ticks - 1), n_cols)
-            .byteswap()  # force native byte order
-            .newbyteorder()  # ^^
-        )
-
+        format = cls._parse_format(header, data)
+        ticks = cls._parse_ticks(memoryview(data)[header.format_len * 4:], header.format_len)
         return cls(format_tick=format, body_ticks=ticks)
 
-    def _to_dataframe(self) -> DataFrame:
-        """Load this tick data into a pandas DataFrame and post process.
+    @classmethod
+    def _parse_format(cls, header: Header, data: bytes) -> list[DataType]:
+        """Parse the format tick, which IDs the data in each column of the body ticks.
 
-        Post-processing modifies the columns of data w/ various quality-of-life
-        improvements.
+        :param header: parsed header data
+        :param data: binary data starting with the format tick
         """
-        # load ticks into DataFrame
-        df = pd.DataFrame(
-            self.body_ticks, columns=self.format_tick, copy=False
-        )
-        self._post_process(df)
-        return df
+        return codec.decode_format(data, header.format_len)
 
-    @classmethod
-    def _post_process(cls, df: DataFrame) -> None:
-        """Modify tick data w/ various quality-of-life improvements.
+    @staticmethod
+    def _parse_ticks(data: bytes, n_cols: int) -> np.ndarray:
+        """Parse binary body ticks that follow the format tick.
 
-        :param df: The DataFrame to modify in-place.
+        :param data: binary data containing a whole number of ticks
+        :param n_cols: the number of columns in each tick
         """
-        # remove trailing null tick if it exists
-        last_row = df.tail(1)
-        zeroes = last_row.squeeze() == 0
-        if zeroes.all():
-            # print(f"Dropping {last_row=}")
-            df.drop(last_row.index, inplace=True)
+        return codec.decode_ticks(data, n_cols)
 
-        if DataType.PRICE_TYPE in df.columns:
-            # replace price type column with price multipliers
+    def _to_dataframe(self, timestamp: Optional[str] = None, compact: bool = False) -> DataFrame:
+        """Load this tick data into a pandas DataFrame.
 
-            df[DataType.PRICE_TYPE] = _to_price_mul(df[DataType.PRICE_TYPE])
+        The columns are decoded w/ various quality-of-life improvements, see `_decode`.
+        """
+        return self._to_output("pandas", timestamp, compact)
+
+    def _to_output(self, output: str = "pandas", timestamp: Optional[str] = None, compact: bool = False):
+        """Load this tick data into the requested output format, see `OUTPUT_FORMATS`.
 
-            # multiply prices by price multipliers
-            for col in df.columns:
-                if col.is_price():
-                    df[col] *= df[DataType.PRICE_TYPE]
+        Every format is built from the same decoded columns w/o a pandas round-trip.
+        """
+        result = _output_converter(output)(self._decode(timestamp, compact))
+        return _with_bytes_saved(result, self.bytes_saved) if compact else result
 
-            # remove price type column
-            del df[DataType.PRICE_TYPE]
+    def _decode(self, timestamp: Optional[str] = None, compact: bool = False) -> dict:
+        """Decode the body ticks into columns in a single pass over the raw int32 block.
 
-        # convert date ints to datetime
-        if DataType.DATE in df.columns:
-            df[DataType.DATE] = pd.to_datetime(
-                df[DataType.DATE], format="%Y%m%d"
-            )
+        The trailing null tick is dropped, prices are scaled by the multiplier of their price type and
+        returned as float64, the price type column is removed and dates are converted to datetime.
 
+        In compact mode, exchange and condition codes become uint8 and sizes uint32 if all of their values fit,
+        and prices become float32 if their raw values are small enough to keep all of their digits. The number
+        of bytes saved is stored in `bytes_saved`.
 
-def parse_flexible_REST(response: requests.Response) -> pd.DataFrame:
+        :param timestamp: if "local" or "utc", prepend a "timestamp" column built from the date and ms of day
+                          columns in exchange time or UTC respectively
+        :param compact: if True, downcast columns to the narrowest dtype that holds their values
+        :return: The decoded columns keyed by DataType, in the order of the format tick.
+        """
+        ticks = self._trimmed()
+        self.bytes_saved = 0
+
+        # look up the multiplier of every tick in a table instead of calling into python per tick
+        price_mul = None
+        if DataType.PRICE_TYPE in self.format_tick:
+            price_types = ticks[:, self.format_tick.index(DataType.PRICE_TYPE)]
+            price_mul = np.take(_PRICE_MULTIPLIERS, price_types)
+
+        columns = {}
+        for i, col in enumerate(self.format_tick):
+            if col == DataType.PRICE_TYPE:
+                continue
+            raw = ticks[:, i]
+            if price_mul is not None and col.is_price():
+                columns[col] = np.multiply(raw, price_mul, dtype=np.float64)
+                if compact and _fits_float32(raw):
+                    columns[col] = columns[col].astype(np.float32)
+                    self.bytes_saved += columns[col].nbytes
+            elif col == DataType.DATE:
+                columns[col] = _yyyymmdd_to_datetime64(raw)
+            elif compact and col in _COMPACT_DTYPES and _fits(raw, _COMPACT_DTYPES[col]):
+                columns[col] = raw.astype(_COMPACT_DTYPES[col])
+                self.bytes_saved += raw.nbytes - columns[col].nbytes
+            else:
+                columns[col] = raw
+
+        if timestamp is not None and DataType.DATE in columns and DataType.MS_OF_DAY in columns:
+            ts = _build_timestamps(columns[DataType.DATE], columns[DataType.MS_OF_DAY], timestamp)
+            columns = {"timestamp": ts, **columns}
+        return columns
+
+
+def decode_raw(
+    body: bytes,
+    header: Optional[Header] = None,
+    timestamp: Optional[str] = None,
+    output: str = "pandas",
+    compact: bool = False,
+) -> DataFrame:
+    """Decode a tick body returned by a `raw=True` request of the ThetaClient, e.g. after it was archived.
+
+    :param body: the binary tick body, or the 20 byte header followed by the body if `header` is None, which is
+                 how `Header.to_bytes` + body and the files of a HistCache store a response
+    :param header: the response header of `body`
+    :param timestamp: see `TickBody.parse`
+    :param output: see `TickBody.parse`
+    :param compact: see `TickBody.parse`
+    :return: a processed pandas dataframe, or the result in the requested output format
+    :raises ResponseParseError: if parsing failed
+    """
+    if header is None:
+        view = memoryview(body)
+        header, body = Header.parse("raw response", view[:20]), view[20:]
+    return TickBody.parse("raw response", header, body, timestamp, output, compact)
+
+
+def raw_n_rows(header: Header) -> int:
+    """:return: the number of ticks in a raw tick body w/o decoding it, excluding the format and null ticks"""
+    if header.format_len == 0:
+        return 0
+    return max(header.size // (codec.TICK_DTYPE.itemsize * header.format_len) - 2, 0)
+
+
+def parse_flexible_REST(response: requests.Response, output: str = "pandas") -> pd.DataFrame:
     """
     Flexible parsing function that uses a python dictionary as an intermediary
     between json string and pandas dataframe.
+
+    :param output: the result format, one of `OUTPUT_FORMATS`. Formats other than pandas are built from
+                   numpy columns w/o going through pandas.
     """
+    convert = _output_converter(output)
     response_dict = response.json()
     _check_header_errors_REST(response_dict["header"])
     cols = [DataType.from_string(name=col) for col in response_dict['header']['format']]
     rows = response_dict['response']
+    if output != "pandas":
+        columns = {col: np.asarray(values) for col, values in zip(cols, zip(*rows))}
+        if len(rows) == 0:
+            columns = {col: np.empty(0, dtype=np.int64) for col in cols}
+        if DataType.DATE in columns:
+            columns[DataType.DATE] = _yyyymmdd_to_datetime64(columns[DataType.DATE])
+        return convert(columns)
     df = pd.DataFrame(rows, columns=cols)
     if DataType.DATE in df.columns:
-        df[DataType.DATE] = pd.to_datetime(
-            df[DataType.DATE], format="%Y%m%d"
-        )
+        df[DataType.DATE] = _yyyymmdd_to_datetime64(df[DataType.DATE])
     try:
         return df
     except Exception as e:
@@ -311,9 +586,7 @@ def parse_hist_REST(response: requests.Response) -> pd.DataFrame:
     rows = pd.read_json(resp_split[1][:-1], orient="table")
     df = pd.DataFrame(rows, columns=cols)
     if DataType.DATE in df.columns:
-        df[DataType.DATE] = pd.to_datetime(
-            df[DataType.DATE], format="%Y%m%d"
-        )
+        df[DataType.DATE] = _yyyymmdd_to_datetime64(df[DataType.DATE])
     url = response.history[0].url if response.history else response.url
     try:
         return df
@@ -352,9 +625,7 @@ def parse_hist_REST_stream_ijson(url, params) -> pd.DataFrame:
             df = pd.DataFrame(columns=cols)
             
     if DataType.DATE in df.columns:
-        df[DataType.DATE] = pd.to_datetime(
-            df[DataType.DATE], format="%Y%m%d"
-        )
+        df[DataType.DATE] = _yyyymmdd_to_datetime64(df[DataType.DATE])
     try:
         return df
     except Exception as e:
@@ -415,10 +686,11 @@ class ListBody:
         ), f"Cannot parse body with {len(data)} bytes. Expected {header.size} bytes."
 
         lst = data.decode("ascii").split(",")
-        lst = pd.Series(lst, copy=False)
 
         if dates:
-            lst = pd.to_datetime(lst, format="%Y%m%d")
+            lst = pd.Series(_yyyymmdd_to_datetime64(np.array(lst, dtype=np.int64)), copy=False)
+        else:
+            lst = pd.Series(lst, copy=False)
 
         return cls(lst=lst)
 
@@ -436,7 +708,7 @@ def parse_list_REST(response: requests.Response, dates: bool = False) -> pd.Seri
     try:
         df = pd.Series(df['response'], copy=False)
         if dates:
-            df = pd.to_datetime(df, format="%Y%m%d")
+            df = pd.Series(_yyyymmdd_to_datetime64(df), copy=False)
         return df
     except Exception as e:
         raise ResponseParseError(
@@ -0,0 +1,151 @@
+"""Module that contains an executor that overlaps receiving Terminal responses w/ parsing them."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+
+from .client import _NOT_CONNECTED_MSG, ThetaClient, _hist_option_msg, _hist_stock_msg
+from .parsing import Header, TickBody
+
+
+class PrefetchExecutor:
+    """Runs sequential scans of historical requests w/ the response of the next request received in the
+    background while the current one is parsed.
+
+    A background thread sends each request over a pooled connection and receives its body into one of two
+    reusable buffers, while the calling thread parses the body in the other buffer. A scan therefore takes about
+    max(network time, parse time) instead of their sum. Parsing copies the ticks out of a buffer, so results never
+    reference a buffer after it is reused. An executor runs one scan at a time.
+    """
+
+    def __init__(self, client: ThetaClient, timestamp: Optional[str] = None, output: str = "pandas",
+                 compact: bool = False):
+        """Create an executor.
+
+        :param client:    The connected client to send requests w/.
+        :param timestamp: If "local" or "utc", add a time zone aware "timestamp" column, see `TickBody.parse`.
+        :param output:    The result format, see `OUTPUT_FORMATS`.
+        :param compact:   If True, downcast columns to the narrowest dtype that holds their values.
+        """
+        self.client: ThetaClient = client
+        self.timestamp: Optional[str] = timestamp
+        self.output: str = output
+        self.compact: bool = compact
+        self.requests: int = 0
+        self.recv_time: float = 0.0  # spent sending requests and receiving their responses in the background
+        self.wait_time: float = 0.0  # spent by the calling thread waiting for a response to be received
+        self.parse_time: float = 0.0
+        self._buffers: List[bytearray] = [bytearray(), bytearray()]
+
+    def hist_option(self, reqs: Iterable[dict], return_exceptions: bool = False) -> Iterator:
+        """Get historical options data for many requests, one after another.
+
+        :param reqs:              The requests, each a dict of keyword arguments accepted by `_hist_option_msg`,
+                                     i.e. those of `ThetaClient.get_hist_option` up to `use_rth`.
+        :param return_exceptions: If true, a request that failed has its exception yielded in place of a
+                                     DataFrame. If false, the exception is raised.
+        :return:                  A generator of the requested data, in the order of `reqs`.
+        """
+        return self.map([_hist_option_msg(**kwargs) for kwargs in reqs], return_exceptions)
+
+    def hist_stock(self, reqs: Iterable[dict], return_exceptions: bool = False) -> Iterator:
+        """Get historical stock data for many requests, one after another.
+
+        :param reqs:              The requests, each a dict of keyword arguments accepted by `_hist_stock_msg`,
+                                     i.e. those of `ThetaClient.get_hist_stock` up to `use_rth`.
+        :param return_exceptions: If true, a request that failed has its exception yielded in place of a
+                                     DataFrame. If false, the exception is raised.
+        :return:                  A generator of the requested data, in the order of `reqs`.
+        """
+        return self.map([_hist_stock_msg(**kwargs) for kwargs in reqs], return_exceptions)
+
+    def map(self, msgs: Iterable[str], return_exceptions: bool = False) -> Iterator:
+        """Send Terminal requests one after another and parse their tick responses, receiving each response
+        while the previous one is parsed.
+
+        If the generator is closed early, the response being received is read in full before the connection is
+        returned to the pool, so the connection stays usable.
+
+        :param msgs:              The Terminal messages of the requests.
+        :param return_exceptions: If true, a request that failed has its exception yielded in place of a
+                                     DataFrame. If false, the exception is raised.
+        :return:                  A generator of the parsed responses, in the order of `msgs`.
+        :raises ResponseError:    If a request failed.
+        :raises NoData:           If there is no data available for a request.
+        """
+        assert self.client._server is not None, _NOT_CONNECTED_MSG
+        msgs = list(msgs)
+        received: queue.Queue = queue.Queue()
+        free = threading.Semaphore(len(self._buffers))
+        stop = threading.Event()
+        receiver = threading.Thread(target=self._receive, args=(msgs, received, free, stop), daemon=True)
+        receiver.start()
+        try:
+            for msg in msgs:
+                start = time.perf_counter()
+                item = received.get()
+                self.wait_time += time.perf_counter() - start
+                if isinstance(item, BaseException):
+                    raise item  # the connection failed
+                header, view = item
+                start = time.perf_counter()
+                try:
+                    result = TickBody.parse(msg, header, view, self.timestamp, self.output, self.compact)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    result = e
+                finally:
+                    view.release()
+                    free.release()
+                    self.parse_time += time.perf_counter() - start
+                    self.requests += 1
+                yield result
+        finally:
+            stop.set()
+            free.release()  # in case the receiver is waiting for a buffer
+            receiver.join()
+
+    def _receive(self, msgs: List[str], received: queue.Queue, free: threading.Semaphore,
+                 stop: threading.Event) -> None:
+        """Send each request once a buffer is free and pass its header and a view of its body to the caller."""
+        client = self.client
+        try:
+            with client._checkout() as sock:
+                for i, msg in enumerate(msgs):
+                    free.acquire()
+                    if stop.is_set():
+                        return
+                    start = time.perf_counter()
+                    sock.sendall(msg.encode("utf-8"))
+                    header = Header.parse(msg, client._recv(20, sock=sock))
+                    buffer = self._buffers[i % len(self._buffers)]
+                    if len(buffer) < header.size:
+                        # replaced rather than resized, since views of the buffer may still exist
+                        buffer = self._buffers[i % len(self._buffers)] = bytearray(header.size)
+                    client._recv_into(memoryview(buffer)[:header.size], sock=sock)
+                    self.recv_time += time.perf_counter() - start
+                    received.put((header, memoryview(buffer)[:header.size]))
+        except BaseException as e:
+            received.put(e)
+
+    @property
+    def hidden_time(self) -> float:
+        """:return: The number of seconds of parsing that were hidden behind receiving, i.e. saved compared to
+                    sending each request only after the previous response was parsed.
+        """
+        return max(min(self.recv_time - self.wait_time, self.parse_time), 0.0)
+
+    def stats(self) -> dict:
+        """:return: The number of requests parsed, the seconds spent receiving, waiting for and parsing responses,
+                    and the seconds of parsing hidden behind receiving.
+        """
+        return {
+            "requests": self.requests,
+            "recv_time": self.recv_time,
+            "wait_time": self.wait_time,
+            "parse_time": self.parse_time,
+            "hidden_time": self.hidden_time,
+        }
@@ -0,0 +1,580 @@
+"""Module that contains a pure-Python simulator of the Theta Terminal for load and integration testing.
+
+The simulator serves synthetic data over the binary hist protocol, the REST API and the stream protocol, so a
+ThetaClient can be exercised w/o a Java Terminal, a subscription or a network. Run it as a process w/
+`python -m thetadata.simulator`, or in-process:
+
+    with TerminalSimulator() as sim:
+        client = ThetaClient(port=sim.port, streaming_port=sim.stream_port, launch=False)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import socket
+import socketserver
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+
+from . import calendar, codec
+from .enums import DataType, MessageType, OptionReqType, SecType, StockReqType, StreamMsgType, StreamResponseType
+from .parsing import _PRICE_MULTIPLIERS
+
+_NO_DATA_MSG = "No data for the specified timeframe & contract."
+_DISCONNECTED_MSG = "Disconnected from Theta Data. Reconnecting..."
+_PRICE_TYPE = 8  # prices are generated in cents
+_PING_INTERVAL = 1.0  # seconds between stream pings, well below the 10 second timeout of the client
+
+_QUOTE_FORMAT = [
+    DataType.MS_OF_DAY, DataType.BID_SIZE, DataType.BID_EXCHANGE, DataType.BID, DataType.BID_CONDITION,
+    DataType.ASK_SIZE, DataType.ASK_EXCHANGE, DataType.ASK, DataType.ASK_CONDITION, DataType.PRICE_TYPE,
+    DataType.DATE,
+]
+_TRADE_FORMAT = [
+    DataType.MS_OF_DAY, DataType.SEQUENCE, DataType.SIZE, DataType.CONDITION, DataType.PRICE,
+    DataType.PRICE_TYPE, DataType.DATE,
+]
+_OHLC_FORMAT = [
+    DataType.MS_OF_DAY, DataType.OPEN, DataType.HIGH, DataType.LOW, DataType.CLOSE, DataType.VOLUME,
+    DataType.COUNT, DataType.PRICE_TYPE, DataType.DATE,
+]
+_EOD_FORMAT = [
+    DataType.MS_OF_DAY, DataType.MS_OF_DAY2, DataType.OPEN, DataType.HIGH, DataType.LOW, DataType.CLOSE,
+    DataType.VOLUME, DataType.COUNT, DataType.BID, DataType.ASK, DataType.PRICE_TYPE, DataType.DATE,
+]
+_OPEN_INTEREST_FORMAT = [DataType.MS_OF_DAY, DataType.OPEN_INTEREST, DataType.DATE]
+
+# request type name -> format tick, request types that are not listed are served as quotes
+_FORMATS = {
+    "EOD": _EOD_FORMAT,
+    "QUOTE": _QUOTE_FORMAT,
+    "TRADE": _TRADE_FORMAT,
+    "OHLC": _OHLC_FORMAT,
+    "OPEN_INTEREST": _OPEN_INTEREST_FORMAT,
+}
+
+
+def _yyyymmdd(dt: date) -> int:
+    """:return: A date in the YYYYMMDD integer format of the Terminal."""
+    return dt.year * 10000 + dt.month * 100 + dt.day
+
+
+class DataGenerator:
+    """Generates the synthetic data served by a TerminalSimulator.
+
+    Ticks follow a random walk around a price derived from the root. The same request always returns the same
+    data, so responses can be compared across runs and caches. Subclass it and override `ticks` or `list` to
+    serve other data.
+    """
+
+    def __init__(self, rows_per_day: int = 1_000, roots: Tuple[str, ...] = ("AAPL", "MSFT", "SPY"),
+                 first_date: date = date(2020, 1, 1), seed: int = 0):
+        """Create a generator.
+
+        :param rows_per_day: The number of ticks per trading day of tick level requests. Interval requests return
+                             one tick per interval instead.
+        :param roots:        The roots that are listed.
+        :param first_date:   The first date w/ data.
+        :param seed:         Seeds the generated data.
+        """
+        assert rows_per_day > 0, "rows_per_day must be positive"
+        self.rows_per_day: int = rows_per_day
+        self.roots: Tuple[str, ...] = roots
+        self.first_date: date = first_date
+        self.seed: int = seed
+
+    def trading_days(self, start: date, end: date) -> List[date]:
+        """:return: The days between `start` and `end` w/ data, which are the trading days from `first_date` on."""
+        return calendar.trading_days(max(start, self.first_date), end)
+
+    def _rng(self, params: Dict[str, str]) -> np.random.Generator:
+        """:return: A random generator seeded by the request, so identical requests get identical data."""
+        key = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if k not in ("MSG_CODE", "id"))
+        return np.random.default_rng([self.seed, zlib.crc32(key.lower().encode("utf-8"))])
+
+    def _base_price(self, params: Dict[str, str]) -> int:
+        """:return: The price in cents around which the ticks of a request are generated."""
+        if params.get("sec", SecType.STOCK.value) == SecType.OPTION.value:
+            return 100 + zlib.crc32(params.get("strike", "0").encode("ascii")) % 2_000
+        return 5_000 + zlib.crc32(params.get("root", "").upper().encode("ascii")) % 45_000
+
+    def ticks(self, msg_type: MessageType, params: Dict[str, str]) -> Optional[Tuple[List[DataType], np.ndarray]]:
+        """Generate the ticks of a HIST, AT_TIME or LAST request.
+
+        :param msg_type: The type of the request.
+        :param params:   The parameters of the request, named like in the binary protocol.
+        :return:         The format tick and the ticks, or None if there is no data.
+        """
+        req = params.get("req_name", "QUOTE")
+        format_tick = _FORMATS.get(req, _QUOTE_FORMAT)
+        if msg_type == MessageType.LAST:
+            days = [date.today()]
+        else:
+            days = self.trading_days(codec.to_date(int(params["START_DATE"])), codec.to_date(int(params["END_DATE"])))
+        if len(days) == 0:
+            return None
+
+        ivl = int(params.get("IVL", 0))
+        session_ms = calendar.CLOSE_MS - calendar.OPEN_MS
+        # the tick times of a full session, which are compressed into the shorter session of early closes
+        offsets = np.sort(np.random.default_rng(self.seed).integers(0, session_ms, self.rows_per_day))
+        day_ms = []
+        for day in days:
+            close_ms = calendar.close_ms(day)
+            if msg_type == MessageType.AT_TIME:
+                day_ms.append(np.array([ivl]))
+            elif msg_type == MessageType.LAST or req == "EOD":
+                day_ms.append(np.array([close_ms]))
+            elif ivl > 0:
+                day_ms.append(np.arange(calendar.OPEN_MS, close_ms, ivl))
+            else:
+                day_ms.append(calendar.OPEN_MS + offsets * (close_ms - calendar.OPEN_MS) // session_ms)
+        ms_of_day = np.concatenate(day_ms)
+        n_rows = len(ms_of_day)
+
+        rng = self._rng(params)
+        steps = rng.integers(-2, 3, n_rows)
+        price = np.maximum(self._base_price(params) + np.cumsum(steps), 1)
+        columns = {
+            DataType.DATE: np.repeat([_yyyymmdd(day) for day in days], [len(ms) for ms in day_ms]),
+            DataType.MS_OF_DAY: ms_of_day,
+            DataType.MS_OF_DAY2: ms_of_day,
+            DataType.PRICE_TYPE: np.full(n_rows, _PRICE_TYPE),
+            DataType.PRICE: price,
+            DataType.BID: np.maximum(price - 1, 0),
+            DataType.ASK: price + 1,
+            DataType.OPEN: price,
+            DataType.HIGH: price + rng.integers(0, 5, n_rows),
+            DataType.LOW: np.maximum(price - rng.integers(0, 5, n_rows), 0),
+            DataType.CLOSE: price,
+            DataType.SEQUENCE: np.arange(n_rows),
+            DataType.OPEN_INTEREST: rng.integers(0, 100_000, n_rows),
+        }
+        ticks = np.empty((n_rows, len(format_tick)), dtype=np.int32)
+        for i, col in enumerate(format_tick):
+            ticks[:, i] = columns[col] if col in columns else rng.integers(0, 20 if "EXCHANGE" in col.name
+                                                                          or "CONDITION" in col.name else 1_000,
+                                                                          n_rows)
+        return format_tick, ticks
+
+    def list(self, msg_type: MessageType, params: Dict[str, str]) -> list:
+        """Generate the list of a roots, expirations, strikes or dates request.
+
+        :param msg_type: The type of the request.
+        :param params:   The parameters of the request, named like in the binary protocol.
+        :return:         The roots, or the expirations, strikes in 1/10th of a cent or dates as integers.
+        """
+        if msg_type == MessageType.ALL_ROOTS:
+            return list(self.roots)
+        if msg_type == MessageType.ALL_EXPIRATIONS:
+            # every Friday from the first date through the end of next year
+            first_friday = self.first_date + timedelta(days=(4 - self.first_date.weekday()) % 7)
+            last = date(date.today().year + 1, 12, 31)
+            return [_yyyymmdd(first_friday + timedelta(weeks=i)) for i in range((last - first_friday).days // 7 + 1)]
+        if msg_type == MessageType.ALL_STRIKES:
+            base = self._base_price(dict(params, sec=SecType.STOCK.value)) // 100
+            return [strike * 1000 for strike in range(max(base // 2 // 5, 1) * 5, base * 3 // 2, 5)]
+        # dates, which end at the expiration of options
+        end = date.today() - timedelta(days=1)
+        if "exp" in params:
+            end = min(end, codec.to_date(int(params["exp"])))
+        return [_yyyymmdd(day) for day in self.trading_days(self.first_date, end)]
+
+
+class TerminalSimulator:
+    """A simulated Theta Terminal that serves a DataGenerator over the hist, REST and stream protocols.
+
+    Latency is added before every response, and errors can be injected at random: "no data" and "disconnected"
+    error responses, and connections that drop in the middle of a response. The random draws are seeded.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, stream_port: int = 0, rest_port: int = 0,
+                 generator: Optional[DataGenerator] = None, latency: float = 0.0, jitter: float = 0.0,
+                 no_data_rate: float = 0.0, disconnect_rate: float = 0.0, drop_rate: float = 0.0,
+                 stream_rate: float = 100.0, seed: int = 0):
+        """Create a simulator. Call `start` or use it as a context manager to serve requests.
+
+        :param host:            The host to listen on.
+        :param port:            The port of the hist protocol, or 0 for any free port.
+        :param stream_port:     The port of the stream protocol, or 0 for any free port.
+        :param rest_port:       The port of the REST API, or 0 for any free port.
+        :param generator:       Generates the served data. Defaults to a DataGenerator w/ default settings.
+        :param latency:         The number of seconds to wait before each response.
+        :param jitter:          The max number of seconds randomly added to `latency`.
+        :param no_data_rate:    The fraction of requests that get a "no data" error.
+        :param disconnect_rate: The fraction of requests that get a "disconnected" error.
+        :param drop_rate:       The fraction of hist protocol responses after half of which the connection is closed.
+        :param stream_rate:     The number of messages per second sent for each stream subscription.
+        :param seed:            Seeds latency jitter and error injection.
+        """
+        for rate in (no_data_rate, disconnect_rate, drop_rate):
+            assert 0 <= rate <= 1, "rates must be between 0 and 1"
+        assert stream_rate > 0, "stream_rate must be positive"
+        self.host: str = host
+        self.generator: DataGenerator = DataGenerator() if generator is None else generator
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.no_data_rate: float = no_data_rate
+        self.disconnect_rate: float = disconnect_rate
+        self.drop_rate: float = drop_rate
+        self.stream_rate: float = stream_rate
+        self.requests: int = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._servers = [
+            _HistServer((host, port), _HistHandler, self),
+            _StreamServer((host, stream_port), _StreamHandler, self),
+            _RestServer((host, rest_port), _RestHandler, self),
+        ]
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def port(self) -> int:
+        """:return: The port of the hist protocol."""
+        return self._servers[0].server_address[1]
+
+    @property
+    def stream_port(self) -> int:
+        """:return: The port of the stream protocol."""
+        return self._servers[1].server_address[1]
+
+    @property
+    def rest_port(self) -> int:
+        """:return: The port of the REST API."""
+        return self._servers[2].server_address[1]
+
+    def start(self) -> None:
+        """Serve requests on background threads."""
+        for server in self._servers:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop serving requests and close the listening sockets."""
+        for server in self._servers:
+            if self._threads:
+                server.shutdown()
+            server.server_close()
+        self._threads.clear()
+
+    def __enter__(self) -> TerminalSimulator:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _delay(self) -> float:
+        """Wait for the injected latency of a response.
+
+        :return: The number of seconds waited.
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def _injected_error(self) -> Optional[str]:
+        """:return: The message of an injected error response, or None if the request is served."""
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.no_data_rate:
+            return _NO_DATA_MSG
+        if draw < self.no_data_rate + self.disconnect_rate:
+            return _DISCONNECTED_MSG
+        return None
+
+    def _drop(self) -> bool:
+        """:return: True if the connection should drop in the middle of the next response."""
+        with self._lock:
+            return self._random.random() < self.drop_rate
+
+    def respond(self, msg_type: MessageType, params: Dict[str, str]) -> Tuple[Optional[str], object]:
+        """Generate the response to a request.
+
+        :return: An error message and None, or None and the ticks or list of the request.
+        """
+        error = self._injected_error()
+        if error is not None:
+            return error, None
+        if msg_type in (MessageType.HIST, MessageType.AT_TIME, MessageType.LAST):
+            ticks = self.generator.ticks(msg_type, params)
+            return (_NO_DATA_MSG, None) if ticks is None else (None, ticks)
+        if msg_type in (MessageType.ALL_ROOTS, MessageType.ALL_EXPIRATIONS, MessageType.ALL_STRIKES,
+                        MessageType.ALL_DATES, MessageType.ALL_DATES_BULK):
+            lst = self.generator.list(msg_type, params)
+            return (_NO_DATA_MSG, None) if len(lst) == 0 else (None, lst)
+        return f"Invalid request: {msg_type.name}", None
+
+
+def _req_name(params: Dict[str, str]) -> Optional[str]:
+    """:return: The name of the request type of binary request parameters, e.g. "QUOTE"."""
+    if "req" not in params:
+        return None
+    req_cls = StockReqType if params.get("sec") == SecType.STOCK.value else OptionReqType
+    try:
+        return req_cls(int(params["req"])).name
+    except ValueError:
+        return None
+
+
+class _HistServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler, simulator: TerminalSimulator):
+        super().__init__(address, handler)
+        self.simulator = simulator
+
+
+class _HistHandler(socketserver.StreamRequestHandler):
+    """Answers requests of the binary hist protocol, see `codec.HEADER`."""
+
+    def handle(self):
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        simulator: TerminalSimulator = self.server.simulator
+        for line in self.rfile:
+            params = dict(parse_qsl(line.decode("utf-8").strip(), keep_blank_values=True))
+            if "version" in params:
+                continue
+            try:
+                msg_type = codec.from_code(MessageType, int(params.get("MSG_CODE", -1)))
+            except Exception:
+                msg_type = MessageType.ERROR
+            if msg_type == MessageType.KILL:
+                return
+            params["req_name"] = _req_name(params) or "QUOTE"
+            delay = simulator._delay()
+            error, data = simulator.respond(msg_type, params)
+            latency = min(int(delay * 1000), 0xFFFF)
+            if error is not None:
+                body = error.encode("utf-8")
+                header = codec.encode_header(MessageType.ERROR, 0, latency, 0, 0, len(body))
+            elif isinstance(data, list):
+                body = ",".join(str(item) for item in data).encode("ascii")
+                header = codec.encode_header(msg_type, 0, latency, 0, 0, len(body))
+            else:
+                format_tick, ticks = data
+                body = codec.encode_ticks(format_tick, ticks)
+                header = codec.encode_header(msg_type, 0, latency, 0, len(format_tick), len(body))
+            response = header + body
+            if simulator._drop():
+                self.wfile.write(response[:len(response) // 2])
+                return
+            self.wfile.write(response)
+
+
+class _RestServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler, simulator: TerminalSimulator):
+        super().__init__(address, handler)
+        self.simulator = simulator
+
+
+class _RestHandler(BaseHTTPRequestHandler):
+    """Answers the REST API requests made by the *_REST methods of the ThetaClient."""
+
+    # path prefix -> message type of the equivalent binary request
+    _ROUTES = {
+        "hist": MessageType.HIST,
+        "at_time": MessageType.AT_TIME,
+        "snapshot": MessageType.LAST,
+        "list/roots": MessageType.ALL_ROOTS,
+        "list/expirations": MessageType.ALL_EXPIRATIONS,
+        "list/strikes": MessageType.ALL_STRIKES,
+        "list/dates": MessageType.ALL_DATES,
+    }
+
+    def log_message(self, format, *args):
+        pass  # keep the output of the simulator process readable
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+        query = dict(parse_qsl(url.query))
+        msg_type = self._ROUTES.get("/".join(parts[:2])) or self._ROUTES.get(parts[0])
+        params = {
+            "root": query.get("root", ""),
+            "START_DATE": query.get("start_date", ""),
+            "END_DATE": query.get("end_date", ""),
+            "IVL": query.get("ivl", "0"),
+        }
+        for key in ("exp", "strike", "right", "sec"):
+            if key in query:
+                params[key] = query[key]
+        if msg_type in (MessageType.HIST, MessageType.AT_TIME, MessageType.LAST):
+            params.setdefault("sec", parts[1].upper() if len(parts) > 1 else SecType.OPTION.value)
+            params["req_name"] = parts[2].upper() if len(parts) > 2 else "QUOTE"
+        simulator: TerminalSimulator = self.server.simulator
+        delay = simulator._delay()
+        if msg_type is None:
+            error, data = f"Invalid request: {url.path}", None
+        else:
+            error, data = simulator.respond(msg_type, params)
+
+        header = {"id": 0, "latency": int(delay * 1000), "error_type": "null", "error_msg": "null",
+                  "next_page": "null", "format": []}
+        response: list = []
+        if error is not None:
+            header["error_type"] = "NO_DATA" if error == _NO_DATA_MSG else "ERROR"
+            header["error_msg"] = error
+        elif isinstance(data, list):
+            response = data
+        else:
+            format_tick, ticks = data
+            header["format"] = [col.name.lower() for col in format_tick if col != DataType.PRICE_TYPE]
+            response = self._decode_rows(format_tick, ticks)
+        body = json.dumps({"header": header, "response": response}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _decode_rows(format_tick: List[DataType], ticks: np.ndarray) -> list:
+        """Convert ticks to the rows of the REST API, which lists prices in USD w/o a price type column."""
+        mult = _PRICE_MULTIPLIERS[_PRICE_TYPE]
+        cols = [
+            np.round(ticks[:, i] * mult, 4).tolist() if col.is_price() else ticks[:, i].tolist()
+            for i, col in enumerate(format_tick) if col != DataType.PRICE_TYPE
+        ]
+        return [list(row) for row in zip(*cols)]
+
+
+class _StreamServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, handler, simulator: TerminalSimulator):
+        super().__init__(address, handler)
+        self.simulator = simulator
+
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    """Answers stream requests and sends the ticks of the subscribed contracts, see the stream frame format of
+    `codec`.
+    """
+
+    def setup(self):
+        super().setup()
+        self._send_lock = threading.Lock()
+        # (req type, contract bytes) of every subscription
+        self._subscriptions: List[Tuple[str, bytes]] = []
+        self._closed = threading.Event()
+
+    def handle(self):
+        sender = threading.Thread(target=self._send_ticks, daemon=True)
+        sender.start()
+        try:
+            for line in self.rfile:
+                self._handle_request(dict(parse_qsl(line.decode("utf-8").strip())))
+        except OSError:
+            pass
+        finally:
+            self._closed.set()
+            sender.join()
+
+    def _send(self, msg_type: StreamMsgType, contract: bytes, payload: bytes) -> None:
+        frame = codec.STREAM_MSG_TYPE.pack(msg_type.value) + bytes([len(contract)]) + contract + payload
+        with self._send_lock:
+            self.wfile.write(frame)
+
+    def _handle_request(self, params: Dict[str, str]) -> None:
+        req = _req_name(params) or "QUOTE"
+        if "root" in params:
+            contract = codec.encode_contract(params["root"], True, int(params.get("exp", 0)),
+                                             params.get("right", "C") == "C", int(params.get("strike", 0)))
+        else:
+            contract = b""  # a full stream of every contract
+        if int(params.get("MSG_CODE", 0)) == MessageType.STREAM_REMOVE.value:
+            self._subscriptions = [sub for sub in self._subscriptions if sub != (req, contract)]
+        else:
+            self._subscriptions = self._subscriptions + [(req, contract)]
+        req_id = int(params.get("id", -1))
+        if req_id >= 0:
+            self._send(StreamMsgType.REQ_RESPONSE, contract or codec.encode_contract(""),
+                       codec.REQ_RESPONSE.pack(req_id, StreamResponseType.SUBSCRIBED.value))
+
+    def _send_ticks(self) -> None:
+        simulator: TerminalSimulator = self.server.simulator
+        rng = random.Random(simulator.generator.seed)
+        roots = simulator.generator.roots
+        last_ping = 0.0
+        sequence = 0
+        try:
+            while not self._closed.wait(1 / simulator.stream_rate):
+                now = time.time()
+                if now - last_ping >= _PING_INTERVAL:
+                    self._send(StreamMsgType.PING, codec.encode_contract(""), codec.STREAM_INT.pack(0))
+                    last_ping = now
+                today = _yyyymmdd(date.today())
+                ms_of_day = int((now - time.mktime(date.today().timetuple())) * 1000) % 86_400_000
+                for req, contract in self._subscriptions:
+                    if not contract:
+                        contract = codec.encode_contract(rng.choice(roots), True, today, rng.random() < 0.5,
+                                                         rng.randrange(50, 500) * 1000)
+                    price = rng.randrange(100, 2_000)
+                    sequence += 1
+                    if req == "TRADE":
+                        self._send(StreamMsgType.TRADE, contract, codec.TRADE.pack(
+                            ms_of_day, sequence, rng.randrange(1, 100), 0, price, 1, _PRICE_TYPE, today))
+                    elif req == "OPEN_INTEREST":
+                        self._send(StreamMsgType.OPEN_INTEREST, contract,
+                                   codec.OPEN_INTEREST.pack(rng.randrange(0, 100_000), today))
+                    else:
+                        self._send(StreamMsgType.QUOTE, contract, codec.QUOTE.pack(
+                            ms_of_day, rng.randrange(1, 100), 1, price - 1, 0, rng.randrange(1, 100), 1, price + 1,
+                            0, _PRICE_TYPE, today))
+        except OSError:
+            pass  # the client disconnected
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a simulator until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m thetadata.simulator", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11000, help="port of the hist protocol")
+    parser.add_argument("--stream-port", type=int, default=10000, help="port of the stream protocol")
+    parser.add_argument("--rest-port", type=int, default=25510, help="port of the REST API")
+    parser.add_argument("--rows-per-day", type=int, default=1_000, help="ticks per day of tick level requests")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="max seconds randomly added to the latency")
+    parser.add_argument("--no-data-rate", type=float, default=0.0, help="fraction of 'no data' errors")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="fraction of 'disconnected' errors")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of responses cut off mid-way")
+    parser.add_argument("--stream-rate", type=float, default=100.0, help="messages per second per subscription")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    simulator = TerminalSimulator(
+        host=args.host, port=args.port, stream_port=args.stream_port, rest_port=args.rest_port,
+        generator=DataGenerator(rows_per_day=args.rows_per_day, seed=args.seed), latency=args.latency,
+        jitter=args.jitter, no_data_rate=args.no_data_rate, disconnect_rate=args.disconnect_rate,
+        drop_rate=args.drop_rate, stream_rate=args.stream_rate, seed=args.seed,
+    )
+    with simulator:
+        print(f"Simulating a Theta Terminal on {args.host}: hist port {simulator.port}, stream port "
+              f"{simulator.stream_port}, REST port {simulator.rest_port}. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
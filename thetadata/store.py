@@ -0,0 +1,150 @@
+"""Module that contains a memory-mapped columnar file format for tick data."""
+from __future__ import annotations
+
+import os
+import struct
+from datetime import date
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .enums import DataType, DateRange
+from .parsing import TickBody
+
+_MAGIC = b"THETATKS"
+_STORE_VERSION = 1
+# magic, version, number of columns, number of rows
+_HEADER = struct.Struct("<8sIIQ")
+# columns start at a multiple of this many bytes
+_ALIGN = 64
+_COLUMN_DTYPE = np.dtype("<i4")
+
+"""
+Store format:
+    bytes           | field
+    8               | magic b"THETATKS"
+    4               | format version
+    4               | number of columns
+    8               | number of rows
+    4 * n_cols      | DataType code of each column
+    padding         | to a multiple of 64 bytes
+    4 * n_rows      | raw ticks of the first column
+    ...             | raw ticks of the other columns, in the order of the codes
+All integers are little endian. Columns hold the raw int32 values of the Terminal, so prices are decoded
+w/ their price type column when the store is read.
+"""
+
+
+def _data_offset(n_cols: int) -> int:
+    """:return: The offset of the first column in a store w/ `n_cols` columns."""
+    size = _HEADER.size + 4 * n_cols
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _yyyymmdd(dt: date) -> int:
+    """:return: A date in the YYYYMMDD integer format of the DATE column."""
+    return dt.year * 10000 + dt.month * 100 + dt.day
+
+
+def write_store(path: str, bodies: Iterable[TickBody]) -> int:
+    """Write tick bodies that share a format tick to a single columnar store file, in order.
+
+    The file is written next to `path` and moved into place once complete, so readers never open a partial store.
+
+    :param path:   The file to write.
+    :param bodies: The tick bodies to store, e.g. from `TickBody.from_response`.
+    :return:       The number of ticks written.
+    """
+    bodies = list(bodies)
+    assert len(bodies) > 0, "Cannot write a store w/o tick bodies."
+    format_tick = bodies[0].format_tick
+    for body in bodies:
+        assert body.format_tick == format_tick, "Cannot store tick bodies w/ different formats."
+    ticks = [body._trimmed() for body in bodies]
+    n_rows = sum(len(t) for t in ticks)
+    n_cols = len(format_tick)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _STORE_VERSION, n_cols, n_rows))
+        f.write(np.array([col.code() for col in format_tick], dtype=_COLUMN_DTYPE).tobytes())
+        f.write(b"\0" * (_data_offset(n_cols) - f.tell()))
+        for i in range(n_cols):
+            for t in ticks:
+                f.write(t[:, i].astype(_COLUMN_DTYPE).tobytes())
+    os.replace(tmp_path, path)
+    return n_rows
+
+
+class TickStore:
+    """A read-only, memory-mapped columnar store of ticks written by `write_store`.
+
+    Opening a store only reads its header. Columns are mapped into memory, so only the pages of the rows
+    that are read are loaded from disk, and processes that open the same store share the OS page cache.
+    """
+
+    def __init__(self, path: str):
+        """Open a store.
+
+        :param path: The store file.
+        :raises ValueError: If the file is not a store.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{path} is not a tick store.")
+            magic, version, n_cols, n_rows = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _STORE_VERSION:
+                raise ValueError(f"{path} is not a version {_STORE_VERSION} tick store.")
+            codes = np.frombuffer(f.read(4 * n_cols), dtype=_COLUMN_DTYPE)
+        self.path: str = path
+        self.format_tick: list[DataType] = [DataType.from_code(int(code)) for code in codes]
+        if n_rows == 0:  # empty files cannot be mapped
+            self._columns = np.empty((n_cols, 0), dtype=_COLUMN_DTYPE)
+        else:
+            self._columns = np.memmap(
+                path, dtype=_COLUMN_DTYPE, mode="r", offset=_data_offset(n_cols), shape=(n_cols, n_rows)
+            )
+
+    def __len__(self) -> int:
+        return self._columns.shape[1]
+
+    def column(self, col: DataType) -> np.ndarray:
+        """:return: A memory-mapped view of the raw int32 values of a column."""
+        return self._columns[self.format_tick.index(col)]
+
+    def date_rows(self, date_range: DateRange) -> slice:
+        """Find the rows of the ticks in a date range w/ a binary search of the date column.
+
+        :return: The rows of the ticks between the start and end of `date_range`, inclusive.
+        """
+        dates = self.column(DataType.DATE)
+        start = np.searchsorted(dates, _yyyymmdd(date_range.start), side="left")
+        end = np.searchsorted(dates, _yyyymmdd(date_range.end), side="right")
+        return slice(int(start), int(end))
+
+    def body(self, rows: slice = slice(None)) -> TickBody:
+        """:return: A tick body that views the `rows` of this store w/o copying them."""
+        return TickBody(format_tick=list(self.format_tick), body_ticks=self._columns[:, rows].T)
+
+    def read(
+        self,
+        rows: Optional[slice] = None,
+        date_range: Optional[DateRange] = None,
+        timestamp: Optional[str] = None,
+        output: str = "pandas",
+        compact: bool = False,
+    ):
+        """Decode ticks of this store like the ThetaClient hist calls do.
+
+        :param rows:       The rows to read. Defaults to all rows.
+        :param date_range: If specified, only read the ticks of these dates. Requires a DATE column.
+        :param timestamp:  If "local" or "utc", add a time zone aware "timestamp" column, see `TickBody.parse`.
+        :param output:     The result format, see `OUTPUT_FORMATS`.
+        :param compact:    If True, downcast columns to the narrowest dtype that holds their values.
+        :return:           The ticks as a pandas DataFrame, or in the requested output format.
+        """
+        assert rows is None or date_range is None, "Cannot read by rows and date_range at once."
+        if date_range is not None:
+            rows = self.date_rows(date_range)
+        return self.body(slice(None) if rows is None else rows)._to_output(output, timestamp, compact)